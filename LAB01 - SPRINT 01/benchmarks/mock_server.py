@@ -0,0 +1,233 @@
+import base64
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SEARCH_RESULT_LIMIT = 1000
+
+
+def encode_cursor(position):
+    """
+    Cursor no formato do GitHub: base64 de "cursor:N", com N a posição (1-based) do item
+    """
+    return base64.b64encode(f"cursor:{position}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    return int(base64.b64decode(cursor).decode().split(':')[1])
+
+
+def parse_created_filter(search_query):
+    """
+    (início, fim) do filtro created:AAAA-MM-DD..AAAA-MM-DD da busca, ou None
+    """
+    match = re.search(r'created:(\d{4}-\d{2}-\d{2})\.\.(\d{4}-\d{2}-\d{2})', search_query)
+    return (match[1], match[2]) if match else None
+
+
+def parse_star_filter(search_query):
+    """
+    (min_stars, max_stars) dos filtros stars:lo..hi, stars:>=N e stars:>N da busca
+    """
+    match = re.search(r'stars:(\d+)\.\.(\d+)', search_query)
+    if match:
+        return int(match[1]), int(match[2])
+    match = re.search(r'stars:>=(\d+)', search_query)
+    if match:
+        return int(match[1]), None
+    match = re.search(r'stars:>(\d+)', search_query)
+    if match:
+        return int(match[1]) + 1, None
+    return None, None
+
+
+class MockGraphQLServer:
+    """
+    Servidor HTTP local que imita o endpoint GraphQL do GitHub para as queries do analisador
+    (SearchRepositories, CountRepositories e RepositoryBatch) sobre um SyntheticRepositories.
+    Entende os filtros stars: e created: da busca e os cursores "cursor:N" do GitHub.
+    Injeta latência, headers x-ratelimit-*, falhas 502 e limites secundários (403 + Retry-After).
+    O orçamento de pontos é controlado por token (header Authorization), como na API real.
+    Os nós voltam sempre completos, independente da projeção de campos da query.
+    """
+    def __init__(self, dataset, latency=0.0, error_rate=0.0, secondary_limit_rate=0.0, rate_limit=5000,
+                 reset_interval=3600, retry_after=1, host='127.0.0.1', port=0, seed=0):
+        self.dataset = dataset
+        self.latency = latency
+        self.error_rate = error_rate
+        self.secondary_limit_rate = secondary_limit_rate
+        self.rate_limit = rate_limit
+        self.reset_interval = reset_interval
+        self.retry_after = retry_after
+
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.budgets = {}  # token -> [pontos restantes, reset (epoch)]
+        self.filtered = {}  # (faixa de índices, filtro created:) -> índices que casam
+        self.requests = 0
+        self.injected_errors = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/graphql"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, como a API real
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length))
+                status, body, headers = server.handle(payload, self.headers.get('Authorization'))
+                content = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def handle(self, payload, token=None):
+        """
+        Devolve (status, corpo, headers) para um payload {'query', 'variables'} enviado com `token`
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        query = payload['query']
+        variables = payload.get('variables') or {}
+
+        with self.lock:
+            self.requests += 1
+            now = time.time()
+            budget = self.budgets.get(token)
+            if budget is None or now >= budget[1]:
+                budget = self.budgets[token] = [self.rate_limit, now + self.reset_interval]
+
+            draw = self.random.random()
+            if draw < self.error_rate:
+                self.injected_errors += 1
+                return 502, b'{"message": "Server Error"}', {}
+            if draw < self.error_rate + self.secondary_limit_rate:
+                self.injected_errors += 1
+                return 403, {'message': 'You have exceeded a secondary rate limit'}, {
+                    'Retry-After': str(self.retry_after)
+                }
+            if budget[0] <= 0:
+                return 403, {'message': 'API rate limit exceeded'}, self._rate_limit_headers(budget)
+
+        errors = None
+        if 'CountRepositories' in query:
+            data, cost = self._count(variables['q'])
+        elif 'SearchRepositories' in query:
+            data, cost = self._search(variables['q'], variables.get('first', 20), variables.get('after'))
+        elif 'RepositoryBatch' in query:
+            data, cost, errors = self._batch(variables)
+        else:
+            return 200, {'errors': [{'message': 'Operação não suportada pelo servidor de benchmark'}]}, {}
+
+        with self.lock:
+            budget[0] = max(budget[0] - cost, 0)
+            if 'rateLimit' in query:
+                data['rateLimit'] = {
+                    'cost': cost,
+                    'remaining': budget[0],
+                    'resetAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(budget[1]))
+                }
+            headers = self._rate_limit_headers(budget)
+
+        body = {'data': data}
+        if errors:
+            body['errors'] = errors
+        return 200, body, headers
+
+    def _rate_limit_headers(self, budget):
+        remaining, reset_at = budget
+        return {
+            'x-ratelimit-limit': str(self.rate_limit),
+            'x-ratelimit-remaining': str(remaining),
+            'x-ratelimit-used': str(self.rate_limit - remaining),
+            'x-ratelimit-reset': str(int(reset_at)),
+        }
+
+    def _matching(self, search_query):
+        """
+        Índices (em ordem de estrelas) que casam com a busca; o filtro created: varre a faixa de estrelas
+        """
+        start, stop = self.dataset.index_range(*parse_star_filter(search_query))
+        created = parse_created_filter(search_query)
+        if created is None:
+            return range(start, stop)
+
+        key = (start, stop, created)
+        indices = self.filtered.get(key)
+        if indices is None:
+            first_day, last_day = created
+            indices = [index for index in range(start, stop)
+                       if first_day <= self.dataset.created(index).strftime('%Y-%m-%d') <= last_day]
+            self.filtered[key] = indices
+        return indices
+
+    def _count(self, search_query):
+        matching = self._matching(search_query)
+        nodes = [{'stargazerCount': self.dataset.stars(matching[0])}] if matching else []
+        return {'search': {'repositoryCount': len(matching), 'nodes': nodes}}, 1
+
+    def _search(self, search_query, first, after):
+        matching = self._matching(search_query)[:SEARCH_RESULT_LIMIT]
+
+        offset = decode_cursor(after) if after else 0
+        page = matching[offset:offset + first]
+        nodes = [self.dataset.node(index) for index in page]
+        end = offset + len(nodes)
+
+        return {'search': {
+            'pageInfo': {'endCursor': encode_cursor(end) if nodes else None, 'hasNextPage': end < len(matching)},
+            'nodes': nodes
+        }}, 1
+
+    def _batch(self, variables):
+        # Como a API real: alias null + erro NOT_FOUND para repositório inexistente
+        data = {}
+        errors = []
+        i = 0
+        while f"o{i}" in variables:
+            owner, name = variables[f"o{i}"], variables[f"n{i}"]
+            data[f"r{i}"] = self.dataset.find(owner, name)
+            if data[f"r{i}"] is None:
+                errors.append({'type': 'NOT_FOUND', 'path': [f"r{i}"],
+                               'message': f"Could not resolve to a Repository with the name '{owner}/{name}'."})
+            i += 1
+        return data, 1, errors
@@ -0,0 +1,183 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+
+from lab01s01_github import GitHubRepositoryAnalyzer  # noqa: E402
+from request_scheduler import RequestScheduler  # noqa: E402
+from mock_server import MockGraphQLServer  # noqa: E402
+from synthetic_data import REFERENCE_DATE, SyntheticRepositories  # noqa: E402
+
+ANALYSES = ['analyze_rq01', 'analyze_rq02', 'analyze_rq03', 'analyze_rq04', 'analyze_rq05', 'analyze_rq06',
+            'analyze_rq07_bonus']
+
+# Margem aceita antes de um benchmark contar como regressão em --compare
+DEFAULT_THRESHOLD = 1.25
+
+
+def best_time(function, repeat):
+    """
+    Melhor tempo de `repeat` execuções (o menos afetado por ruído da máquina) e o último resultado
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def benchmark_tokens(count):
+    return [f'benchmark-token-{index}' for index in range(max(count, 1))]
+
+
+def create_analyzer(url, realistic_pacing=False, tokens=1):
+    analyzer = GitHubRepositoryAnalyzer(benchmark_tokens(tokens), url=url)
+    if not realistic_pacing:
+        # Sem o token bucket do limite secundário, para medir o código e não a espera
+        analyzer.scheduler = RequestScheduler(analyzer.client, points_per_second=1e6, burst=1e6,
+                                              tokens=analyzer.tokens)
+    return analyzer
+
+
+def run_size(size, args):
+    dataset = SyntheticRepositories(size, seed=args.seed)
+    results = {}
+
+    def record(name, seconds, items):
+        results[name] = {'seconds': seconds, 'items': items, 'per_second': items / seconds if seconds else None}
+        print(f"  {name:<22} {seconds * 1000:10.1f} ms  {items / seconds if seconds else 0:12.0f} itens/s")
+
+    # Coleta pela pilha HTTP real (transporte, scheduler, shards) contra o servidor local
+    fetch_total = min(size, args.fetch_max)
+    server = MockGraphQLServer(dataset, latency=args.latency, error_rate=args.error_rate,
+                               secondary_limit_rate=args.secondary_limit_rate, retry_after=0,
+                               rate_limit=args.rate_limit)
+    with server:
+        analyzer = create_analyzer(server.url, args.realistic_pacing, args.tokens)
+        seconds, repositories = best_time(lambda: analyzer.fetch_repositories(fetch_total, args.workers),
+                                          args.repeat)
+        analyzer.client.close()
+    record('fetch_repositories', seconds, len(repositories))
+    if server.injected_errors:
+        print(f"  ({server.injected_errors} erros injetados em {server.requests} requisições)")
+
+    nodes = list(dataset.nodes())
+    analyzer = GitHubRepositoryAnalyzer('benchmark-token', url=server.url)
+
+    seconds, data = best_time(lambda nodes=nodes: analyzer.process_data(nodes, REFERENCE_DATE), args.repeat)
+    record('process_data', seconds, len(data))
+    del nodes
+
+    seconds, _ = best_time(lambda: analyzer.summarize(data), args.repeat)
+    record('summarize', seconds, len(data))
+
+    for analysis in ANALYSES:
+        seconds, _ = best_time(lambda: getattr(analyzer, analysis)(data), args.repeat)
+        record(analysis, seconds, len(data))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, 'github_repositories_data.csv')
+        seconds, _ = best_time(lambda: analyzer.save_data_csv(data, csv_path), args.repeat)
+        record('save_data_csv', seconds, len(data))
+
+        if not args.skip_charts:
+            try:
+                seconds, _ = best_time(lambda: render_charts_in(workdir, csv_path), args.repeat)
+                record('graphics_genarator', seconds, len(data))
+            except ImportError as e:
+                print(f"  graphics_genarator pulado: {e}")
+
+    return results
+
+
+def render_charts_in(workdir, csv_path):
+    """
+    Roda o graphics_genarator.py de ponta a ponta (leitura do CSV + todos os gráficos) num diretório temporário
+    """
+    import graphics_genarator
+
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        return graphics_genarator.render_charts(csv_path=csv_path, force=True)
+    finally:
+        os.chdir(previous)
+
+
+def compare(results, baseline, threshold):
+    """
+    Lista os benchmarks que ficaram mais de `threshold` vezes mais lentos que o baseline
+    """
+    regressions = []
+    for size, benchmarks in results.items():
+        for name, result in benchmarks.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous and result['seconds'] > previous['seconds'] * threshold:
+                regressions.append((size, name, previous['seconds'], result['seconds']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks da coleta e da análise contra um servidor GraphQL local com dados sintéticos"
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+                        help="quantidades de repositórios sintéticos (ex.: 1000 10000 100000 1000000)")
+    parser.add_argument('--repeat', type=int, default=3, help="execuções por benchmark (vale o melhor tempo)")
+    parser.add_argument('--workers', type=int, default=8, help="shards em paralelo no fetch_repositories")
+    parser.add_argument('--fetch-max', type=int, default=5000,
+                        help="máximo de repositórios buscados via HTTP por tamanho")
+    parser.add_argument('--latency', type=float, default=0.0, help="latência injetada por requisição (s)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fração de respostas 502")
+    parser.add_argument('--secondary-limit-rate', type=float, default=0.0,
+                        help="fração de respostas 403 de limite secundário (Retry-After)")
+    parser.add_argument('--realistic-pacing', action='store_true',
+                        help="mantém o token bucket de 2000 pontos/minuto do scheduler")
+    parser.add_argument('--tokens', type=int, default=1,
+                        help="tokens no pool (o servidor controla orçamento e limites por token)")
+    parser.add_argument('--rate-limit', type=int, default=5000, help="pontos por hora de cada token no servidor")
+    parser.add_argument('--skip-charts', action='store_true', help="não mede o graphics_genarator.py")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="grava os resultados em JSON (para usar depois com --compare)")
+    parser.add_argument('--compare', help="JSON de uma execução anterior; sai com erro se houver regressão")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="razão de tempo a partir da qual conta como regressão")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        print(f"\n{size} repositórios sintéticos")
+        results[str(size)] = run_size(size, args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'created_at': datetime.now().isoformat(), 'results': results}, f, indent=2)
+        print(f"\nResultados salvos em: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for size, name, before, after in regressions:
+            print(f"REGRESSÃO {name} ({size}): {before * 1000:.1f} ms -> {after * 1000:.1f} ms")
+        if regressions:
+            return 1
+        print(f"\nNenhuma regressão acima de {args.threshold:.2f}x em relação a {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+LANGUAGES = ['JavaScript', 'Python', 'TypeScript', 'Go', 'Java', 'C++', 'Rust', 'C', 'C#', 'PHP', 'Ruby',
+             'Shell', 'Kotlin', 'Swift', 'Jupyter Notebook']
+LANGUAGE_WEIGHTS = [18, 16, 14, 8, 8, 6, 5, 5, 4, 3, 3, 3, 2, 2, 3]
+
+# Fração de repositórios sem linguagem primária (primaryLanguage: null)
+NO_LANGUAGE_RATE = 0.08
+
+MIN_STARS = 1001
+TOP_STARS = 400000
+
+REFERENCE_DATE = datetime(2025, 9, 1, tzinfo=timezone.utc)
+
+
+class SyntheticRepositories:
+    """
+    Conjunto determinístico de `size` repositórios no formato dos nós do GraphQL.
+    Os nós são gerados sob demanda a partir do índice (nada fica em memória),
+    então o mesmo código serve de 1k a 1M repositórios. O índice 0 é o mais
+    popular e as estrelas caem numa cauda longa de TOP_STARS até MIN_STARS.
+    """
+    def __init__(self, size, seed=0):
+        self.size = size
+        self.seed = seed
+        # Expoente da lei de potência escolhido para o topo ficar perto de TOP_STARS em qualquer tamanho
+        self.exponent = math.log(TOP_STARS / MIN_STARS) / math.log(size) if size > 1 else 0.0
+
+    def __len__(self):
+        return self.size
+
+    def stars(self, index):
+        """
+        Estrelas do repositório `index` (não crescente com o índice)
+        """
+        return int(MIN_STARS * (self.size / (index + 1)) ** self.exponent)
+
+    def created(self, index):
+        """
+        Data de criação do repositório `index` (os mesmos sorteios do início de node())
+        """
+        rng = random.Random(self.seed * 1000003 + index)
+        return REFERENCE_DATE - timedelta(days=rng.randint(30, 16 * 365), seconds=rng.randint(0, 86399))
+
+    def node(self, index):
+        rng = random.Random(self.seed * 1000003 + index)
+        created = REFERENCE_DATE - timedelta(days=rng.randint(30, 16 * 365), seconds=rng.randint(0, 86399))
+        updated = REFERENCE_DATE - timedelta(days=int(rng.expovariate(1 / 20)), seconds=rng.randint(0, 86399))
+        pushed = updated - timedelta(hours=rng.randint(0, 72))
+        total_issues = int(rng.paretovariate(1.1) * 20) - 20
+        owner = f"owner{index % max(self.size // 3, 1)}"
+        name = f"repo{index}"
+
+        language = None
+        if rng.random() >= NO_LANGUAGE_RATE:
+            language = {'name': rng.choices(LANGUAGES, LANGUAGE_WEIGHTS)[0]}
+
+        return {
+            'name': name,
+            'owner': {'login': owner},
+            'nameWithOwner': f"{owner}/{name}",
+            'stargazerCount': self.stars(index),
+            'createdAt': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'updatedAt': updated.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'pushedAt': pushed.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'primaryLanguage': language,
+            'pullRequests': {'totalCount': int(rng.paretovariate(0.9) * 10) - 10},
+            'releases': {'totalCount': 0 if rng.random() < 0.35 else int(rng.paretovariate(1.2) * 5)},
+            'issues': {'totalCount': total_issues},
+            'closedIssues': {'totalCount': int(total_issues * rng.betavariate(5, 2))},
+            'url': f"https://github.com/{owner}/{name}",
+            'description': f"Synthetic repository {index} for benchmarks",
+        }
+
+    def nodes(self, start=0, stop=None):
+        for index in range(start, self.size if stop is None else min(stop, self.size)):
+            yield self.node(index)
+
+    def index_range(self, min_stars=None, max_stars=None):
+        """
+        Faixa [início, fim) de índices com min_stars <= estrelas <= max_stars (busca binária)
+        """
+        start = 0
+        if max_stars is not None:
+            start = self._first_index(lambda index: self.stars(index) <= max_stars)
+        stop = self.size
+        if min_stars is not None:
+            stop = self._first_index(lambda index: self.stars(index) < min_stars)
+        return start, max(start, stop)
+
+    def _first_index(self, predicate):
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if predicate(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def find(self, owner, name):
+        """
+        Nó de "owner/name" (None se não existir), como no repository(owner:, name:) da API
+        """
+        if not name.startswith('repo') or not name[4:].isdigit():
+            return None
+        index = int(name[4:])
+        if index >= self.size:
+            return None
+        node = self.node(index)
+        return node if node['owner']['login'] == owner else None
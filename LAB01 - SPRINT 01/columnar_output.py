@@ -0,0 +1,102 @@
+import glob
+import os
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    feather = None
+    pq = None
+
+DATASET_DIR = 'github_repositories_data'
+FORMAT_EXTENSIONS = {'parquet': 'parquet', 'feather': 'feather'}
+
+
+def repository_schema():
+    """
+    Schema tipado do dataset (mesmas colunas do CSV); linguagem e dono codificados por dicionário
+    """
+    text_dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('name', pa.string()),
+        ('owner', text_dictionary),
+        ('stars', pa.int64()),
+        ('age_days', pa.int32()),
+        ('merged_prs', pa.int64()),
+        ('total_releases', pa.int32()),
+        ('days_since_update', pa.int32()),
+        ('primary_language', text_dictionary),
+        ('total_issues', pa.int64()),
+        ('closed_issues', pa.int64()),
+        ('closed_issues_ratio', pa.float64()),
+        ('url', pa.string()),
+        ('description', pa.string()),
+    ])
+
+
+def partition_path(base_dir=DATASET_DIR, fmt='parquet', collection_date=None):
+    collection_date = collection_date or datetime.now().strftime('%Y-%m-%d')
+    return os.path.join(base_dir, f"collection_date={collection_date}", f"part-0.{FORMAT_EXTENSIONS[fmt]}")
+
+
+def latest_partition(base_dir=DATASET_DIR):
+    """
+    Arquivo da coleta mais recente: a maior data no nome da partição e, no mesmo dia,
+    o arquivo gravado por último (Parquet e Feather podem coexistir na mesma partição)
+    """
+    files = glob.glob(os.path.join(base_dir, 'collection_date=*', 'part-0.*'))
+    return max(files, key=lambda path: (os.path.dirname(path), os.path.getmtime(path))) if files else None
+
+
+class ArrowDatasetSink:
+    """
+    Sink do pipeline que grava o dataset tipado e comprimido (Parquet ou Feather/Arrow IPC),
+    particionado por data de coleta. As linhas são agrupadas em row groups/batches de
+    `batch_size` para não gerar um bloco minúsculo por página.
+    """
+    def __init__(self, base_dir=DATASET_DIR, fmt='parquet', collection_date=None, batch_size=10000,
+                 compression='zstd'):
+        if pa is None:
+            raise ImportError("A saída Parquet/Feather precisa do pyarrow (pip install pyarrow)")
+
+        self.path = partition_path(base_dir, fmt, collection_date)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self.schema = repository_schema()
+        self.batch_size = batch_size
+        self.buffer = []
+
+        if fmt == 'parquet':
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression=compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self.writer = pa.ipc.new_file(self.path, self.schema, options=options)
+
+    def write_page(self, records):
+        self.buffer.extend(records)
+        if len(self.buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            columns = {field: [getattr(record, field) for record in self.buffer] for field in self.schema.names}
+            self.writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+            self.buffer = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+def read_columns(path, columns):
+    """
+    Lê só as colunas pedidas: projeção de colunas no Parquet e no Feather (memory map;
+    com compressão, só os buffers das colunas pedidas são descomprimidos)
+    """
+    if path.endswith('.parquet'):
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    return feather.read_table(path, columns=columns, memory_map=True)
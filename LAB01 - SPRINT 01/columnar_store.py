@@ -0,0 +1,216 @@
+from collections import Counter
+from datetime import datetime, timezone
+
+from rq_aggregator import AGE_BIN_EDGES, AGE_BIN_LABELS, LANGUAGE_METRICS, RQSummary
+from vectorized_processing import derive_columns
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Colunas numéricas e seus tipos (o suficiente para os valores do GitHub)
+NUMERIC_COLUMNS = {
+    'stars': 'int64',
+    'age_days': 'int32',
+    'merged_prs': 'int64',
+    'total_releases': 'int32',
+    'days_since_update': 'int32',
+    'total_issues': 'int64',
+    'closed_issues': 'int64',
+    'closed_issues_ratio': 'float64',
+}
+
+# Colunas de texto guardadas como códigos inteiros + lista de categorias
+DICTIONARY_COLUMNS = ('primary_language', 'owner')
+
+
+class DictionaryColumn:
+    """
+    Coluna de strings codificada por dicionário: cada valor distinto é guardado uma única vez
+    """
+    def __init__(self):
+        self.categories = []
+        self.index = {}
+
+    def encode(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+
+class RepositoryColumns:
+    """
+    Armazenamento colunar dos repositórios processados: um array NumPy tipado por campo
+    (crescendo por duplicação) e linguagem/dono codificados por dicionário. As RQs
+    são calculadas com reduções vetorizadas sobre os arrays (summary()).
+    """
+    def __init__(self, capacity=1024):
+        if np is None:
+            raise ImportError("O armazenamento colunar precisa do numpy (pip install numpy)")
+
+        self.size = 0
+        self.capacity = capacity
+        self.columns = {field: np.empty(capacity, dtype=dtype) for field, dtype in NUMERIC_COLUMNS.items()}
+        self.codes = {field: np.empty(capacity, dtype='int32') for field in DICTIONARY_COLUMNS}
+        self.dictionaries = {field: DictionaryColumn() for field in DICTIONARY_COLUMNS}
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed <= self.capacity:
+            return
+
+        while self.capacity < needed:
+            self.capacity *= 2
+        for group in (self.columns, self.codes):
+            for field, values in group.items():
+                grown = np.empty(self.capacity, dtype=values.dtype)
+                grown[:self.size] = values[:self.size]
+                group[field] = grown
+
+    def _append_columns(self, values, languages, owners):
+        count = len(languages)
+        self._reserve(count)
+        end = self.size + count
+
+        for field, column in values.items():
+            self.columns[field][self.size:end] = column
+
+        language_dict = self.dictionaries['primary_language']
+        owner_dict = self.dictionaries['owner']
+        self.codes['primary_language'][self.size:end] = [language_dict.encode(lang) for lang in languages]
+        self.codes['owner'][self.size:end] = [owner_dict.encode(owner) for owner in owners]
+
+        self.size = end
+
+    def append_nodes(self, nodes, current_date=None):
+        """
+        Preenche as colunas direto de uma página de nós do GraphQL, sem montar os dicionários de process_data
+        """
+        current_date = current_date or datetime.now(timezone.utc)
+        values = derive_columns(nodes, current_date)
+        values['stars'] = [repo['stargazerCount'] for repo in nodes]
+        values['merged_prs'] = [repo['pullRequests']['totalCount'] for repo in nodes]
+        values['total_releases'] = [repo['releases']['totalCount'] for repo in nodes]
+        languages = [repo['primaryLanguage']['name'] if repo['primaryLanguage'] else 'Unknown' for repo in nodes]
+        owners = [repo['owner']['login'] for repo in nodes]
+
+        self._append_columns(values, languages, owners)
+
+    def write_page(self, records):
+        """
+        Também funciona como sink do pipeline, recebendo registros já processados
+        """
+        values = {field: [getattr(record, field) for record in records] for field in NUMERIC_COLUMNS}
+        self._append_columns(values,
+                             [record.primary_language for record in records],
+                             [record.owner for record in records])
+
+    def close(self):
+        pass
+
+    def tap(self, pages, current_date=None):
+        """
+        Preenche as colunas com cada página de nós enquanto a repassa adiante no pipeline
+        """
+        for page in pages:
+            self.append_nodes(page, current_date)
+            yield page
+
+    def column(self, field):
+        if field in self.columns:
+            return self.columns[field][:self.size]
+        return self.codes[field][:self.size]
+
+    def categories(self, field):
+        return self.dictionaries[field].categories
+
+    def to_arrow(self):
+        """
+        Converte para uma tabela Arrow (linguagem e dono como DictionaryArray), se o pyarrow estiver instalado
+        """
+        if pa is None:
+            raise ImportError("to_arrow precisa do pyarrow (pip install pyarrow)")
+
+        arrays = {field: pa.array(self.column(field)) for field in self.columns}
+        for field in DICTIONARY_COLUMNS:
+            arrays[field] = pa.DictionaryArray.from_arrays(
+                pa.array(self.column(field)), pa.array(self.categories(field), type=pa.string())
+            )
+        return pa.table(arrays)
+
+    def summary(self):
+        """
+        Calcula todas as RQs com reduções vetorizadas e devolve o mesmo RQSummary do RQAggregator
+        """
+        total = self.size
+        age_years = self.column('age_days') / 365.25
+        merged_prs = self.column('merged_prs')
+        total_releases = self.column('total_releases')
+        days_since_update = self.column('days_since_update')
+        has_issues = self.column('total_issues') > 0
+        ratios = self.column('closed_issues_ratio')[has_issues]
+
+        # RQ05/RQ07: contagem e grupos por código de linguagem
+        language_codes = self.column('primary_language')
+        language_names = self.categories('primary_language')
+        language_totals = np.bincount(language_codes, minlength=len(language_names))
+        language_counts = Counter({name: int(count) for name, count in zip(language_names, language_totals) if count})
+
+        order = np.argsort(language_codes, kind='stable')
+        boundaries = np.cumsum(language_totals)[:-1]
+        language_groups = {}
+        metrics = {metric: self.column(metric)[order] for metric in LANGUAGE_METRICS}
+        for code, positions in enumerate(np.split(np.arange(total), boundaries)):
+            if len(positions):
+                language_groups[language_names[code]] = {
+                    metric: vector_stats(values[positions]) for metric, values in metrics.items()
+                }
+
+        pr_stats = vector_stats(merged_prs)
+        bin_indexes = np.searchsorted(AGE_BIN_EDGES, age_years, side='right') - 1
+        age_bins = np.bincount(bin_indexes[bin_indexes >= 0], minlength=len(AGE_BIN_LABELS))
+
+        return RQSummary(
+            total=total,
+            age_stats=vector_stats(age_years),
+            mature_repos=int(np.count_nonzero(self.column('age_days') > 365.25 * 5)),
+            pr_stats=pr_stats,
+            prs_above_median=int(np.count_nonzero(merged_prs > pr_stats['median'])),
+            release_stats=vector_stats(total_releases),
+            repos_with_releases=int(np.count_nonzero(total_releases > 0)),
+            update_stats=vector_stats(days_since_update),
+            recently_updated=int(np.count_nonzero(days_since_update <= 30)),
+            language_counts=language_counts,
+            repos_with_issues=int(len(ratios)),
+            issue_ratio_stats=vector_stats(ratios) if len(ratios) else {},
+            high_closure_rate=int(np.count_nonzero(ratios > 80)),
+            age_histogram=list(zip(AGE_BIN_LABELS, (int(count) for count in age_bins))),
+            language_groups=language_groups
+        )
+
+
+def vector_stats(values):
+    """
+    Equivalente vetorizado de calculate_stats
+    """
+    if not len(values):
+        return {'mean': 0, 'median': 0, 'std': 0, 'min': 0, 'max': 0}
+
+    return {
+        'mean': float(np.mean(values)),
+        'median': float(np.median(values)),
+        'std': float(np.std(values, ddof=1)) if len(values) > 1 else 0,
+        'min': values.min().item(),
+        'max': values.max().item()
+    }
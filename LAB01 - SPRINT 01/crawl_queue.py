@@ -0,0 +1,510 @@
+import argparse
+import os
+import socket
+import sqlite3
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from pipeline import CsvSink
+from repository_models import RepositoryRecord
+
+DEFAULT_QUEUE_DB = 'github_crawl_queue.sqlite'
+
+# Tempo que um worker segura uma unidade sem dar sinal de vida (cada página gravada renova o lease)
+DEFAULT_LEASE_SECONDS = 300
+
+# Tentativas de uma unidade antes de ela ser marcada como 'failed'
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Repositórios por unidade (10 páginas): unidades menores repartem melhor a coleta entre os
+# workers e perdem menos trabalho quando um worker cai
+DEFAULT_UNIT_SIZE = 200
+
+# Intervalo com que um worker sem unidade livre verifica se a coleta terminou ou se algum lease venceu
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Colunas de cada repositório coletado (as do CSV; a url é derivada de owner/name)
+RESULT_COLUMNS = [
+    'name', 'owner', 'stars', 'age_days', 'merged_prs', 'total_releases', 'days_since_update',
+    'primary_language', 'total_issues', 'closed_issues', 'closed_issues_ratio', 'has_url', 'description'
+]
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS crawls (
+        crawl_id TEXT PRIMARY KEY,
+        created_at TEXT NOT NULL,
+        reference_date TEXT NOT NULL,
+        total_repos INTEGER NOT NULL,
+        fields TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS work_units (
+        crawl_id TEXT NOT NULL,
+        unit_id INTEGER NOT NULL,
+        search_query TEXT NOT NULL,
+        label TEXT NOT NULL,
+        repo_limit INTEGER NOT NULL,
+        state TEXT NOT NULL DEFAULT 'pending',
+        after_cursor TEXT,
+        collected INTEGER NOT NULL DEFAULT 0,
+        lease_id TEXT,
+        worker TEXT,
+        lease_expires REAL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (crawl_id, unit_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_work_units_state ON work_units (crawl_id, state, lease_expires);
+    CREATE TABLE IF NOT EXISTS results (
+        crawl_id TEXT NOT NULL,
+        owner TEXT NOT NULL,
+        name TEXT NOT NULL,
+        unit_id INTEGER NOT NULL,
+        stars INTEGER NOT NULL,
+        age_days INTEGER NOT NULL,
+        merged_prs INTEGER NOT NULL,
+        total_releases INTEGER NOT NULL,
+        days_since_update INTEGER NOT NULL,
+        primary_language TEXT NOT NULL,
+        total_issues INTEGER NOT NULL,
+        closed_issues INTEGER NOT NULL,
+        closed_issues_ratio REAL NOT NULL,
+        has_url INTEGER NOT NULL,
+        description TEXT,
+        PRIMARY KEY (crawl_id, owner, name)
+    );
+    CREATE INDEX IF NOT EXISTS idx_results_stars ON results (crawl_id, stars);
+"""
+
+
+class LeaseLost(Exception):
+    """
+    O lease da unidade expirou e ela foi retomada por outro worker; o trabalho em andamento é descartado
+    """
+
+
+class WorkUnit:
+    """
+    Uma faixa da busca (query + limite) com o ponto em que a coleta parou
+    """
+    def __init__(self, crawl_id, unit_id, search_query, label, repo_limit, after_cursor, collected, lease_id,
+                 attempts):
+        self.crawl_id = crawl_id
+        self.unit_id = unit_id
+        self.search_query = search_query
+        self.label = label
+        self.repo_limit = repo_limit
+        self.after_cursor = after_cursor
+        self.collected = collected
+        self.lease_id = lease_id
+        self.attempts = attempts
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class CrawlQueue:
+    """
+    Fila de trabalho com leases em SQLite, compartilhada por qualquer número de workers
+    (processos na mesma máquina ou em máquinas que enxergam o mesmo arquivo).
+
+    Cada unidade é uma faixa de estrelas. Um worker a reivindica por `lease_seconds`, e cada
+    página gravada renova o lease e grava, na mesma transação, os repositórios e o novo
+    cursor. Uma unidade com lease vencido volta para a fila e continua do último cursor
+    gravado. O commit só vale se o lease_id ainda for o do worker, então um worker que
+    perdeu a unidade não duplica nem sobrescreve nada.
+
+    O modo WAL só funciona com todos os processos na mesma máquina. Com workers em outros
+    hosts use `wal=False` e um sistema de arquivos com locks POSIX confiáveis.
+    """
+    def __init__(self, path=DEFAULT_QUEUE_DB, wal=True, timeout=60):
+        self.path = path
+        # Transações explícitas (BEGIN IMMEDIATE) para o claim não disputar upgrade de lock
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        if wal:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _transaction(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+
+    def create_crawl(self, shards, total_repos, fields, reference_date=None, crawl_id=None):
+        """
+        Registra uma coleta com uma unidade por shard (search_query, limite, rótulo, ...)
+        e devolve o crawl_id
+        """
+        now = datetime.now(timezone.utc)
+        crawl_id = crawl_id or now.strftime('%Y%m%dT%H%M%SZ')
+        reference_date = reference_date or now
+
+        self._transaction()
+        try:
+            self.connection.execute(
+                'INSERT INTO crawls (crawl_id, created_at, reference_date, total_repos, fields) VALUES (?, ?, ?, ?, ?)',
+                (crawl_id, now.isoformat(), reference_date.isoformat(), total_repos, fields)
+            )
+            self.connection.executemany(
+                'INSERT INTO work_units (crawl_id, unit_id, search_query, label, repo_limit) VALUES (?, ?, ?, ?, ?)',
+                [(crawl_id, unit_id, search_query, label, limit)
+                 for unit_id, (search_query, limit, label, *_) in enumerate(shards)]
+            )
+            self.connection.execute('COMMIT')
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        return crawl_id
+
+    def crawl(self, crawl_id=None):
+        """
+        (crawl_id, data de referência, total pedido, campos) da coleta, por padrão a mais recente
+        """
+        if crawl_id:
+            row = self.connection.execute(
+                'SELECT crawl_id, reference_date, total_repos, fields FROM crawls WHERE crawl_id = ?', (crawl_id,)
+            ).fetchone()
+        else:
+            row = self.connection.execute(
+                'SELECT crawl_id, reference_date, total_repos, fields FROM crawls ORDER BY created_at DESC LIMIT 1'
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Coleta não encontrada em {self.path}: {crawl_id or '(nenhuma)'}")
+        return row[0], datetime.fromisoformat(row[1]), row[2], row[3]
+
+    def claim(self, crawl_id, worker, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        Reivindica a próxima unidade pendente (ou com lease vencido) e devolve um WorkUnit, ou None
+        """
+        now = time.time()
+        lease_id = uuid.uuid4().hex
+        self._transaction()
+        try:
+            row = self.connection.execute(
+                "SELECT unit_id, search_query, label, repo_limit, after_cursor, collected, attempts "
+                "FROM work_units WHERE crawl_id = ? "
+                "AND (state = 'pending' OR (state = 'leased' AND lease_expires < ?)) "
+                "ORDER BY unit_id LIMIT 1",
+                (crawl_id, now)
+            ).fetchone()
+            if row is None:
+                self.connection.execute('COMMIT')
+                return None
+
+            unit_id, search_query, label, repo_limit, after_cursor, collected, attempts = row
+            self.connection.execute(
+                "UPDATE work_units SET state = 'leased', lease_id = ?, worker = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE crawl_id = ? AND unit_id = ?",
+                (lease_id, worker, now + lease_seconds, crawl_id, unit_id)
+            )
+            self.connection.execute('COMMIT')
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        return WorkUnit(crawl_id, unit_id, search_query, label, repo_limit, after_cursor, collected, lease_id,
+                        attempts + 1)
+
+    def commit_page(self, unit, end_cursor, collected, done, records, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        Grava os registros de uma página e avança o cursor da unidade numa única transação,
+        renovando o lease. Levanta LeaseLost se a unidade já foi retomada por outro worker.
+        """
+        rows = [(unit.crawl_id, record.owner, record.name, unit.unit_id, record.stars, record.age_days,
+                 record.merged_prs, record.total_releases, record.days_since_update, record.primary_language,
+                 record.total_issues, record.closed_issues, record.closed_issues_ratio, int(record.has_url),
+                 record.description)
+                for record in records]
+
+        self._transaction()
+        try:
+            updated = self.connection.execute(
+                "UPDATE work_units SET after_cursor = ?, collected = ?, state = ?, lease_expires = ? "
+                "WHERE crawl_id = ? AND unit_id = ? AND lease_id = ? AND state = 'leased'",
+                (end_cursor, collected, 'done' if done else 'leased', time.time() + lease_seconds,
+                 unit.crawl_id, unit.unit_id, unit.lease_id)
+            ).rowcount
+            if not updated:
+                raise LeaseLost(f"Unidade {unit.label} foi retomada por outro worker")
+            # Um repositório que mudou de faixa durante a coleta pode vir de duas unidades: fica o primeiro
+            self.connection.executemany(
+                f"INSERT OR IGNORE INTO results (crawl_id, owner, name, unit_id, {', '.join(RESULT_COLUMNS[2:])}) "
+                f"VALUES ({', '.join('?' * (len(RESULT_COLUMNS) + 2))})",
+                rows
+            )
+            self.connection.execute('COMMIT')
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        unit.after_cursor = end_cursor
+        unit.collected = collected
+
+    def release(self, unit, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        Devolve a unidade à fila (mantendo o cursor gravado) depois de uma falha; após
+        `max_attempts` tentativas ela fica como 'failed'
+        """
+        state = 'failed' if unit.attempts >= max_attempts else 'pending'
+        self._transaction()
+        try:
+            self.connection.execute(
+                "UPDATE work_units SET state = ?, lease_id = NULL, lease_expires = NULL "
+                "WHERE crawl_id = ? AND unit_id = ? AND lease_id = ?",
+                (state, unit.crawl_id, unit.unit_id, unit.lease_id)
+            )
+            self.connection.execute('COMMIT')
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        return state
+
+    def remaining(self, crawl_id):
+        """
+        Unidades ainda não concluídas (pendentes ou com lease)
+        """
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM work_units WHERE crawl_id = ? AND state IN ('pending', 'leased')", (crawl_id,)
+        ).fetchone()[0]
+
+    def failed(self, crawl_id):
+        """
+        Unidades que esgotaram as tentativas: os repositórios delas não estão na coleta
+        """
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM work_units WHERE crawl_id = ? AND state = 'failed'", (crawl_id,)
+        ).fetchone()[0]
+
+    def status(self, crawl_id):
+        """
+        Unidades por estado, repositórios gravados e leases ativos (worker, rótulo, segundos restantes)
+        """
+        states = dict(self.connection.execute(
+            'SELECT state, COUNT(*) FROM work_units WHERE crawl_id = ? GROUP BY state', (crawl_id,)
+        ).fetchall())
+        results = self.connection.execute(
+            'SELECT COUNT(*) FROM results WHERE crawl_id = ?', (crawl_id,)
+        ).fetchone()[0]
+        now = time.time()
+        leases = [(worker, label, expires - now) for worker, label, expires in self.connection.execute(
+            "SELECT worker, label, lease_expires FROM work_units WHERE crawl_id = ? AND state = 'leased' "
+            "ORDER BY unit_id", (crawl_id,)
+        )]
+        return states, results, leases
+
+    def iter_records(self, crawl_id, limit=None, page_size=1000):
+        """
+        Páginas de RepositoryRecord da coleta, da mais popular para a menos popular
+        """
+        query = (f"SELECT {', '.join(RESULT_COLUMNS)} FROM results WHERE crawl_id = ? "
+                 "ORDER BY stars DESC, owner, name")
+        params = [crawl_id]
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+
+        cursor = self.connection.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(page_size)
+            if not rows:
+                return
+            yield [RepositoryRecord(*row[:11], has_url=bool(row[11]), description=row[12]) for row in rows]
+
+    def export_csv(self, crawl_id, filename='github_repositories_data.csv', limit=None):
+        """
+        Grava os `limit` repositórios mais populares da coleta no mesmo CSV da coleta local
+        """
+        sink = CsvSink(filename)
+        try:
+            for page in self.iter_records(crawl_id, limit):
+                sink.write_page(page)
+        finally:
+            sink.close()
+        return sink.count
+
+
+def process_unit(analyzer, queue, unit, fields, current_date, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    Coleta a unidade a partir do último cursor gravado, gravando página a página.
+    Devolve True se a unidade terminou e False se uma requisição falhou no meio.
+    """
+    collected = unit.collected
+    for _, page_info, nodes in analyzer.iter_search_results(unit.search_query, unit.after_cursor, fields):
+        nodes = nodes[:unit.repo_limit - collected]
+        collected += len(nodes)
+        done = collected >= unit.repo_limit or not page_info['hasNextPage']
+
+        with analyzer.metrics.span('process_data'):
+            records = analyzer.process_data(nodes, current_date)
+        queue.commit_page(unit, page_info['endCursor'], collected, done, records, lease_seconds)
+        print(f"[{unit.label}] Coletados {collected} repositórios...")
+        if done:
+            return True
+    return False
+
+
+def run_worker(analyzer, queue, crawl_id=None, worker=None, lease_seconds=DEFAULT_LEASE_SECONDS,
+               max_attempts=DEFAULT_MAX_ATTEMPTS, poll_interval=DEFAULT_POLL_INTERVAL):
+    """
+    Laço de um worker: reivindica unidades até a coleta inteira terminar. Enquanto outras
+    unidades estão com lease de outros workers, espera e tenta de novo (para retomá-las se
+    o lease vencer). Devolve quantas unidades este worker concluiu.
+    """
+    crawl_id, reference_date, _, fields = queue.crawl(crawl_id)
+    worker = worker or default_worker_id()
+    completed = 0
+
+    while True:
+        unit = queue.claim(crawl_id, worker, lease_seconds)
+        if unit is None:
+            if not queue.remaining(crawl_id):
+                return completed
+            time.sleep(poll_interval)
+            continue
+
+        try:
+            with analyzer.metrics.span('crawl_unit'):
+                finished = process_unit(analyzer, queue, unit, fields, reference_date, lease_seconds)
+        except LeaseLost as e:
+            print(f"{e}; descartando o trabalho em andamento.")
+            continue
+
+        if finished:
+            completed += 1
+            analyzer.metrics.inc('crawl_units_total', status='done')
+        else:
+            state = queue.release(unit, max_attempts)
+            analyzer.metrics.inc('crawl_units_total', status=state)
+            print(f"[{unit.label}] Falha na coleta; unidade devolvida à fila ({state}).")
+
+
+def worker_process(path, crawl_id, tokens, url, wal, lease_seconds, index):
+    """
+    Ponto de entrada de cada processo de `work --processes N` (cada um com o seu cliente e scheduler)
+    """
+    from lab01s01_github import GitHubRepositoryAnalyzer
+
+    analyzer = GitHubRepositoryAnalyzer(tokens, url=url)
+    queue = CrawlQueue(path, wal=wal)
+    try:
+        completed = run_worker(analyzer, queue, crawl_id, f"{default_worker_id()}#{index}", lease_seconds)
+        print(f"Worker {index}: {completed} unidades concluídas.")
+    finally:
+        queue.close()
+        analyzer.client.close()
+
+
+def split_tokens(tokens, processes):
+    """
+    Reparte os tokens entre os processos, sem nenhum token em dois processos: cada um tem
+    o próprio token bucket, então um token compartilhado receberia N vezes o limite
+    secundário. Devolve no máximo len(tokens) grupos.
+    """
+    processes = min(processes, len(tokens))
+    return [tokens[index::processes] for index in range(processes)]
+
+
+def main(argv=None):
+    from graphql_client import GITHUB_GRAPHQL_URL
+
+    parser = argparse.ArgumentParser(description="Coleta distribuída: fila de faixas de estrelas com leases em SQLite")
+    parser.add_argument('--db', default=DEFAULT_QUEUE_DB, help="arquivo SQLite da fila (compartilhado pelos workers)")
+    parser.add_argument('--no-wal', action='store_true',
+                        help="desliga o WAL (necessário com workers em outras máquinas no mesmo arquivo)")
+    parser.add_argument('--api-url', default=GITHUB_GRAPHQL_URL, help="endpoint GraphQL")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    plan = subparsers.add_parser('plan', help="monta as faixas de estrelas e cria a coleta na fila")
+    plan.add_argument('--repos', type=int, default=1000, help="número de repositórios a coletar")
+    plan.add_argument('--workers', type=int, default=8, help="requisições em paralelo na montagem das faixas")
+    plan.add_argument('--no-text-fields', action='store_true', help="não busca url/description")
+    plan.add_argument('--unit-size', type=int, default=DEFAULT_UNIT_SIZE,
+                      help="máximo de repositórios por unidade de trabalho (faixa de estrelas)")
+
+    work = subparsers.add_parser('work', help="processa unidades da fila até a coleta terminar")
+    work.add_argument('--crawl', help="crawl_id (padrão: a coleta mais recente)")
+    work.add_argument('--processes', type=int, default=1, help="processos worker nesta máquina (no máximo um por token)")
+    work.add_argument('--lease', type=float, default=DEFAULT_LEASE_SECONDS, help="duração do lease (s)")
+
+    status = subparsers.add_parser('status', help="andamento da coleta")
+    status.add_argument('--crawl')
+
+    export = subparsers.add_parser('export', help="grava o CSV com os repositórios coletados")
+    export.add_argument('--crawl')
+    export.add_argument('--csv', default='github_repositories_data.csv')
+
+    args = parser.parse_args(argv)
+    wal = not args.no_wal
+
+    if args.command == 'work' and args.processes > 1:
+        import multiprocessing
+        from lab01_cli import load_tokens
+
+        queue = CrawlQueue(args.db, wal=wal)
+        crawl_id = queue.crawl(args.crawl)[0]
+        queue.close()
+        token_groups = split_tokens(load_tokens(), args.processes)
+        if len(token_groups) < args.processes:
+            print(f"Aviso: só {len(token_groups)} tokens para {args.processes} processos; "
+                  f"usando {len(token_groups)} processos (um token não pode ser dividido entre eles).")
+        processes = [multiprocessing.Process(target=worker_process,
+                                             args=(args.db, crawl_id, tokens, args.api_url, wal, args.lease, index))
+                     for index, tokens in enumerate(token_groups)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        return 0 if all(process.exitcode == 0 for process in processes) else 1
+
+    queue = CrawlQueue(args.db, wal=wal)
+    try:
+        if args.command == 'plan':
+            from lab01_cli import load_tokens
+            from lab01s01_github import GitHubRepositoryAnalyzer
+            from query_builder import build_repository_fields
+
+            analyzer = GitHubRepositoryAnalyzer(load_tokens(), url=args.api_url)
+            fields = build_repository_fields(include_text=not args.no_text_fields)
+            shards = analyzer.plan_shards(args.repos, args.workers, fields=fields, max_shard_size=args.unit_size)
+            crawl_id = queue.create_crawl(shards, args.repos, fields)
+            print(f"Coleta {crawl_id}: {len(shards)} unidades em {args.db}")
+
+        elif args.command == 'work':
+            from lab01_cli import load_tokens
+            from lab01s01_github import GitHubRepositoryAnalyzer
+
+            analyzer = GitHubRepositoryAnalyzer(load_tokens(), url=args.api_url)
+            completed = run_worker(analyzer, queue, args.crawl, lease_seconds=args.lease)
+            print(f"{completed} unidades concluídas por este worker.")
+            analyzer.scheduler.report()
+
+        elif args.command == 'status':
+            crawl_id, _, total_repos, _ = queue.crawl(args.crawl)
+            states, results, leases = queue.status(crawl_id)
+            print(f"Coleta {crawl_id}: {results} de {total_repos} repositórios gravados")
+            for state, count in sorted(states.items()):
+                print(f"  {state:<8} {count} unidades")
+            for worker, label, seconds in leases:
+                expiry = f"vence em {seconds:.0f}s" if seconds > 0 else "vencido, será retomado"
+                print(f"  {label:<24} {worker} ({expiry})")
+
+        elif args.command == 'export':
+            crawl_id, _, total_repos, _ = queue.crawl(args.crawl)
+            remaining = queue.remaining(crawl_id)
+            if remaining:
+                print(f"Aviso: {remaining} unidades ainda não terminaram; o CSV ficará incompleto.")
+            failed = queue.failed(crawl_id)
+            if failed:
+                print(f"Aviso: {failed} unidades falharam (tentativas esgotadas); o CSV ficará incompleto.")
+            count = queue.export_csv(crawl_id, args.csv, total_repos)
+            print(f"{count} repositórios salvos em: {args.csv}")
+            if failed:
+                return 1
+    finally:
+        queue.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
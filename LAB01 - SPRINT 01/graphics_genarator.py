@@ -1,96 +1,276 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-
-# Carregar CSV
-df = pd.read_csv("github_repositories_data.csv")
-
-# Converter idade de dias para anos
-df["age_years"] = df["age_days"] / 365.25
-
-# -------------------------
-# RQ01 – Maturidade (idade)
-# -------------------------
-plt.figure(figsize=(6,5))
-sns.boxplot(x=df["age_years"], color="skyblue")
-plt.title("RQ01 – Idade dos Repositórios (anos)")
-plt.xlabel("Idade (anos)")
-plt.savefig("RQ01_maturidade.png")
-plt.close()
-
-# -------------------------
-# RQ02 – Contribuição externa (PRs aceitos)
-# -------------------------
-plt.figure(figsize=(6,5))
-sns.boxplot(x=np.log1p(df["merged_prs"]), color="lightgreen")
-plt.title("RQ02 – PRs Aceitos (escala log)")
-plt.xlabel("log(1 + PRs aceitos)")
-plt.savefig("RQ02_contribuicao.png")
-plt.close()
-
-# -------------------------
-# RQ03 – Releases
-# -------------------------
-plt.figure(figsize=(6,5))
-sns.boxplot(x=np.log1p(df["total_releases"]), color="violet")
-plt.title("RQ03 – Releases (escala log)")
-plt.xlabel("log(1 + Releases)")
-plt.savefig("RQ03_releases.png")
-plt.close()
-
-# -------------------------
-# RQ04 – Atualizações
-# -------------------------
-plt.figure(figsize=(7,6))
-sns.scatterplot(x="age_years", y="days_since_update", data=df, alpha=0.6)
-plt.title("RQ04 – Idade vs Dias desde última atualização")
-plt.xlabel("Idade (anos)")
-plt.ylabel("Dias desde última atualização")
-plt.savefig("RQ04_atualizacoes.png")
-plt.close()
-
-# -------------------------
-# RQ05 – Linguagens utilizadas
-# -------------------------
-top_langs = df["primary_language"].value_counts().head(10).index
-df_top = df[df["primary_language"].isin(top_langs)]
-
-plt.figure(figsize=(10,6))
-heatmap_data = df_top.pivot_table(values="stars", index="primary_language", aggfunc="median")
-sns.heatmap(heatmap_data, annot=True, cmap="YlGnBu", fmt=".0f")
-plt.title("RQ05 – Mediana de Stars por Linguagem (Top 10)")
-plt.xlabel("Métrica")
-plt.ylabel("Linguagem")
-plt.savefig("RQ05_linguagens.png")
-plt.close()
-
-# -------------------------
-# RQ06 – Issues fechadas
-# -------------------------
-plt.figure(figsize=(6,5))
-sns.boxplot(x=df["closed_issues_ratio"], color="orange")
-plt.title("RQ06 – Percentual de Issues Fechadas")
-plt.xlabel("% de Issues Fechadas")
-plt.savefig("RQ06_issues.png")
-plt.close()
-
-# -------------------------
-# RQ07 – Comparação por linguagem
-# -------------------------
-top_langs = df["primary_language"].value_counts().head(5).index
-df_top = df[df["primary_language"].isin(top_langs)]
-
-summary = df_top.groupby("primary_language").agg({
-    "merged_prs": "median",
-    "total_releases": "median",
-    "days_since_update": "median"
-})
-
-plt.figure(figsize=(8,6))
-sns.heatmap(summary, annot=True, cmap="coolwarm", fmt=".0f")
-plt.title("RQ07 – Comparação por Linguagem (Medianas)")
-plt.savefig("RQ07_comparacao_linguagens.png")
-plt.close()
-
-print("✅ Gráficos gerados: RQ01 a RQ07 (boxplot, scatter e heatmap).")
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import columnar_output
+
+# pandas/matplotlib/seaborn/numpy são carregados por load_plotting_libraries() só quando
+# um gráfico é de fato lido/renderizado; importar este módulo não paga esse custo
+pd = None
+plt = None
+sns = None
+np = None
+
+# Hash das colunas usadas em cada gráfico na última renderização
+CACHE_FILE = ".charts_cache.json"
+
+DEFAULT_CSV = "github_repositories_data.csv"
+
+# Colunas usadas por cada gráfico
+RQ_COLUMNS = {
+    "RQ01": ["age_days"],
+    "RQ02": ["merged_prs"],
+    "RQ03": ["total_releases"],
+    "RQ04": ["age_days", "days_since_update"],
+    "RQ05": ["primary_language", "stars"],
+    "RQ06": ["closed_issues_ratio"],
+    "RQ07": ["primary_language", "merged_prs", "total_releases", "days_since_update"],
+}
+
+# Tipos do CSV, para não depender da inferência do pandas
+CSV_DTYPES = {
+    "stars": "int64",
+    "age_days": "int32",
+    "merged_prs": "int64",
+    "total_releases": "int32",
+    "days_since_update": "int32",
+    "primary_language": "string",
+    "closed_issues_ratio": "float64",
+}
+
+
+def load_plotting_libraries():
+    """
+    Importa a pilha de gráficos na primeira chamada (em cada processo do pool)
+    """
+    global pd, plt, sns, np
+    if plt is not None:
+        return
+
+    import matplotlib
+    matplotlib.use("Agg")  # backend não interativo: cada processo renderiza sem janela
+
+    import pandas
+    import matplotlib.pyplot
+    import seaborn
+    import numpy
+    pd, plt, sns, np = pandas, matplotlib.pyplot, seaborn, numpy
+
+
+def dataset_partition(csv_path=DEFAULT_CSV, dataset=False):
+    """
+    Partição Parquet/Feather a ler no lugar do CSV, ou None. O dataset fica ao lado do CSV
+    (github_repositories_data/ no diretório dele). Com `dataset` (--dataset) vale a partição
+    mais recente; sem a flag, só para o CSV padrão e quando ela é da mesma coleta ou mais
+    nova que ele, então um --csv explícito nunca é trocado pelo dataset.
+    """
+    if columnar_output.pa is None or (not dataset and csv_path != DEFAULT_CSV):
+        return None
+    path = columnar_output.latest_partition(os.path.join(os.path.dirname(csv_path), columnar_output.DATASET_DIR))
+    if path and (dataset or not os.path.exists(csv_path) or os.path.getmtime(path) >= os.path.getmtime(csv_path)):
+        return path
+    return None
+
+
+def load_data(columns, csv_path=DEFAULT_CSV, dataset=False):
+    """
+    Carrega só as colunas pedidas do CSV, ou da partição escolhida por dataset_partition
+    (leitura projetada/memory map)
+    """
+    load_plotting_libraries()
+    path = dataset_partition(csv_path, dataset)
+    if path:
+        df = columnar_output.read_columns(path, columns).to_pandas()
+        # Colunas codificadas por dicionário viram category; voltam a texto para os gráficos
+        for column in df.select_dtypes("category").columns:
+            df[column] = df[column].astype(str)
+        return df
+
+    return pd.read_csv(csv_path, usecols=columns, dtype={c: CSV_DTYPES[c] for c in columns})
+
+
+def plot_rq01(df):
+    # -------------------------
+    # RQ01 – Maturidade (idade)
+    # -------------------------
+    df["age_years"] = df["age_days"] / 365.25
+    plt.figure(figsize=(6,5))
+    sns.boxplot(x=df["age_years"], color="skyblue")
+    plt.title("RQ01 – Idade dos Repositórios (anos)")
+    plt.xlabel("Idade (anos)")
+
+
+def plot_rq02(df):
+    # -------------------------
+    # RQ02 – Contribuição externa (PRs aceitos)
+    # -------------------------
+    plt.figure(figsize=(6,5))
+    sns.boxplot(x=np.log1p(df["merged_prs"]), color="lightgreen")
+    plt.title("RQ02 – PRs Aceitos (escala log)")
+    plt.xlabel("log(1 + PRs aceitos)")
+
+
+def plot_rq03(df):
+    # -------------------------
+    # RQ03 – Releases
+    # -------------------------
+    plt.figure(figsize=(6,5))
+    sns.boxplot(x=np.log1p(df["total_releases"]), color="violet")
+    plt.title("RQ03 – Releases (escala log)")
+    plt.xlabel("log(1 + Releases)")
+
+
+def plot_rq04(df):
+    # -------------------------
+    # RQ04 – Atualizações
+    # -------------------------
+    df["age_years"] = df["age_days"] / 365.25
+    plt.figure(figsize=(7,6))
+    sns.scatterplot(x="age_years", y="days_since_update", data=df, alpha=0.6)
+    plt.title("RQ04 – Idade vs Dias desde última atualização")
+    plt.xlabel("Idade (anos)")
+    plt.ylabel("Dias desde última atualização")
+
+
+def plot_rq05(df):
+    # -------------------------
+    # RQ05 – Linguagens utilizadas
+    # -------------------------
+    top_langs = df["primary_language"].value_counts().head(10).index
+    df_top = df[df["primary_language"].isin(top_langs)]
+
+    plt.figure(figsize=(10,6))
+    heatmap_data = df_top.pivot_table(values="stars", index="primary_language", aggfunc="median")
+    sns.heatmap(heatmap_data, annot=True, cmap="YlGnBu", fmt=".0f")
+    plt.title("RQ05 – Mediana de Stars por Linguagem (Top 10)")
+    plt.xlabel("Métrica")
+    plt.ylabel("Linguagem")
+
+
+def plot_rq06(df):
+    # -------------------------
+    # RQ06 – Issues fechadas
+    # -------------------------
+    plt.figure(figsize=(6,5))
+    sns.boxplot(x=df["closed_issues_ratio"], color="orange")
+    plt.title("RQ06 – Percentual de Issues Fechadas")
+    plt.xlabel("% de Issues Fechadas")
+
+
+def plot_rq07(df):
+    # -------------------------
+    # RQ07 – Comparação por linguagem
+    # -------------------------
+    top_langs = df["primary_language"].value_counts().head(5).index
+    df_top = df[df["primary_language"].isin(top_langs)]
+
+    summary = df_top.groupby("primary_language").agg({
+        "merged_prs": "median",
+        "total_releases": "median",
+        "days_since_update": "median"
+    })
+
+    plt.figure(figsize=(8,6))
+    sns.heatmap(summary, annot=True, cmap="coolwarm", fmt=".0f")
+    plt.title("RQ07 – Comparação por Linguagem (Medianas)")
+
+
+# Função e arquivo de saída de cada gráfico
+CHARTS = {
+    "RQ01": (plot_rq01, "RQ01_maturidade.png"),
+    "RQ02": (plot_rq02, "RQ02_contribuicao.png"),
+    "RQ03": (plot_rq03, "RQ03_releases.png"),
+    "RQ04": (plot_rq04, "RQ04_atualizacoes.png"),
+    "RQ05": (plot_rq05, "RQ05_linguagens.png"),
+    "RQ06": (plot_rq06, "RQ06_issues.png"),
+    "RQ07": (plot_rq07, "RQ07_comparacao_linguagens.png"),
+}
+
+
+def columns_hash(df):
+    """
+    Hash do conteúdo das colunas (nomes, tipos e valores) usadas por um gráfico
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([(c, str(t)) for c, t in df.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def render_chart(rq, csv_path, previous_hash=None, dataset=False):
+    """
+    Renderiza um gráfico (roda dentro de um processo do pool). Se as colunas de entrada
+    não mudaram desde a última vez e o PNG existe, não renderiza de novo.
+    Retorna (rq, hash, renderizado?).
+    """
+    plot, output = CHARTS[rq]
+    df = load_data(RQ_COLUMNS[rq], csv_path, dataset)
+    digest = columns_hash(df)
+
+    if digest == previous_hash and os.path.exists(output):
+        return rq, digest, False
+
+    plot(df)
+    plt.savefig(output)
+    plt.close("all")
+    return rq, digest, True
+
+
+def load_cache():
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(cache):
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+
+
+def render_charts(rqs=None, csv_path=DEFAULT_CSV, workers=None, force=False, dataset=False):
+    """
+    Renderiza os gráficos pedidos em paralelo, um processo por gráfico
+    """
+    rqs = rqs or list(CHARTS)
+    cache = {} if force else load_cache()
+
+    with ProcessPoolExecutor(max_workers=workers or min(len(rqs), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(render_chart, rq, csv_path, cache.get(rq), dataset) for rq in rqs]
+        results = [future.result() for future in futures]
+
+    rendered = []
+    for rq, digest, was_rendered in results:
+        cache[rq] = digest
+        if was_rendered:
+            rendered.append(rq)
+        else:
+            print(f"{rq}: dados não mudaram, mantendo {CHARTS[rq][1]}")
+    save_cache(cache)
+
+    return rendered
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera os gráficos das RQs a partir dos dados coletados")
+    parser.add_argument("--rq", nargs="+", choices=list(CHARTS), help="gráficos a gerar (padrão: todos)")
+    parser.add_argument("--csv", default=DEFAULT_CSV, help="CSV dos repositórios (o dataset ao lado dele só é lido "
+                                                            "no lugar do CSV padrão ou com --dataset)")
+    parser.add_argument("--dataset", action="store_true",
+                        help="lê a partição Parquet/Feather mais recente ao lado do --csv em vez do CSV")
+    parser.add_argument("--workers", type=int, help="processos em paralelo (padrão: um por gráfico, até o número de CPUs)")
+    parser.add_argument("--force", action="store_true", help="renderiza mesmo que os dados não tenham mudado")
+    args = parser.parse_args(argv)
+    if args.dataset and dataset_partition(args.csv, True) is None:
+        parser.error("--dataset: nenhuma partição Parquet/Feather encontrada (ou pyarrow não instalado)")
+
+    rendered = render_charts(args.rq, args.csv, args.workers, args.force, args.dataset)
+    if rendered:
+        print(f"✅ Gráficos gerados: {', '.join(rendered)} (boxplot, scatter e heatmap).")
+
+
+if __name__ == "__main__":
+    main()
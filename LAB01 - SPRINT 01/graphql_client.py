@@ -0,0 +1,140 @@
+import importlib.util
+import json
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# httpx só negocia HTTP/2 com o pacote h2 instalado; basta saber que ele existe
+HTTP2_AVAILABLE = httpx is not None and importlib.util.find_spec('h2') is not None
+
+GITHUB_GRAPHQL_URL = 'https://api.github.com/graphql'
+
+
+class TransportError(Exception):
+    """
+    Falha de rede/conexão em qualquer transporte (equivalente ao RequestException do requests)
+    """
+
+
+class TransportResponse:
+    """
+    Resposta mínima usada pelos transportes que não falam HTTP de verdade
+    """
+    def __init__(self, status_code, content, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class RequestsTransport:
+    """
+    Transporte HTTP/1.1 com requests.Session: conexões keep-alive reaproveitadas entre páginas e shards
+    """
+    def __init__(self, pool_size=16):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def post(self, url, payload, headers, timeout):
+        try:
+            return self.session.post(url, json=payload, headers=headers, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            raise TransportError(e) from e
+
+    def close(self):
+        self.session.close()
+
+
+class HTTPXTransport:
+    """
+    Transporte HTTP/2 com httpx: várias requisições concorrentes multiplexadas na mesma conexão
+    """
+    def __init__(self, pool_size=16):
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    def post(self, url, payload, headers, timeout):
+        try:
+            return self.client.post(url, json=payload, headers=headers, timeout=timeout)
+        except httpx.HTTPError as e:
+            raise TransportError(e) from e
+
+    def close(self):
+        self.client.close()
+
+
+class CallableTransport:
+    """
+    Transporte em memória: repassa o payload para `handler(payload)`, que devolve
+    (status, corpo) ou só o corpo (dict). Útil para testes e benchmarks sem rede.
+    """
+    def __init__(self, handler):
+        self.handler = handler
+
+    def post(self, url, payload, headers, timeout):
+        result = self.handler(payload)
+        status, body = result if isinstance(result, tuple) else (200, result)
+        return TransportResponse(status, json.dumps(body).encode('utf-8'))
+
+    def close(self):
+        pass
+
+
+def create_transport(pool_size=16):
+    """
+    Usa HTTP/2 (httpx + h2) quando disponível, senão requests.Session
+    """
+    if HTTP2_AVAILABLE:
+        return HTTPXTransport(pool_size)
+    return RequestsTransport(pool_size)
+
+
+class GraphQLClient:
+    """
+    Cliente GraphQL do GitHub: guarda os headers de autenticação, pede respostas
+    comprimidas e envia tudo pelo mesmo transporte (pool de conexões persistentes).
+    Requisições de outros tokens do pool usam o mesmo transporte, só trocando o header.
+    """
+    def __init__(self, token, url=GITHUB_GRAPHQL_URL, transport=None, pool_size=16, timeout=30):
+        self.token = token
+        self.url = url
+        self.timeout = timeout
+        self.transport = transport or create_transport(pool_size)
+        self.headers = self.headers_for(token)
+        self.token_headers = {token: self.headers}
+
+    def headers_for(self, token):
+        return {
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+        }
+
+    def post(self, query, variables=None, token=None):
+        payload = {'query': query}
+        if variables:
+            payload['variables'] = variables
+        headers = self.headers
+        if token is not None and token != self.token:
+            headers = self.token_headers.get(token)
+            if headers is None:
+                headers = self.token_headers[token] = self.headers_for(token)
+        return self.transport.post(self.url, payload, headers, self.timeout)
+
+    def close(self):
+        self.transport.close()
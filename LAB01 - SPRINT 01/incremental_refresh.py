@@ -0,0 +1,68 @@
+import json
+import os
+
+import json_codec
+
+
+def repository_key(repo):
+    return f"{repo['owner']['login']}/{repo['name']}"
+
+
+class RepositoryStore:
+    """
+    Guarda em disco (JSON) o último nó GraphQL completo de cada repositório, indexado por
+    "owner/name". Como os campos derivados (idade, dias desde update) dependem da data
+    da análise, guardamos os dados brutos e reprocessamos a cada execução.
+    """
+    def __init__(self, path='github_repositories_raw.json'):
+        self.path = path
+        self.repositories = {}
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                self.repositories = json.load(f)
+        return self.repositories
+
+    def save(self):
+        # Escreve num arquivo temporário e troca, para nunca deixar o store pela metade
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json_codec.dumps(self.repositories))
+        os.replace(tmp_path, self.path)
+
+
+def find_changed_repositories(light_repos, stored):
+    """
+    Compara o resultado da query leve com o store e devolve os "owner/name" que
+    precisam das métricas caras de novo (novos ou com updatedAt/pushedAt diferentes)
+    """
+    changed = []
+    for repo in light_repos:
+        key = repository_key(repo)
+        previous = stored.get(key)
+        if (previous is None
+                or previous.get('updatedAt') != repo['updatedAt']
+                or previous.get('pushedAt') != repo['pushedAt']):
+            changed.append(key)
+    return changed
+
+
+def merge_refreshed(light_repos, fresh_repos, stored):
+    """
+    Junta o resultado da query leve com os nós recém-buscados e os do store.
+    Devolve os nós na ordem da busca, só com o conjunto atual do top-N e com as
+    estrelas sempre atualizadas.
+    """
+    refreshed = {repository_key(repo): repo for repo in fresh_repos}
+
+    merged = []
+    for repo in light_repos:
+        key = repository_key(repo)
+        node = refreshed.get(key) or stored.get(key)
+        if node is None:
+            # Falhou ao buscar um repositório novo: fica para a próxima execução
+            continue
+        merged.append(dict(node, stargazerCount=repo['stargazerCount']))
+
+    return merged
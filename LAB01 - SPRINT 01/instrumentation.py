@@ -0,0 +1,218 @@
+import cProfile
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+# Limites (em segundos) dos buckets dos histogramas de latência, no estilo do Prometheus
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in pairs) + '}'
+
+
+class Histogram:
+    """
+    Histograma cumulativo com buckets fixos (contagem, soma e máximo)
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def to_dict(self):
+        return {'count': self.count, 'sum': self.sum, 'max': self.max,
+                'buckets': dict(zip([str(bound) for bound in self.buckets] + ['+Inf'], self.counts))}
+
+
+class Metrics:
+    """
+    Instrumentação leve e thread-safe: contadores, histogramas e spans (trechos cronometrados).
+    Cada span vira uma linha no JSONL (se `jsonl_path` for dado) e uma observação no
+    histograma `<nome>_seconds`; os estágios em `profile_stages` rodam sob cProfile
+    (ou pyinstrument, se `profiler='pyinstrument'`) e o perfil é salvo em `profile_dir`.
+    """
+    def __init__(self, jsonl_path=None, profile_stages=(), profile_dir='profiles', profiler='cprofile'):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.jsonl = open(jsonl_path, 'a', encoding='utf-8') if jsonl_path else None
+        self.profile_stages = set(profile_stages)
+        self.profile_dir = profile_dir
+        self.profiler = profiler
+        if profiler == 'pyinstrument' and pyinstrument is None:
+            raise ImportError("O profiler pyinstrument não está instalado (pip install pyinstrument)")
+
+    def inc(self, name, value=1, **labels):
+        key = (name, label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, label_key(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def span(self, name, **labels):
+        """
+        Cronometra o bloco: `with metrics.span('process_data'): ...`
+        """
+        profiler = self._start_profiler(name)
+        start = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler:
+                self._save_profile(name, profiler)
+            self._record_span(name, elapsed, labels, status)
+
+    def timed(self, name, pages, **labels):
+        """
+        Cronometra a produção de cada item de um gerador (ex.: a espera por cada página da API)
+        """
+        iterator = iter(pages)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self._record_span(name, time.perf_counter() - start, labels)
+            yield item
+
+    def _record_span(self, name, seconds, labels, status='ok'):
+        self.observe(f"{name}_seconds", seconds, **labels)
+        self._emit({'type': 'span', 'name': name, 'labels': labels, 'seconds': seconds, 'status': status})
+
+    def _emit(self, event):
+        if self.jsonl is None:
+            return
+        event['time'] = time.time()
+        line = json.dumps(event, ensure_ascii=False)
+        with self.lock:
+            self.jsonl.write(line + '\n')
+
+    def _start_profiler(self, name):
+        if name not in self.profile_stages and 'all' not in self.profile_stages:
+            return None
+        # cProfile só acompanha a thread atual; spans concorrentes de outras threads não são perfilados
+        if threading.current_thread() is not threading.main_thread():
+            return None
+
+        if self.profiler == 'pyinstrument':
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return profiler
+
+    def _save_profile(self, name, profiler):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        if self.profiler == 'pyinstrument':
+            profiler.stop()
+            path = os.path.join(self.profile_dir, f"{name}-{stamp}.html")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+        else:
+            profiler.disable()
+            path = os.path.join(self.profile_dir, f"{name}-{stamp}.prof")
+            profiler.dump_stats(path)
+        print(f"Perfil de {name} salvo em: {path}")
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [{'name': name, 'labels': dict(key), 'value': value}
+                             for (name, key), value in sorted(self.counters.items())],
+                'histograms': [{'name': name, 'labels': dict(key), **histogram.to_dict()}
+                               for (name, key), histogram in sorted(self.histograms.items())]
+            }
+
+    def close(self):
+        """
+        Fecha o JSONL com uma última linha contendo todos os contadores e histogramas
+        """
+        if self.jsonl:
+            self._emit({'type': 'metrics', **self.snapshot()})
+            self.jsonl.close()
+            self.jsonl = None
+
+    def write_prometheus(self, path):
+        """
+        Exporta no formato textfile do Prometheus (node_exporter --collector.textfile), com troca atômica
+        """
+        lines = []
+        with self.lock:
+            # Uma linha `# TYPE` por métrica, antes da primeira série dela (a ordenação agrupa os rótulos)
+            previous = None
+            for (name, key), value in sorted(self.counters.items()):
+                if name != previous:
+                    lines.append(f"# TYPE lab01_{name} counter")
+                    previous = name
+                lines.append(f"lab01_{name}{format_labels(key)} {value}")
+            for (name, key), histogram in sorted(self.histograms.items()):
+                if name != previous:
+                    lines.append(f"# TYPE lab01_{name} histogram")
+                    previous = name
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+                    cumulative += count
+                    lines.append(f"lab01_{name}_bucket{format_labels(key, [('le', bound)])} {cumulative}")
+                lines.append(f"lab01_{name}_sum{format_labels(key)} {histogram.sum}")
+                lines.append(f"lab01_{name}_count{format_labels(key)} {histogram.count}")
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+    def report(self):
+        """
+        Tempo total por span, do mais caro para o mais barato
+        """
+        with self.lock:
+            spans = [(name[:-len('_seconds')], dict(key), histogram)
+                     for (name, key), histogram in self.histograms.items() if name.endswith('_seconds')]
+        if not spans:
+            return
+
+        print("\nTempo por etapa:")
+        for name, labels, histogram in sorted(spans, key=lambda span: -span[2].sum):
+            label_text = ' '.join(f"{key}={value}" for key, value in labels.items())
+            print(f"  {name:<24} {label_text:<24} {histogram.sum:9.3f}s em {histogram.count} "
+                  f"(máx {histogram.max * 1000:.1f} ms)")
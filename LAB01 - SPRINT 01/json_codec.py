@@ -0,0 +1,72 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Decodificador usado para as respostas sem modelo tipado (orjson > msgspec > json da stdlib)
+if orjson is not None:
+    BACKEND = 'orjson'
+elif msgspec is not None:
+    BACKEND = 'msgspec'
+else:
+    BACKEND = 'json'
+
+_decoders = {}
+
+# Corpo que não é JSON válido (truncado, página HTML...): os erros de orjson, msgspec
+# e json da stdlib derivam todos de ValueError
+DecodeError = ValueError
+
+
+def to_builtins(obj):
+    """
+    Hook `default` da serialização: converte os modelos tipados (msgspec.Struct) em dict/list
+    """
+    if msgspec is not None and isinstance(obj, msgspec.Struct):
+        return msgspec.to_builtins(obj)
+    raise TypeError(f"Objeto do tipo {type(obj).__name__} não é serializável em JSON")
+
+
+def loads(content):
+    """
+    Decodifica bytes/str JSON com o backend mais rápido disponível
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    if msgspec is not None:
+        return msgspec.json.decode(content)
+    return json.loads(content)
+
+
+def dumps(obj):
+    """
+    Serializa em str JSON (UTF-8 sem escapes, como ensure_ascii=False), aceitando os modelos tipados
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=to_builtins).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, default=to_builtins)
+
+
+def decode_typed(content, response_type):
+    """
+    Decodifica direto para o modelo `response_type` (msgspec), sem passar pelos dicts
+    intermediários. Devolve None quando não há msgspec ou a resposta não bate com o modelo,
+    para o chamador cair no loads genérico.
+    """
+    if msgspec is None or response_type is None:
+        return None
+
+    decoder = _decoders.get(response_type)
+    if decoder is None:
+        decoder = _decoders[response_type] = msgspec.json.Decoder(response_type)
+    try:
+        return decoder.decode(content)
+    except msgspec.ValidationError:
+        return None
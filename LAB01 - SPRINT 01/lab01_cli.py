@@ -0,0 +1,383 @@
+import argparse
+import json
+import os
+import sys
+
+# Cada etapa importa só o que usa: `collect` não carrega numpy/pyarrow/pandas/matplotlib
+# e `plot` é a única que paga o import da pilha de gráficos
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+DEFAULT_CSV = 'github_repositories_data.csv'
+DEFAULT_REPORT = 'github_analysis_report.txt'
+RQ_CHOICES = [f"RQ0{number}" for number in range(1, 8)]
+
+
+def load_tokens():
+    """
+    Tokens da API: GITHUB_TOKENS="tok1,tok2" (pool), GITHUB_TOKEN ou o config.json
+    ("github_tokens": [...] ou "github_token")
+    """
+    tokens = [token.strip() for token in os.getenv('GITHUB_TOKENS', '').split(',') if token.strip()]
+    if tokens:
+        return tokens
+    if os.getenv('GITHUB_TOKEN'):
+        return [os.getenv('GITHUB_TOKEN')]
+
+    try:
+        with open(CONFIG_PATH) as f:
+            config = json.load(f)
+        return config.get('github_tokens') or [config['github_token']]
+    except FileNotFoundError:
+        print("Arquivo de configuração não encontrado. Defina a variável de ambiente GITHUB_TOKEN ou crie o arquivo config.json.")
+        return [None]
+
+
+def create_metrics(args):
+    from instrumentation import Metrics
+    return Metrics(jsonl_path=args.metrics_jsonl, profile_stages=args.profile, profiler=args.profiler)
+
+
+def create_cache(args):
+    """
+    Cache de respostas da execução (ou None), aberto uma vez e fechado pelo main
+    """
+    if not getattr(args, 'cache', None):
+        return None
+    from response_cache import ResponseCache
+    return ResponseCache(args.cache, ttl=args.cache_ttl * 3600,
+                         max_bytes=int(args.cache_max_mb * 1024 * 1024), offline=args.offline)
+
+
+def create_analyzer(args, metrics, tokens=None):
+    from lab01s01_github import GitHubRepositoryAnalyzer
+
+    options = {'url': args.api_url} if getattr(args, 'api_url', None) else {}
+    return GitHubRepositoryAnalyzer(tokens or [None], cache=getattr(args, 'response_cache', None),
+                                    metrics=metrics, **options)
+
+
+def check_csv(path):
+    if os.path.exists(path):
+        return True
+    print(f"Arquivo {path} não encontrado; rode a etapa collect antes.")
+    return False
+
+
+def load_summary(analyzer, args, metrics):
+    """
+    Relê o CSV da coleta em streaming e devolve o RQSummary (None se ele não existir ou estiver vazio)
+    """
+    from pipeline import read_csv_pages, run_pipeline
+
+    if not check_csv(args.csv):
+        return None
+
+    if args.columnar:
+        from columnar_store import RepositoryColumns
+        aggregator = RepositoryColumns()
+    else:
+        from rq_aggregator import RQAggregator
+        aggregator = RQAggregator(exact=not args.approximate_stats)
+
+    with metrics.span('load'):
+        run_pipeline(read_csv_pages(args.csv), [aggregator])
+    if not len(aggregator):
+        print(f"Nenhum repositório em {args.csv}.")
+        return None
+    with metrics.span('summary'):
+        return aggregator.summary()
+
+
+def collect(args, metrics):
+    from repository_enrichment import NameSink
+
+    analyzer = create_analyzer(args, metrics, load_tokens())
+    names = NameSink()
+    sinks = [names] if args.enrich else []
+    aggregator = None
+    if args.live:
+        from live_analysis import LiveAnalysisView
+        from rq_aggregator import RQAggregator
+        aggregator = RQAggregator()
+        sinks += [aggregator, LiveAnalysisView(analyzer, aggregator, args.repos, args.live_interval, DEFAULT_REPORT)]
+
+    count = analyzer.collect_repositories(args.repos, max_workers=args.workers, journal_path=args.journal,
+                                          resume=args.resume,
+                                          incremental_store=args.store if args.incremental else None,
+                                          csv_filename=args.csv, dataset_format=args.dataset_format,
+                                          include_text_fields=not args.no_text_fields,
+                                          snapshot_db=args.snapshots, sinks=sinks)
+    if not count:
+        print("Erro: Nenhum repositório foi coletado.")
+        return 1
+
+    analyzer.scheduler.report()
+    print(f"\nDados salvos em: {args.csv} ({count} repositórios)")
+    if aggregator is not None:
+        # Troca o relatório parcial da visão ao vivo pelo relatório da coleta completa
+        analyzer.save_summary_report(aggregator, DEFAULT_REPORT)
+
+    if args.enrich:
+        with metrics.span('enrichment'):
+            analyzer.enrich_repositories(names.names, args.enrich_releases, args.enrich_prs, args.workers)
+
+    metrics.report()
+    return 0
+
+
+def analyze(args, metrics):
+    analyzer = create_analyzer(args, metrics)
+    summary = load_summary(analyzer, args, metrics)
+    if summary is None:
+        return 1
+
+    analyzer.run_analyses(summary)
+    metrics.report()
+    return 0
+
+
+def report(args, metrics):
+    analyzer = create_analyzer(args, metrics)
+    summary = load_summary(analyzer, args, metrics)
+    if summary is None:
+        return 1
+
+    with metrics.span('report'):
+        analyzer.save_summary_report(summary, args.output)
+    return 0
+
+
+def plot(args, metrics):
+    import graphics_genarator
+
+    if args.dataset:
+        if graphics_genarator.dataset_partition(args.csv, True) is None:
+            print("Nenhuma partição Parquet/Feather encontrada (ou pyarrow não instalado); rode collect com --dataset-format.")
+            return 1
+    elif not check_csv(args.csv):
+        return 1
+
+    with metrics.span('plot'):
+        rendered = graphics_genarator.render_charts(args.rq, args.csv, args.workers, args.force, args.dataset)
+    if rendered:
+        print(f"✅ Gráficos gerados: {', '.join(rendered)} (boxplot, scatter e heatmap).")
+    return 0
+
+
+def compare(args, metrics):
+    """
+    RQ07 com testes de significância: Kruskal-Wallis, Mann-Whitney pareado, IC das medianas e Spearman
+    """
+    import language_comparison
+    from columnar_store import RepositoryColumns
+    from pipeline import read_csv_pages, run_pipeline
+
+    if not check_csv(args.csv):
+        return 1
+
+    columns = RepositoryColumns()
+    with metrics.span('load'):
+        run_pipeline(read_csv_pages(args.csv), [columns])
+    with metrics.span('comparison'):
+        result = language_comparison.compare_languages(columns, args.min_group, args.replicates,
+                                                       args.confidence, args.seed)
+    if not result.kruskal:
+        return 1
+
+    result.print_report()
+    result.save_csv(args.output)
+    print(f"\nComparações pareadas salvas em: {args.output}")
+    metrics.report()
+    return 0
+
+
+def sample(args, metrics):
+    """
+    Estimativas das RQs com intervalos de confiança a partir de uma amostra estratificada
+    """
+    import stratified_sampling
+
+    analyzer = create_analyzer(args, metrics, load_tokens())
+    estimates = stratified_sampling.run_sample(analyzer, args.sample_size, args.cluster_size, args.min_stars,
+                                               args.workers, args.replicates, args.confidence, args.seed,
+                                               args.csv)
+    if not estimates:
+        return 1
+
+    analyzer.scheduler.report()
+    metrics.report()
+    return 0
+
+
+def complete(args, metrics):
+    """
+    Coleta, análises, relatório e enriquecimento numa execução só (o antigo lab01s01_github.py)
+    """
+    analyzer = create_analyzer(args, metrics, load_tokens())
+    results = analyzer.run_complete_analysis(args.repos, max_workers=args.workers,
+                                             journal_path=args.journal, resume=args.resume,
+                                             incremental_store=args.store if args.incremental else None,
+                                             csv_filename=args.csv,
+                                             exact_stats=not args.approximate_stats,
+                                             columnar=args.columnar, dataset_format=args.dataset_format,
+                                             include_text_fields=not args.no_text_fields,
+                                             enrich=args.enrich, enrich_releases=args.enrich_releases,
+                                             enrich_prs=args.enrich_prs, snapshot_db=args.snapshots,
+                                             live=args.live, live_interval=args.live_interval)
+    if results:
+        print("\n Sucesso")
+        return 0
+    print("Erro")
+    return 1
+
+
+def add_api_arguments(parser):
+    parser.add_argument('--api-url', help="endpoint GraphQL (padrão: api.github.com; ex.: o servidor simulado)")
+
+
+def add_collection_arguments(parser):
+    add_api_arguments(parser)
+    parser.add_argument('--repos', type=int, default=1000, help="número de repositórios a coletar")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="shards paginados em paralelo (1: uma única busca; acima de 1000 repositórios "
+                             "a coleta é sempre dividida em shards)")
+    parser.add_argument('--journal', metavar='PATH',
+                        help="grava cada página num journal para poder retomar a coleta "
+                             "(ex.: github_pages_journal.jsonl; cada página custa um fsync)")
+    parser.add_argument('--resume', action='store_true', help="retoma a coleta a partir do journal (requer --journal)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="só busca as métricas dos repositórios que mudaram desde a última coleta")
+    parser.add_argument('--store', default='github_repositories_raw.json', help="store do modo incremental")
+    parser.add_argument('--cache', help="cache SQLite das respostas da API (ex.: github_response_cache.sqlite)")
+    parser.add_argument('--cache-ttl', type=float, default=24, help="validade do cache em horas")
+    parser.add_argument('--cache-max-mb', type=float, default=500, help="tamanho máximo do cache (LRU)")
+    parser.add_argument('--offline', action='store_true',
+                        help="usa só respostas do cache, sem nenhuma requisição à API (requer --cache)")
+    parser.add_argument('--no-text-fields', action='store_true',
+                        help="não busca url/description (colunas ficam vazias no CSV)")
+    parser.add_argument('--dataset-format', choices=['parquet', 'feather'],
+                        help="também grava o dataset tipado e particionado por data (requer pyarrow)")
+    parser.add_argument('--snapshots', metavar='DB',
+                        help="acrescenta a coleta ao histórico SQLite (ex.: github_snapshots.sqlite)")
+    parser.add_argument('--live', action='store_true',
+                        help="atualiza as RQs, as linguagens e os gráficos ASCII durante a coleta e reescreve "
+                             f"o relatório parcial ({DEFAULT_REPORT})")
+    parser.add_argument('--live-interval', type=float, default=10, help="segundos entre as atualizações do --live")
+    parser.add_argument('--enrich', action='store_true',
+                        help="busca o histórico recente de releases/PRs e calcula cadência e latência de merge")
+    parser.add_argument('--enrich-releases', type=int, default=20, help="releases mais recentes por repositório")
+    parser.add_argument('--enrich-prs', type=int, default=50, help="PRs mergeados mais recentes por repositório")
+
+
+def add_analysis_arguments(parser):
+    parser.add_argument('--approximate-stats', action='store_true',
+                        help="medianas pelo estimador P² (memória constante, para coletas muito grandes)")
+    parser.add_argument('--columnar', action='store_true',
+                        help="análises vetorizadas sobre colunas NumPy (requer numpy)")
+
+
+def add_metrics_arguments(parser):
+    parser.add_argument('--metrics-jsonl', metavar='PATH', help="grava spans e métricas em JSON lines")
+    parser.add_argument('--metrics-prom', metavar='PATH',
+                        help="exporta as métricas no formato textfile do Prometheus")
+    parser.add_argument('--profile', nargs='+', default=[], metavar='ETAPA',
+                        help="perfila as etapas (collection, process_data, load, summary, analysis, charts, "
+                             "report, enrichment, plot ou all) e salva em profiles/")
+    parser.add_argument('--profiler', choices=['cprofile', 'pyinstrument'], default='cprofile')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Coleta e análise dos repositórios populares do GitHub")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_stage(name, handler, help_text):
+        stage = subparsers.add_parser(name, help=help_text, description=help_text)
+        stage.set_defaults(handler=handler)
+        stage.add_argument('--csv', default=DEFAULT_CSV, help="CSV dos repositórios processados")
+        add_metrics_arguments(stage)
+        return stage
+
+    stage = add_stage('collect', collect, "coleta os repositórios e grava o CSV (sem análises nem gráficos)")
+    add_collection_arguments(stage)
+
+    stage = add_stage('analyze', analyze, "imprime as análises RQ01-RQ07 a partir do CSV")
+    add_analysis_arguments(stage)
+
+    stage = add_stage('report', report, "grava o relatório resumido a partir do CSV")
+    add_analysis_arguments(stage)
+    stage.add_argument('--output', default=DEFAULT_REPORT, help="arquivo do relatório")
+
+    stage = add_stage('plot', plot, "gera os gráficos das RQs (pandas/matplotlib/seaborn)")
+    stage.add_argument('--rq', nargs='+', choices=RQ_CHOICES, help="gráficos a gerar (padrão: todos)")
+    stage.add_argument('--workers', type=int,
+                       help="processos em paralelo (padrão: um por gráfico, até o número de CPUs)")
+    stage.add_argument('--force', action='store_true', help="renderiza mesmo que os dados não tenham mudado")
+    stage.add_argument('--dataset', action='store_true',
+                       help="lê a partição Parquet/Feather mais recente ao lado do --csv em vez do CSV")
+
+    stage = add_stage('compare', compare, "RQ07: testes de Kruskal-Wallis/Mann-Whitney entre linguagens, "
+                                          "IC das medianas e correlações com as estrelas (requer numpy)")
+    stage.add_argument('--min-group', type=int, default=30, help="repositórios mínimos para a linguagem entrar")
+    stage.add_argument('--replicates', type=int, default=2000, help="réplicas do bootstrap das medianas")
+    stage.add_argument('--confidence', type=float, default=0.95, help="nível dos intervalos de confiança")
+    stage.add_argument('--seed', type=int, help="semente do bootstrap")
+    stage.add_argument('--output', default='rq07_comparacoes.csv', help="CSV com todas as comparações pareadas")
+
+    stage = add_stage('sample', sample, "estima as RQs com uma amostra estratificada (estrelas x data de criação)")
+    stage.set_defaults(csv='github_repositories_sample.csv')
+    add_api_arguments(stage)
+    stage.add_argument('--sample-size', type=int, default=1000, help="repositórios aproximados na amostra")
+    stage.add_argument('--cluster-size', type=int, default=10,
+                       help="repositórios por página sorteada (cada cluster custa uma requisição)")
+    stage.add_argument('--min-stars', type=int, default=1001, help="população: repositórios com ao menos N estrelas")
+    stage.add_argument('--replicates', type=int, default=500, help="réplicas do bootstrap")
+    stage.add_argument('--confidence', type=float, default=0.95, help="nível dos intervalos de confiança")
+    stage.add_argument('--seed', type=int, help="semente do sorteio (amostra reprodutível)")
+    stage.add_argument('--workers', type=int, default=4, help="requisições em paralelo")
+    stage.add_argument('--cache', help="cache SQLite das respostas da API")
+    stage.add_argument('--cache-ttl', type=float, default=24, help="validade do cache em horas")
+    stage.add_argument('--cache-max-mb', type=float, default=500, help="tamanho máximo do cache (LRU)")
+    stage.add_argument('--offline', action='store_true', help="usa só respostas do cache (requer --cache)")
+
+    # Repassado inteiro para crawl_queue.main (plan/work/status/export); ver main()
+    subparsers.add_parser('crawl', add_help=False,
+                          help="coleta distribuída com fila de leases em SQLite (crawl_queue.py)")
+
+    stage = add_stage('all', complete, "coleta, análises, relatório e enriquecimento numa execução só")
+    add_collection_arguments(stage)
+    add_analysis_arguments(stage)
+
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ['crawl']:
+        import crawl_queue
+        return crawl_queue.main(argv[1:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'offline', False) and not args.cache:
+        parser.error("--offline precisa de --cache")
+    if getattr(args, 'resume', False) and not args.journal:
+        parser.error("--resume precisa de --journal")
+
+    metrics = create_metrics(args)
+    args.response_cache = create_cache(args)
+    try:
+        return args.handler(args, metrics)
+    except Exception as e:
+        print(f"❌ Erro durante a execução: {e}")
+        return 1
+    finally:
+        if args.metrics_prom:
+            metrics.write_prometheus(args.metrics_prom)
+        metrics.close()
+        # Grava os last_access ainda em memória (senão o LRU vira ordem de inserção)
+        if args.response_cache:
+            args.response_cache.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
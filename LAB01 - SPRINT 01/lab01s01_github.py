@@ -1,154 +1,438 @@
-import os
-import requests
-import json
 from datetime import datetime, timezone
-from collections import Counter, defaultdict
 import csv
+import os
 import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from queue import Full, Queue
+
+from graphql_client import GITHUB_GRAPHQL_URL, GraphQLClient
+from instrumentation import Metrics
+from live_analysis import DEFAULT_INTERVAL, LiveAnalysisView
+from incremental_refresh import RepositoryStore, find_changed_repositories, merge_refreshed, repository_key
+from page_journal import PageJournal
+from pipeline import CsvSink, run_pipeline
+from repository_enrichment import ENRICHMENT_FIELDNAMES, NameSink, RepositoryEnricher, summarize_enrichment
+import vectorized_processing
+from rq_aggregator import RQAggregator, RQSummary
+from snapshot_store import SnapshotStore, collection_timestamp
+from repository_models import RECORD_FIELDS, SEARCH_RESPONSE
+from query_builder import (CHANGE_DETECTION_FIELDS, COUNT_DOCUMENT, REPOSITORY_FIELDS, build_repository_batch_document,
+                           build_repository_fields, build_search_document, repository_batch_variables)
+from request_scheduler import RequestScheduler
+
+DEFAULT_MIN_STARS = 1001
+DEFAULT_SEARCH_QUERY = "stars:>1000 sort:stars-desc"
+SEARCH_RESULT_LIMIT = 1000  # A API de busca nunca retorna mais que 1000 resultados por query
+
+# Tamanho da página da busca (variável $first)
+PAGE_SIZE = 20
 
 class GitHubRepositoryAnalyzer:
-    def __init__(self, token):
-        self.token = token
-        self.headers = {
-            'Authorization': f'Bearer {token}',  
-            'Content-Type': 'application/json'   
-        }
-        self.url = 'https://api.github.com/graphql' 
-        
-    def create_graphql_query(self, after_cursor=None):
-        """
-        Cria a query GraphQL para buscar repositórios populares com todas as métricas necessárias
-        """
-        after_clause = f', after: "{after_cursor}"' if after_cursor else ""
-        
-        query = f"""
-        query {{
-          search(query: "stars:>1000 sort:stars-desc", type: REPOSITORY, first: 20{after_clause}) {{
-            pageInfo {{
-              endCursor
-              hasNextPage
-            }}
-            nodes {{
-              ... on Repository {{
-                name
-                owner {{
-                  login
-                }}
-                stargazerCount
-                createdAt
-                updatedAt
-                primaryLanguage {{
-                  name
-                }}
-                pullRequests(states: MERGED) {{
-                  totalCount
-                }}
-                releases {{
-                  totalCount
-                }}
-                issues {{
-                  totalCount
-                }}
-                closedIssues: issues(states: CLOSED) {{
-                  totalCount
-                }}
-                url
-                description
-              }}
-            }}
-          }}
-        }}
-        """
-        return query
-    
-    def fetch_repositories(self, total_repos=100):
-        repositories = []
-        after_cursor = None
+    def __init__(self, token, transport=None, url=GITHUB_GRAPHQL_URL, cache=None, metrics=None):
+        # `token` pode ser uma lista: as requisições e os shards são distribuídos entre os tokens
+        self.tokens = list(token) if isinstance(token, (list, tuple)) else [token]
+        self.token = self.tokens[0]
+        # Um único cliente (pool de conexões keep-alive) compartilhado por todas as páginas e shards
+        self.client = GraphQLClient(self.token, url=url, transport=transport)
+        self.headers = self.client.headers
+        self.url = url
+        # Spans/contadores de cada etapa e de cada requisição HTTP
+        self.metrics = metrics or Metrics()
+        self.scheduler = RequestScheduler(self.client, cache=cache, metrics=self.metrics, tokens=self.tokens)
+        self.journal = None
+        self.resume_plan = None
+        self.resume_state = {}
+    
+    def enable_journal(self, path='github_pages_journal.jsonl', resume=False):
+        """
+        Grava cada página coletada no journal; com `resume`, recarrega as páginas
+        já gravadas e continua cada shard do último endCursor
+        """
+        self.journal = PageJournal(path)
         
-        print("Coletando dados dos repositórios...")
+        if resume:
+            self.resume_plan, self.resume_state = self.journal.load()
+            pages = sum(len(state.nodes) for state in self.resume_state.values())
+            print(f"Journal {path}: {pages} repositórios recuperados de {len(self.resume_state)} shards")
+        
+        self.journal.open(resume)
+        
+    def create_graphql_query(self, fields=REPOSITORY_FIELDS):
+        """
+        Documento GraphQL (estático e preparado uma única vez) para buscar repositórios
+        populares com os campos pedidos; filtro, página e cursor vão nas variáveis
+        """
+        return build_search_document(fields)
+    
+    def create_search_variables(self, after_cursor=None, search_query=DEFAULT_SEARCH_QUERY, first=PAGE_SIZE):
+        return {'q': search_query, 'first': first, 'after': after_cursor}
+    
+    def _post_query(self, query, variables=None, response_type=None):
+        """
+        Envia uma query para a API (via scheduler) e devolve o campo 'data' da resposta (ou None em caso de erro)
+        """
+        return self.scheduler.execute(query, variables, response_type)
+    
+    def iter_search_pages(self, search_query=DEFAULT_SEARCH_QUERY, limit=100, label=None, fields=REPOSITORY_FIELDS):
+        """
+        Percorre o cursor de uma única busca, gerando cada página (lista de nós)
+        assim que ela chega, até somar `limit` repositórios
+        """
+        collected = 0
+        after_cursor = None
+        prefix = f"[{label}] " if label else ""
+        
+        # Retoma o shard a partir das páginas que já estão no journal
+        state = self.resume_state.get(search_query)
+        if state:
+            after_cursor = state.end_cursor
+            collected = min(len(state.nodes), limit)
+            print(f"{prefix}Retomando com {collected} repositórios do journal...")
+            yield state.nodes[:limit]
+            if state.done:
+                return
+        
+        if collected >= limit:
+            return
         
-        while len(repositories) < total_repos:
-            query = self.create_graphql_query(after_cursor)
+        for page_cursor, page_info, nodes in self.iter_search_results(search_query, after_cursor, fields):
+            if self.journal:
+                self.journal.append_page(search_query, page_cursor, page_info, nodes)
             
-            try:
-                response = requests.post(
-                    self.url,
-                    json={'query': query},
-                    headers=self.headers,
-                    timeout=30
-                )
-                
-                if response.status_code != 200:
-                    print(f"Erro na requisição: {response.status_code}")
-                    print(response.text)
-                    break
-                    
-                data = response.json()
-                
-                if 'errors' in data:
-                    print(f"Erro na query: {data['errors']}")
-                    break
-                    
-                search_results = data['data']['search']
-                repositories.extend(search_results['nodes'])
+            nodes = nodes[:limit - collected]
+            collected += len(nodes)
+            print(f"{prefix}Coletados {collected} repositórios...")
+            yield nodes
+            
+            if collected >= limit:
+                break
+    
+    def iter_search_results(self, search_query=DEFAULT_SEARCH_QUERY, after_cursor=None, fields=REPOSITORY_FIELDS):
+        """
+        Percorre o cursor de uma busca a partir de `after_cursor`, gerando (cursor usado, pageInfo, nós)
+        de cada página. Para na última página ou na primeira requisição que falhar.
+        """
+        while True:
+            # Com msgspec, as páginas chegam como modelos tipados (slots) em vez de dicts
+            data = self._post_query(self.create_graphql_query(fields),
+                                    self.create_search_variables(after_cursor, search_query), SEARCH_RESPONSE)
+            
+            if data is None:
+                return
                 
-                print(f"Coletados {len(repositories)} repositórios...")
+            search_results = data['search']
+            nodes = search_results['nodes']
+            self.scheduler.record_repositories(len(nodes))
+            yield after_cursor, search_results['pageInfo'], nodes
+            
+            if not search_results['pageInfo']['hasNextPage']:
+                return
                 
-                if not search_results['pageInfo']['hasNextPage']:
-                    break
-                    
-                after_cursor = search_results['pageInfo']['endCursor']
+            after_cursor = search_results['pageInfo']['endCursor']
+    
+    def fetch_search(self, search_query=DEFAULT_SEARCH_QUERY, limit=100, label=None, fields=REPOSITORY_FIELDS):
+        """
+        Percorre o cursor de uma única busca até juntar `limit` repositórios
+        """
+        repositories = []
+        for page in self.iter_search_pages(search_query, limit, label, fields):
+            repositories.extend(page)
+        return repositories
+    
+    def count_repositories(self, search_query):
+        """
+        Retorna (total de resultados, estrelas do repositório mais popular) para uma busca
+        """
+        data = self._post_query(COUNT_DOCUMENT, {'q': search_query})
+        
+        if data is None:
+            return 0, 0
+        
+        search_results = data['search']
+        top_stars = search_results['nodes'][0]['stargazerCount'] if search_results['nodes'] else 0
+        return search_results['repositoryCount'], top_stars
+    
+    def build_star_shards(self, min_stars=DEFAULT_MIN_STARS, max_stars=None, max_workers=4,
+                          max_shard_size=SEARCH_RESULT_LIMIT):
+        """
+        Divide a faixa de estrelas em shards disjuntos (stars:lo..hi) com no máximo
+        `max_shard_size` resultados cada, bisseccionando os shards que passam do limite.
+        Retorna uma lista de (lo, hi, total) ordenada do shard mais popular para o menos popular.
+        """
+        if max_stars is None:
+            _, max_stars = self.count_repositories(f"stars:>={min_stars} sort:stars-desc")
+        
+        if max_stars < min_stars:
+            return []
+        
+        # Faixas iniciais geométricas (1001..2001, 2002..4003, ...), que acompanham
+        # a distribuição de cauda longa das estrelas
+        pending = []
+        lo = min_stars
+        while lo <= max_stars:
+            hi = min(lo * 2 - 1, max_stars)
+            pending.append((lo, hi))
+            lo = hi + 1
+        
+        shards = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending:
+                queries = [f"stars:{lo}..{hi}" for lo, hi in pending]
+                counts = list(executor.map(self.count_repositories, queries))
                 
-            except requests.exceptions.RequestException as e:
-                print(f"Erro de conexão: {e}")
+                next_pending = []
+                for (lo, hi), (count, _) in zip(pending, counts):
+                    if count > max_shard_size and hi > lo:
+                        mid = (lo + hi) // 2
+                        next_pending.append((lo, mid))
+                        next_pending.append((mid + 1, hi))
+                    else:
+                        if count > SEARCH_RESULT_LIMIT:
+                            print(f"Aviso: shard stars:{lo}..{hi} tem {count} repositórios, "
+                                  f"apenas {SEARCH_RESULT_LIMIT} serão coletados")
+                        if count > 0:
+                            shards.append((lo, hi, count))
+                pending = next_pending
+        
+        shards.sort(key=lambda shard: shard[0], reverse=True)
+        return shards
+    
+    def plan_shards(self, total_repos=1000, max_workers=4, min_stars=DEFAULT_MIN_STARS, fields=REPOSITORY_FIELDS,
+                    max_shard_size=SEARCH_RESULT_LIMIT):
+        """
+        Escolhe os shards de estrelas necessários para cobrir os `total_repos` mais populares.
+        Retorna os argumentos de iter_search_pages para cada shard, do mais popular ao menos popular.
+        """
+        if self.resume_plan is not None:
+            shards = [tuple(shard) for shard in self.resume_plan]
+            print(f"Retomando coleta com {len(shards)} shards do journal...")
+        else:
+            print(f"Montando shards de estrelas (a partir de {min_stars})...")
+            shards = self.build_star_shards(min_stars, max_workers=max_workers, max_shard_size=max_shard_size)
+            if self.journal:
+                self.journal.append_plan(shards)
+        
+        # Seleciona os shards do topo até cobrir o total pedido; o último shard
+        # só precisa das primeiras páginas (a busca já vem ordenada por estrelas)
+        selected = []
+        remaining = total_repos
+        for lo, hi, count in shards:
+            if remaining <= 0:
                 break
+            limit = min(count, SEARCH_RESULT_LIMIT, remaining)
+            selected.append((f"stars:{lo}..{hi} sort:stars-desc", limit, f"stars:{lo}..{hi}", fields))
+            remaining -= limit
+        
+        return selected
+    
+    def fetch_repositories_sharded(self, total_repos=1000, max_workers=4, min_stars=DEFAULT_MIN_STARS,
+                                   fields=REPOSITORY_FIELDS):
+        """
+        Coleta os `total_repos` repositórios mais populares paginando vários shards
+        de estrelas em paralelo (cada shard tem seu próprio cursor)
+        """
+        selected = self.plan_shards(total_repos, max_workers, min_stars, fields)
+        
+        print(f"Coletando dados dos repositórios em {len(selected)} shards com {max_workers} workers...")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda shard: self.fetch_search(*shard), selected))
         
+        # Junta na ordem dos shards; um repositório que mudou de faixa durante a
+        # coleta pode aparecer em dois shards, então remove duplicados
+        repositories = []
+        seen = set()
+        for shard_repos in results:
+            for repo in shard_repos:
+                key = (repo['owner']['login'], repo['name'])
+                if key not in seen:
+                    seen.add(key)
+                    repositories.append(repo)
+        
+        print(f"Coletados {len(repositories)} repositórios no total.")
         return repositories[:total_repos]
     
-    def process_data(self, repositories):
-        processed_data = []
-        current_date = datetime.now(timezone.utc)
+    def iter_repository_pages(self, total_repos=100, max_workers=1, fields=REPOSITORY_FIELDS):
+        """
+        Versão em streaming da coleta: gera as páginas de nós na ordem dos shards (estrelas
+        decrescentes, como a coleta sequencial). As páginas de um shard que termina antes
+        da vez dele esperam num buffer, que fica limitado aos shards em andamento; a fila
+        limitada segura os workers quando o consumidor atrasa, então a memória não cresce
+        com o número de repositórios.
+        """
+        if max_workers <= 1 and total_repos <= SEARCH_RESULT_LIMIT:
+            print("Coletando dados dos repositórios...")
+            yield from self.iter_search_pages(DEFAULT_SEARCH_QUERY, total_repos, fields=fields)
+            return
         
-        for repo in repositories:
-            # RQ01: Idade do repositório
-            created_date = datetime.fromisoformat(repo['createdAt'].replace('Z', '+00:00'))
-            age_days = (current_date - created_date).days
-            
-            # RQ02: Pull requests aceitas
-            merged_prs = repo['pullRequests']['totalCount']
-            
-            # RQ03: Total de releases
-            total_releases = repo['releases']['totalCount']
-            
-            # RQ04: Tempo até última atualização
-            updated_date = datetime.fromisoformat(repo['updatedAt'].replace('Z', '+00:00'))
-            days_since_update = (current_date - updated_date).days
-            
-            # RQ05: Linguagem primária
-            primary_language = repo['primaryLanguage']['name'] if repo['primaryLanguage'] else 'Unknown'
-            
-            # RQ06: Percentual de issues fechadas
-            total_issues = repo['issues']['totalCount']
-            closed_issues = repo['closedIssues']['totalCount']
-            closed_issues_ratio = (closed_issues / total_issues * 100) if total_issues > 0 else 0
+        selected = self.plan_shards(total_repos, max_workers, fields=fields)
+        print(f"Coletando dados dos repositórios em {len(selected)} shards com {max_workers} workers...")
+        
+        pages = Queue(maxsize=max_workers * 2)
+        stop = threading.Event()
+        shard_done = object()
+        
+        def put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return
+                except Full:
+                    continue
+        
+        def worker(index, shard):
+            try:
+                for page in self.iter_search_pages(*shard):
+                    if stop.is_set():
+                        break
+                    put((index, page))
+            finally:
+                put((index, shard_done))
+        
+        seen = set()
+        buffered = [[] for _ in selected]
+        finished = [False] * len(selected)
+        current = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(worker, index, shard) for index, shard in enumerate(selected)]
+            try:
+                while current < len(selected):
+                    index, page = pages.get()
+                    if page is shard_done:
+                        finished[index] = True
+                    else:
+                        buffered[index].append(page)
+                    
+                    # Entrega o que já dá para entregar na ordem dos shards
+                    while current < len(selected):
+                        for buffered_page in buffered[current]:
+                            # Remove duplicados entre shards (repositório que mudou de faixa durante a coleta)
+                            unique = []
+                            for repo in buffered_page:
+                                key = (repo['owner']['login'], repo['name'])
+                                if key not in seen:
+                                    seen.add(key)
+                                    unique.append(repo)
+                            if unique:
+                                yield unique
+                        buffered[current] = []
+                        if not finished[current]:
+                            break
+                        current += 1
+            finally:
+                stop.set()
             
-            processed_data.append({
-                'name': repo['name'],
-                'owner': repo['owner']['login'],
-                'stars': repo['stargazerCount'],
-                'age_days': age_days,
-                'merged_prs': merged_prs,
-                'total_releases': total_releases,
-                'days_since_update': days_since_update,
-                'primary_language': primary_language,
-                'total_issues': total_issues,
-                'closed_issues': closed_issues,
-                'closed_issues_ratio': closed_issues_ratio,
-                'url': repo['url'],
-                'description': repo['description']
-            })
-        
-        return processed_data
+            for future in futures:
+                future.result()
+    
+    def fetch_repositories(self, total_repos=100, max_workers=1, fields=REPOSITORY_FIELDS):
+        if max_workers > 1 or total_repos > SEARCH_RESULT_LIMIT:
+            return self.fetch_repositories_sharded(total_repos, max(max_workers, 1), fields=fields)
+        
+        print("Coletando dados dos repositórios...")
+        return self.fetch_search(DEFAULT_SEARCH_QUERY, total_repos, fields=fields)
+    
+    def fetch_repositories_by_name(self, names, batch_size=25, max_workers=1):
+        """
+        Busca os campos completos de repositórios específicos ("owner/name"),
+        `batch_size` repositórios por requisição
+        """
+        batches = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+        
+        def fetch_batch(batch):
+            data = self._post_query(build_repository_batch_document(len(batch)),
+                                    repository_batch_variables(batch))
+            if data is None:
+                return []
+            # Repositórios apagados/renomeados voltam como null (com um erro NOT_FOUND cada)
+            return [data[f"r{i}"] for i in range(len(batch)) if data.get(f"r{i}")]
+        
+        repositories = []
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            for batch_repos in executor.map(fetch_batch, batches):
+                repositories.extend(batch_repos)
+                self.scheduler.record_repositories(len(batch_repos))
+                print(f"Atualizados {len(repositories)} de {len(names)} repositórios...")
+        
+        return repositories
+    
+    def refresh_repositories(self, total_repos=100, max_workers=1, store_path='github_repositories_raw.json',
+                             batch_size=25):
+        """
+        Modo incremental: roda a query leve (updatedAt/pushedAt/estrelas), busca as métricas
+        caras só dos repositórios que mudaram e atualiza o store local
+        """
+        store = RepositoryStore(store_path)
+        stored = store.load()
+        print(f"Store {store_path}: {len(stored)} repositórios da última coleta")
+        
+        light_repos = self.fetch_repositories(total_repos, max_workers, fields=CHANGE_DETECTION_FIELDS)
+        if not light_repos:
+            return []
+        
+        changed = find_changed_repositories(light_repos, stored)
+        print(f"{len(changed)} de {len(light_repos)} repositórios mudaram desde a última coleta")
+        
+        fresh = self.fetch_repositories_by_name(changed, batch_size, max_workers) if changed else []
+        repositories = merge_refreshed(light_repos, fresh, stored)
+        
+        store.repositories = {repository_key(repo): repo for repo in repositories}
+        store.save()
+        
+        return repositories
+    
+    def enrich_repositories(self, names, releases=20, pull_requests=50, max_workers=1,
+                            filename='github_repositories_enrichment.csv'):
+        """
+        Métricas de histórico (cadência de releases e latência de merge dos PRs) de cada
+        repositório, buscadas em lotes de tamanho adaptativo e salvas em `filename`
+        """
+        print(f"\nEnriquecendo {len(names)} repositórios (últimas {releases} releases, {pull_requests} PRs mergeados)...")
+        enricher = RepositoryEnricher(self.scheduler, releases, pull_requests)
+        records = enricher.enrich(names, max_workers)
+        
+        sink = CsvSink(filename, fieldnames=ENRICHMENT_FIELDNAMES)
+        run_pipeline(iter([records]), [sink])
+        
+        summary = summarize_enrichment(records)
+        print(f"Enriquecimento: {len(records)} repositórios em {enricher.requests} requisições")
+        print(f"Mediana do intervalo entre releases: {summary['release_interval_median_days']} dias")
+        print(f"Mediana de releases por ano: {summary['releases_per_year']}")
+        print(f"Mediana da latência de merge: {summary['merge_latency_median_hours']} horas "
+              f"(p90 mediano: {summary['merge_latency_p90_hours']} horas)")
+        print(f"Dados salvos em: {filename}")
+        
+        return records
+    
+    def process_data(self, repositories, current_date=None):
+        # Com numpy, lotes grandes são processados por colunas (mesmo resultado do laço linha a linha)
+        return vectorized_processing.process_page(repositories, current_date or datetime.now(timezone.utc))
+    
+    def iter_processed(self, pages, current_date=None):
+        """
+        Processa página a página; todas as páginas usam a mesma data de referência
+        """
+        current_date = current_date or datetime.now(timezone.utc)
+        for page in pages:
+            with self.metrics.span('process_data'):
+                records = self.process_data(page, current_date)
+            yield records
+    
+    def summarize(self, data):
+        """
+        Devolve o RQSummary de `data`, que pode ser a lista de registros, o RQAggregator
+        do pipeline, o RepositoryColumns ou um RQSummary já calculado (reaproveitado sem recalcular nada)
+        """
+        if isinstance(data, RQSummary):
+            return data
+        if hasattr(data, 'summary'):
+            # RQAggregator ou RepositoryColumns
+            return data.summary()
+        
+        aggregator = RQAggregator()
+        aggregator.write_page(data)
+        return aggregator.summary()
     
     def calculate_stats(self, values):
         """
@@ -171,11 +455,9 @@ class GitHubRepositoryAnalyzer:
         print("RQ01: Sistemas populares são maduros/antigos?")
         print("="*50)
         
-        # Lista com as idades em dias
-        age_values = [repo['age_days'] for repo in data]
-        # Convertendo pra anos (365.25 por causa dos anos bissextos)
-        age_years = [days / 365.25 for days in age_values]
-        stats = self.calculate_stats(age_years)
+        summary = self.summarize(data)
+        # Idades em anos (365.25 por causa dos anos bissextos)
+        stats = summary.age_stats
         
         print(f"Idade média dos repositórios: {stats['mean']:.2f} anos")
         print(f"Mediana da idade: {stats['median']:.2f} anos")
@@ -184,8 +466,8 @@ class GitHubRepositoryAnalyzer:
         print(f"Idade máxima: {stats['max']:.2f} anos")
         
         # Categorização
-        mature_repos = sum(1 for repo in data if repo['age_days'] > 365.25 * 5)
-        print(f"\nRepositórios com mais de 5 anos: {mature_repos} ({mature_repos/len(data)*100:.1f}%)")
+        mature_repos = summary.mature_repos
+        print(f"\nRepositórios com mais de 5 anos: {mature_repos} ({mature_repos/summary.total*100:.1f}%)")
         
         return stats
     
@@ -194,9 +476,8 @@ class GitHubRepositoryAnalyzer:
         print("RQ02: Sistemas populares recebem muita contribuição externa?")
         print("="*50)
         
-        # pega todos os PRs merged
-        pr_values = [repo['merged_prs'] for repo in data]
-        stats = self.calculate_stats(pr_values)  # calcula as estatísticas básicas
+        summary = self.summarize(data)
+        stats = summary.pr_stats
         
         print(f"Média de PRs aceitos: {stats['mean']:.2f}")
         print(f"Mediana de PRs aceitos: {stats['median']:.2f}")
@@ -204,8 +485,8 @@ class GitHubRepositoryAnalyzer:
         print(f"Máximo de PRs: {int(stats['max'])}")
         print(f"Mínimo de PRs: {int(stats['min'])}")
         
-        high_contribution = sum(1 for repo in data if repo['merged_prs'] > stats['median'])
-        print(f"\nRepositórios acima da mediana: {high_contribution} ({high_contribution/len(data)*100:.1f}%)")
+        high_contribution = summary.prs_above_median
+        print(f"\nRepositórios acima da mediana: {high_contribution} ({high_contribution/summary.total*100:.1f}%)")
         
         return stats
     
@@ -217,8 +498,8 @@ class GitHubRepositoryAnalyzer:
         print("RQ03: Sistemas populares lançam releases com frequência?")
         print("="*50)
         
-        release_values = [repo['total_releases'] for repo in data]
-        stats = self.calculate_stats(release_values)
+        summary = self.summarize(data)
+        stats = summary.release_stats
         
         print(f"Média de releases: {stats['mean']:.2f}")
         print(f"Mediana de releases: {stats['median']:.2f}")
@@ -226,8 +507,8 @@ class GitHubRepositoryAnalyzer:
         print(f"Máximo de releases: {int(stats['max'])}")
         print(f"Mínimo de releases: {int(stats['min'])}")
         
-        active_releasing = sum(1 for repo in data if repo['total_releases'] > 0)
-        print(f"\nRepositórios com pelo menos 1 release: {active_releasing} ({active_releasing/len(data)*100:.1f}%)")
+        active_releasing = summary.repos_with_releases
+        print(f"\nRepositórios com pelo menos 1 release: {active_releasing} ({active_releasing/summary.total*100:.1f}%)")
         
         return stats
     
@@ -239,8 +520,8 @@ class GitHubRepositoryAnalyzer:
         print("RQ04: Sistemas populares são atualizados com frequência?")
         print("="*50)
         
-        update_values = [repo['days_since_update'] for repo in data]
-        stats = self.calculate_stats(update_values)
+        summary = self.summarize(data)
+        stats = summary.update_stats
         
         print(f"Média de dias desde última atualização: {stats['mean']:.2f}")
         print(f"Mediana: {stats['median']:.2f} dias")
@@ -248,8 +529,8 @@ class GitHubRepositoryAnalyzer:
         print(f"Máximo: {int(stats['max'])} dias")
         print(f"Mínimo: {int(stats['min'])} dias")
         
-        recently_updated = sum(1 for repo in data if repo['days_since_update'] <= 30)
-        print(f"\nRepositórios atualizados nos últimos 30 dias: {recently_updated} ({recently_updated/len(data)*100:.1f}%)")
+        recently_updated = summary.recently_updated
+        print(f"\nRepositórios atualizados nos últimos 30 dias: {recently_updated} ({recently_updated/summary.total*100:.1f}%)")
         
         return stats
     
@@ -261,12 +542,12 @@ class GitHubRepositoryAnalyzer:
         print("RQ05: Sistemas populares são escritos nas linguagens mais populares?")
         print("="*50)
         
-        languages = [repo['primary_language'] for repo in data]
-        language_counts = Counter(languages)
+        summary = self.summarize(data)
+        language_counts = summary.language_counts
         
         print("Top 10 linguagens mais usadas:")
         for i, (lang, count) in enumerate(language_counts.most_common(10), 1):
-            percentage = (count / len(data)) * 100
+            percentage = (count / summary.total) * 100
             print(f"{i:2d}. {lang}: {count} repositórios ({percentage:.1f}%)")
         
         return language_counts
@@ -279,25 +560,24 @@ class GitHubRepositoryAnalyzer:
         print("RQ06: Sistemas populares possuem um alto percentual de issues fechadas?")
         print("="*50)
         
-        # Remove repositórios sem issues para análise
-        repos_with_issues = [repo for repo in data if repo['total_issues'] > 0]
+        # Só entram repositórios com issues
+        summary = self.summarize(data)
         
-        if not repos_with_issues:
+        if not summary.repos_with_issues:
             print("Nenhum repositório com issues encontrado.")
             return {}
         
-        ratios = [repo['closed_issues_ratio'] for repo in repos_with_issues]
-        stats = self.calculate_stats(ratios)
+        stats = summary.issue_ratio_stats
         
-        print(f"Repositórios com issues: {len(repos_with_issues)} de {len(data)}")
+        print(f"Repositórios com issues: {summary.repos_with_issues} de {summary.total}")
         print(f"Percentual médio de issues fechadas: {stats['mean']:.2f}%")
         print(f"Mediana: {stats['median']:.2f}%")
         print(f"Desvio padrão: {stats['std']:.2f}%")
         print(f"Máximo: {stats['max']:.2f}%")
         print(f"Mínimo: {stats['min']:.2f}%")
         
-        high_closure_rate = sum(1 for repo in repos_with_issues if repo['closed_issues_ratio'] > 80)
-        print(f"\nRepositórios com mais de 80% de issues fechadas: {high_closure_rate} ({high_closure_rate/len(repos_with_issues)*100:.1f}%)")
+        high_closure_rate = summary.high_closure_rate
+        print(f"\nRepositórios com mais de 80% de issues fechadas: {high_closure_rate} ({high_closure_rate/summary.repos_with_issues*100:.1f}%)")
         
         return stats
     
@@ -310,48 +590,48 @@ class GitHubRepositoryAnalyzer:
         print("RQ07 (BÔNUS): Análise por linguagem")
         print("="*60)
         
-        # Agrupa dados por linguagem
-        lang_data = defaultdict(list)
-        for repo in data:
-            lang_data[repo['primary_language']].append(repo)
+        summary = self.summarize(data)
         
         # Considera apenas as top 5 linguagens para análise
-        language_counts = Counter(repo['primary_language'] for repo in data)
-        top_languages = [lang for lang, count in language_counts.most_common(5)]
+        top_languages = [lang for lang, count in summary.language_counts.most_common(5)]
         
         print("\nAnálise das top 5 linguagens:")
         print("="*40)
         
         for lang in top_languages:
-            repos = lang_data[lang]
-            count = len(repos)
-            
-            prs = [repo['merged_prs'] for repo in repos]
-            releases = [repo['total_releases'] for repo in repos]
-            updates = [repo['days_since_update'] for repo in repos]
+            count = summary.language_counts[lang]
+            groups = summary.language_groups[lang]
             
-            pr_stats = self.calculate_stats(prs)
-            release_stats = self.calculate_stats(releases)
-            update_stats = self.calculate_stats(updates)
+            pr_stats = groups['merged_prs']
+            release_stats = groups['total_releases']
+            update_stats = groups['days_since_update']
             
             print(f"\n{lang} ({count} repositórios):")
             print(f"  PRs aceitos - Média: {pr_stats['mean']:.2f}, Mediana: {pr_stats['median']:.2f}")
             print(f"  Releases - Média: {release_stats['mean']:.2f}, Mediana: {release_stats['median']:.2f}")
             print(f"  Dias desde update - Média: {update_stats['mean']:.2f}, Mediana: {update_stats['median']:.2f}")
         
-        return lang_data
+        return summary.language_groups
     
     def create_simple_charts(self, data):
         print("\n" + "="*60)
         print("VISUALIZAÇÕES SIMPLES")
         print("="*60)
         
+        for line in self.format_simple_charts(self.summarize(data)):
+            print(line)
+    
+    def format_simple_charts(self, summary):
+        """
+        Linhas dos gráficos ASCII (top linguagens e histograma de idade) de um RQSummary
+        """
+        lines = []
+        
         # RQ05: Top linguagens (gráfico de barras ASCII)
-        print("\nRQ05: Top 10 Linguagens (Gráfico de Barras ASCII)")
-        print("-" * 50)
+        lines.append("\nRQ05: Top 10 Linguagens (Gráfico de Barras ASCII)")
+        lines.append("-" * 50)
         
-        languages = [repo['primary_language'] for repo in data]
-        language_counts = Counter(languages)
+        language_counts = summary.language_counts
         
         max_count = max(language_counts.values())
         scale_factor = 40 / max_count  # Escala para 40 caracteres
@@ -359,28 +639,20 @@ class GitHubRepositoryAnalyzer:
         for i, (lang, count) in enumerate(language_counts.most_common(10), 1):
             bar_length = int(count * scale_factor)
             bar = "█" * bar_length
-            percentage = (count / len(data)) * 100
-            print(f"{i:2d}. {lang:<15} {bar} {count} ({percentage:.1f}%)")
-        
-        # RQ01: Distribuição da idade
-        print("\nRQ01: Distribuição da Idade (em anos)")
-        print("-" * 50)
+            percentage = (count / summary.total) * 100
+            lines.append(f"{i:2d}. {lang:<15} {bar} {count} ({percentage:.1f}%)")
         
-        ages = [repo['age_days'] / 365.25 for repo in data]
+        # RQ01: Distribuição da idade (histograma já acumulado pelo agregador; o último bin inclui valores maiores)
+        lines.append("\nRQ01: Distribuição da Idade (em anos)")
+        lines.append("-" * 50)
         
-        # Cria histograma simples
-        bins = [0, 2, 4, 6, 8, 10, 15, 20]
-        bin_labels = ["0-2", "2-4", "4-6", "6-8", "8-10", "10-15", "15+"]
-        
-        for i in range(len(bins) - 1):
-            count = sum(1 for age in ages if bins[i] <= age < bins[i+1])
-            if i == len(bins) - 2:  # Último bin inclui valores maiores
-                count = sum(1 for age in ages if age >= bins[i])
-            
-            bar_length = int(count * 40 / len(data))  # Escala para 40 caracteres
+        for label, count in summary.age_histogram:
+            bar_length = int(count * 40 / summary.total)  # Escala para 40 caracteres
             bar = "█" * bar_length
-            percentage = (count / len(data)) * 100
-            print(f"{bin_labels[i]:<6} anos {bar} {count} ({percentage:.1f}%)")
+            percentage = (count / summary.total) * 100
+            lines.append(f"{label:<6} anos {bar} {count} ({percentage:.1f}%)")
+        
+        return lines
     
     def save_data_csv(self, data, filename='github_repositories_data.csv'):
         """
@@ -390,144 +662,233 @@ class GitHubRepositoryAnalyzer:
             print("Nenhum dado para salvar.")
             return
         
-        fieldnames = data[0].keys()
-        
         try:
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(data)
+                writer = csv.writer(csvfile)
+                writer.writerow(RECORD_FIELDS)
+                writer.writerows(record.as_row() for record in data)
             
             print(f"\nDados salvos em: {filename}")
             
         except Exception as e:
             print(f"Erro ao salvar arquivo CSV: {e}")
     
-    def save_summary_report(self, data, filename='github_analysis_report.txt'):
+    def save_summary_report(self, data, filename='github_analysis_report.txt', header=None, quiet=False):
+        """
+        Grava o relatório resumido; `header` vai antes do título (ex.: aviso de relatório
+        parcial). O arquivo é reescrito de forma atômica: quem o lê nunca vê meio relatório.
+        """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write("RELATÓRIO DE ANÁLISE - REPOSITÓRIOS POPULARES DO GITHUB\n")
-                f.write("=" * 60 + "\n\n")
-                
-                f.write(f"Data da análise: {datetime.now().strftime('%Y-%m-%d')}\n")
-                f.write(f"Total de repositórios analisados: {len(data)}\n\n")
-                
-                # Resumo por RQ
-                f.write("RESUMO DAS RESEARCH QUESTIONS:\n")
-                f.write("-" * 40 + "\n\n")
-                
-                # RQ01
-                ages = [repo['age_days'] / 365.25 for repo in data]
-                age_stats = self.calculate_stats(ages)
-                f.write(f"RQ01 - Maturidade:\n")
-                f.write(f"  Idade média: {age_stats['mean']:.2f} anos\n")
-                f.write(f"  Repositórios com +5 anos: {sum(1 for a in ages if a > 5)} ({sum(1 for a in ages if a > 5)/len(ages)*100:.1f}%)\n\n")
-                
-                # RQ02
-                prs = [repo['merged_prs'] for repo in data]
-                pr_stats = self.calculate_stats(prs)
-                f.write(f"RQ02 - Contribuições:\n")
-                f.write(f"  Média de PRs aceitos: {pr_stats['mean']:.2f}\n")
-                f.write(f"  Mediana de PRs: {pr_stats['median']:.2f}\n\n")
-                
-                # RQ03
-                releases = [repo['total_releases'] for repo in data]
-                release_stats = self.calculate_stats(releases)
-                f.write(f"RQ03 - Releases:\n")
-                f.write(f"  Média de releases: {release_stats['mean']:.2f}\n")
-                f.write(f"  Repos com releases: {sum(1 for r in releases if r > 0)} ({sum(1 for r in releases if r > 0)/len(releases)*100:.1f}%)\n\n")
-                
-                # RQ04
-                updates = [repo['days_since_update'] for repo in data]
-                update_stats = self.calculate_stats(updates)
-                f.write(f"RQ04 - Atualizações:\n")
-                f.write(f"  Média dias desde update: {update_stats['mean']:.2f}\n")
-                f.write(f"  Atualizados em 30 dias: {sum(1 for u in updates if u <= 30)} ({sum(1 for u in updates if u <= 30)/len(updates)*100:.1f}%)\n\n")
-                
-                # RQ05
-                languages = Counter(repo['primary_language'] for repo in data)
-                f.write(f"RQ05 - Top 5 Linguagens:\n")
-                for i, (lang, count) in enumerate(languages.most_common(5), 1):
-                    f.write(f"  {i}. {lang}: {count} repos ({count/len(data)*100:.1f}%)\n")
-                f.write("\n")
-                
-                # RQ06
-                repos_with_issues = [repo for repo in data if repo['total_issues'] > 0]
-                if repos_with_issues:
-                    ratios = [repo['closed_issues_ratio'] for repo in repos_with_issues]
-                    ratio_stats = self.calculate_stats(ratios)
-                    f.write(f"RQ06 - Issues Fechadas:\n")
-                    f.write(f"  Média de fechamento: {ratio_stats['mean']:.2f}%\n")
-                    f.write(f"  Repos com +80% fechadas: {sum(1 for r in ratios if r > 80)} ({sum(1 for r in ratios if r > 80)/len(ratios)*100:.1f}%)\n\n")
-                
-            print(f"Relatório salvo em: {filename}")
+            summary = self.summarize(data)
+            tmp_path = filename + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                if header:
+                    f.write(header)
+                f.write(self.format_summary_report(summary))
+            os.replace(tmp_path, filename)
+            
+            if not quiet:
+                print(f"Relatório salvo em: {filename}")
             
         except Exception as e:
             print(f"Erro ao salvar relatório: {e}")
     
-    def run_complete_analysis(self, total_repos=100):
+    def format_summary_report(self, summary):
+        """
+        Texto do relatório resumido de um RQSummary
+        """
+        lines = []
+        lines.append("RELATÓRIO DE ANÁLISE - REPOSITÓRIOS POPULARES DO GITHUB\n")
+        lines.append("=" * 60 + "\n\n")
+        
+        lines.append(f"Data da análise: {datetime.now().strftime('%Y-%m-%d')}\n")
+        lines.append(f"Total de repositórios analisados: {summary.total}\n\n")
+        
+        # Resumo por RQ
+        lines.append("RESUMO DAS RESEARCH QUESTIONS:\n")
+        lines.append("-" * 40 + "\n\n")
+        
+        # RQ01
+        age_stats = summary.age_stats
+        mature = summary.mature_repos
+        lines.append(f"RQ01 - Maturidade:\n")
+        lines.append(f"  Idade média: {age_stats['mean']:.2f} anos\n")
+        lines.append(f"  Repositórios com +5 anos: {mature} ({mature/summary.total*100:.1f}%)\n\n")
+        
+        # RQ02
+        pr_stats = summary.pr_stats
+        lines.append(f"RQ02 - Contribuições:\n")
+        lines.append(f"  Média de PRs aceitos: {pr_stats['mean']:.2f}\n")
+        lines.append(f"  Mediana de PRs: {pr_stats['median']:.2f}\n\n")
+        
+        # RQ03
+        release_stats = summary.release_stats
+        with_releases = summary.repos_with_releases
+        lines.append(f"RQ03 - Releases:\n")
+        lines.append(f"  Média de releases: {release_stats['mean']:.2f}\n")
+        lines.append(f"  Repos com releases: {with_releases} ({with_releases/summary.total*100:.1f}%)\n\n")
+        
+        # RQ04
+        update_stats = summary.update_stats
+        recent = summary.recently_updated
+        lines.append(f"RQ04 - Atualizações:\n")
+        lines.append(f"  Média dias desde update: {update_stats['mean']:.2f}\n")
+        lines.append(f"  Atualizados em 30 dias: {recent} ({recent/summary.total*100:.1f}%)\n\n")
+        
+        # RQ05
+        lines.append(f"RQ05 - Top 5 Linguagens:\n")
+        for i, (lang, count) in enumerate(summary.language_counts.most_common(5), 1):
+            lines.append(f"  {i}. {lang}: {count} repos ({count/summary.total*100:.1f}%)\n")
+        lines.append("\n")
+        
+        # RQ06
+        if summary.repos_with_issues:
+            ratio_stats = summary.issue_ratio_stats
+            high = summary.high_closure_rate
+            lines.append(f"RQ06 - Issues Fechadas:\n")
+            lines.append(f"  Média de fechamento: {ratio_stats['mean']:.2f}%\n")
+            lines.append(f"  Repos com +80% fechadas: {high} ({high/summary.repos_with_issues*100:.1f}%)\n\n")
+        
+        return "".join(lines)
+    
+    def collect_repositories(self, total_repos=100, max_workers=1, journal_path=None, resume=False,
+                             incremental_store=None, csv_filename='github_repositories_data.csv',
+                             dataset_format=None, include_text_fields=True, snapshot_db=None,
+                             sinks=(), tap=None):
+        """
+        Etapa de coleta: busca e processa as páginas em streaming, gravando cada uma no CSV
+        (e no dataset/histórico, se pedidos) e entregando-a aos `sinks` extras. `tap` é um
+        RepositoryColumns preenchido direto das páginas do GraphQL. Devolve quantos
+        repositórios foram gravados.
+        """
+        # Coleta e processamento em streaming: cada página vai direto para o
+        # CSV e para os demais sinks, sem acumular os nós brutos
+        if journal_path:
+            self.enable_journal(journal_path, resume)
+        
+        if incremental_store:
+            pages = iter([self.refresh_repositories(total_repos, max_workers, incremental_store)])
+        else:
+            # url/description não entram em nenhuma RQ; sem eles a resposta fica bem menor
+            fields = build_repository_fields(include_text=include_text_fields)
+            pages = self.iter_repository_pages(total_repos, max_workers, fields)
+        
+        current_date = datetime.now(timezone.utc)
+        # Espera por cada página de nós (rede + decodificação nas threads dos shards)
+        pages = self.metrics.timed('page_wait', pages)
+        # Lotes de várias páginas, grandes o bastante para o processamento por colunas
+        pages = vectorized_processing.batch_pages(pages)
+        csv_sink = CsvSink(csv_filename)
+        all_sinks = [csv_sink]
+        if dataset_format:
+            # pyarrow só é importado quando o dataset é pedido
+            from columnar_output import DATASET_DIR, ArrowDatasetSink
+            # Cópia tipada e comprimida, ao lado do CSV, para o graphics_genarator.py ler só as colunas de cada gráfico
+            all_sinks.append(ArrowDatasetSink(os.path.join(os.path.dirname(csv_filename), DATASET_DIR),
+                                              fmt=dataset_format))
+        snapshots = None
+        if snapshot_db:
+            # Histórico: cada coleta vira um conjunto de linhas no SQLite em vez de sobrescrever o CSV
+            snapshots = SnapshotStore(snapshot_db)
+            all_sinks.append(snapshots.writer(collection_timestamp(current_date)))
+        all_sinks.extend(sinks)
+        if tap is not None:
+            # As colunas NumPy são preenchidas direto das páginas do GraphQL
+            pages = tap.tap(pages, current_date)
+        
+        try:
+            with self.metrics.span('collection'):
+                run_pipeline(self.iter_processed(pages, current_date), all_sinks, self.metrics)
+        finally:
+            if self.journal:
+                self.journal.close()
+            if snapshots:
+                snapshots.close()
+        
+        return csv_sink.count
+    
+    def run_analyses(self, data):
+        """
+        Etapa de análise: RQ01-RQ06, o bônus RQ07 e as visualizações ASCII sobre o mesmo resultado
+        """
+        analyses = [self.analyze_rq01, self.analyze_rq02, self.analyze_rq03, self.analyze_rq04,
+                    self.analyze_rq05, self.analyze_rq06, self.analyze_rq07_bonus]
+        for analyze in analyses:
+            with self.metrics.span('analysis', rq=analyze.__name__):
+                analyze(data)
+        
+        with self.metrics.span('charts'):
+            self.create_simple_charts(data)
+    
+    def run_complete_analysis(self, total_repos=100, max_workers=1, journal_path=None, resume=False,
+                              incremental_store=None, csv_filename='github_repositories_data.csv',
+                              exact_stats=True, columnar=False, dataset_format=None, include_text_fields=True,
+                              enrich=False, enrich_releases=20, enrich_prs=50, snapshot_db=None, live=False,
+                              live_interval=DEFAULT_INTERVAL):
         print("INICIANDO ANÁLISE COMPLETA DOS REPOSITÓRIOS DO GITHUB")
         print("=" * 60)
         
-        # 1. Coleta de dados
-        repositories = self.fetch_repositories(total_repos)
+        # 1-2. Coleta e processamento, com o agregador das análises como mais um sink
+        names = NameSink()
+        sinks = [names] if enrich else []
+        tap = None
+        if columnar:
+            from columnar_store import RepositoryColumns
+            aggregator = tap = RepositoryColumns()
+        else:
+            aggregator = RQAggregator(exact=exact_stats)
+            sinks.append(aggregator)
+        if live:
+            # RQs, linguagens e gráficos ASCII atualizados durante a coleta, a partir do mesmo agregador
+            sinks.append(LiveAnalysisView(self, aggregator, total_repos, live_interval))
+        
+        self.collect_repositories(total_repos, max_workers, journal_path, resume, incremental_store, csv_filename,
+                                  dataset_format, include_text_fields, snapshot_db, sinks, tap)
         
-        if not repositories:
+        if not len(aggregator):
             print("Erro: Nenhum repositório foi coletado.")
             return None
         
-        # 2. Processamento
-        data = self.process_data(repositories)
+        # Todas as análises, gráficos e o relatório leem o mesmo resultado
+        with self.metrics.span('summary'):
+            data = aggregator.summary()
         
-        # 3. Análises das RQs
-        self.analyze_rq01(data)
-        self.analyze_rq02(data)
-        self.analyze_rq03(data)
-        self.analyze_rq04(data)
-        self.analyze_rq05(data)
-        self.analyze_rq06(data)
+        self.scheduler.report()
+        print(f"\nDados salvos em: {csv_filename}")
         
-        # 4. Bônus
-        self.analyze_rq07_bonus(data)
+        # 3. Análises das RQs (4. Bônus: RQ07) e 5. visualizações simples
+        self.run_analyses(data)
         
-        # 5. Visualizações simples
-        self.create_simple_charts(data)
+        # 6. Salvar relatório
+        with self.metrics.span('report'):
+            self.save_summary_report(data)
         
-        # 6. Salvar dados e relatório
-        self.save_data_csv(data)
-        self.save_summary_report(data)
+        # 7. Métricas de histórico (opcional)
+        if enrich:
+            with self.metrics.span('enrichment'):
+                self.enrich_repositories(names.names, enrich_releases, enrich_prs, max_workers)
+        
+        self.metrics.report()
         
         print("\n" + "="*60)
         print("ANÁLISE COMPLETA FINALIZADA!")
         print("="*60)
         print(f"Arquivos gerados:")
-        print(f"  - github_repositories_data.csv (dados completos)")
+        print(f"  - {csv_filename} (dados completos)")
         print(f"  - github_analysis_report.txt (relatório resumido)")
+        if dataset_format:
+            from columnar_output import DATASET_DIR, partition_path
+            dataset_dir = os.path.join(os.path.dirname(csv_filename), DATASET_DIR)
+            print(f"  - {partition_path(dataset_dir, dataset_format)} (dataset {dataset_format})")
+        if snapshot_db:
+            print(f"  - {snapshot_db} (histórico de coletas, consultas com snapshot_store.py)")
+        if enrich:
+            print("  - github_repositories_enrichment.csv (cadência de releases e latência de merge)")
         
         return data
 
 if __name__ == "__main__":
-    GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')  
-    
-    if not GITHUB_TOKEN:  
-        try:
-            with open('LAB01 - SPRINT 01/config.json') as f:
-                config = json.load(f)
-                GITHUB_TOKEN = config['github_token']
-        except FileNotFoundError: 
-            print("Arquivo de configuração não encontrado. Defina a variável de ambiente GITHUB_TOKEN ou crie o arquivo config.json.")
-        
-    analyzer = GitHubRepositoryAnalyzer(GITHUB_TOKEN)
-    
-    try:
-        results = analyzer.run_complete_analysis(1000)  # analisa 100 repos
-        
-        if results:
-            print(f"\n Sucesso")
-        else:
-            print("Erro")
-            
-    except Exception as e:
-        print(f"❌ Erro durante a execução: {e}")
-        
-    input("\nPressione Enter para sair...")
\ No newline at end of file
+    # A linha de comando fica em lab01_cli.py; rodar este arquivo equivale a `lab01_cli.py all`
+    import sys
+    import lab01_cli
+    sys.exit(lab01_cli.main(['all'] + sys.argv[1:]))
@@ -0,0 +1,300 @@
+import math
+from itertools import combinations
+from statistics import NormalDist
+
+from pipeline import CsvSink
+from rq_aggregator import LANGUAGE_METRICS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_MIN_GROUP = 30
+DEFAULT_REPLICATES = 2000
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_COMPARISON_CSV = 'rq07_comparacoes.csv'
+
+# Correlações de Spearman com as estrelas (popularidade)
+CORRELATION_METRICS = ('merged_prs', 'total_releases', 'days_since_update', 'age_days')
+
+COMPARISON_FIELDNAMES = ['metric', 'language_a', 'language_b', 'n_a', 'n_b', 'u', 'z', 'p_value', 'p_holm',
+                         'prob_a_greater']
+
+
+def average_ranks(values):
+    """
+    Postos (1..n) com empates recebendo a média dos postos; devolve também o tamanho de cada grupo de empate
+    """
+    order = np.argsort(values, kind='mergesort')
+    sorted_values = values[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_values)) + 1))
+    ends = np.append(starts[1:], len(values))
+    ties = ends - starts
+
+    ranks = np.empty(len(values), dtype='float64')
+    ranks[order] = np.repeat((starts + ends + 1) / 2, ties)
+    return ranks, ties
+
+
+def tie_sum(ties):
+    ties = ties.astype('float64')
+    return float(np.sum(ties ** 3 - ties))
+
+
+def normal_sf(z):
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def chi2_sf(x, df):
+    """
+    P(X > x) para X ~ qui-quadrado com `df` graus de liberdade (gama incompleta regularizada)
+    """
+    if x <= 0:
+        return 1.0
+    a, x = df / 2, x / 2
+    log_prefix = -x + a * math.log(x) - math.lgamma(a)
+
+    if x < a + 1:
+        # Série da parte inferior P(a, x)
+        term = total = 1 / a
+        n = a
+        for _ in range(1000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1 - total * math.exp(log_prefix))
+
+    # Fração contínua da parte superior Q(a, x) (método de Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = b + an / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefix) * h
+
+
+def holm(p_values):
+    """
+    p-valores ajustados por Holm-Bonferroni (comparações múltiplas)
+    """
+    m = len(p_values)
+    adjusted = [0.0] * m
+    running = 0.0
+    for position, index in enumerate(sorted(range(m), key=p_values.__getitem__)):
+        running = max(running, min(1.0, (m - position) * p_values[index]))
+        adjusted[index] = running
+    return adjusted
+
+
+def kruskal_wallis(groups):
+    """
+    Teste de Kruskal-Wallis (H corrigido para empates) sobre os grupos; devolve (H, graus de liberdade, p)
+    """
+    values = np.concatenate(groups)
+    n = len(values)
+    ranks, ties = average_ranks(values)
+    sizes = np.array([len(group) for group in groups])
+    rank_sums = np.add.reduceat(ranks, np.concatenate(([0], np.cumsum(sizes)[:-1])))
+
+    h = 12 / (n * (n + 1)) * float(np.sum(rank_sums ** 2 / sizes)) - 3 * (n + 1)
+    correction = 1 - tie_sum(ties) / (n ** 3 - n)
+    h = h / correction if correction > 0 else 0.0
+    df = len(groups) - 1
+    return h, df, chi2_sf(h, df)
+
+
+def mann_whitney(sorted_a, sorted_b):
+    """
+    Mann-Whitney bicaudal (aproximação normal com correção de empates e de continuidade)
+    entre dois grupos já ordenados. Devolve (U de a, z, p, P(a > b) + P(a = b)/2).
+    """
+    n_a, n_b = len(sorted_a), len(sorted_b)
+    # U de a: para cada valor de a, quantos de b ficam abaixo (empates valem meio)
+    below = np.searchsorted(sorted_b, sorted_a, side='left')
+    at_or_below = np.searchsorted(sorted_b, sorted_a, side='right')
+    u = float(below.sum() + 0.5 * (at_or_below - below).sum())
+
+    n = n_a + n_b
+    _, ties = np.unique(np.concatenate((sorted_a, sorted_b)), return_counts=True)
+    variance = n_a * n_b / 12 * ((n + 1) - tie_sum(ties) / (n * (n - 1)))
+    mean = n_a * n_b / 2
+    if variance <= 0:
+        return u, 0.0, 1.0, 0.5
+
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    z = max(z, 0.0) * (1 if u >= mean else -1)
+    return u, z, min(1.0, 2 * normal_sf(abs(z))), u / (n_a * n_b)
+
+
+def spearman(x, y, confidence=DEFAULT_CONFIDENCE):
+    """
+    Correlação de Spearman com p-valor e intervalo pela transformação de Fisher
+    (erro padrão sqrt(1.06 / (n - 3)), de Fieller, Hartley e Pearson)
+    """
+    n = len(x)
+    if n < 4:
+        return {'rho': 0.0, 'p_value': 1.0, 'lower': -1.0, 'upper': 1.0, 'n': n}
+
+    rank_x, _ = average_ranks(x)
+    rank_y, _ = average_ranks(y)
+    rank_x -= rank_x.mean()
+    rank_y -= rank_y.mean()
+    denominator = math.sqrt(float(np.dot(rank_x, rank_x)) * float(np.dot(rank_y, rank_y)))
+    rho = float(np.dot(rank_x, rank_y)) / denominator if denominator else 0.0
+
+    z = math.atanh(max(min(rho, 0.999999), -0.999999))
+    se = math.sqrt(1.06 / (n - 3))
+    critical = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    return {
+        'rho': rho,
+        'p_value': min(1.0, 2 * normal_sf(abs(z) / se)),
+        'lower': math.tanh(z - critical * se),
+        'upper': math.tanh(z + critical * se),
+        'n': n,
+    }
+
+
+def bootstrap_median_ci(sorted_values, replicates=DEFAULT_REPLICATES, confidence=DEFAULT_CONFIDENCE, rng=None):
+    """
+    Intervalo bootstrap (percentis) da mediana, sem materializar as reamostras. Com os
+    valores ordenados, a mediana de uma reamostra é o valor na posição da mediana dos
+    índices sorteados, e a k-ésima estatística de ordem de n uniformes segue Beta(k, n-k+1):
+    cada réplica custa um sorteio Beta, não n. A distribuição é a mesma do bootstrap
+    reamostrando os índices, com todas as réplicas geradas num único lote NumPy.
+    """
+    rng = rng or np.random.default_rng()
+    n = len(sorted_values)
+    k = (n + 1) // 2
+    lower_order = rng.beta(k, n - k + 1, size=replicates)
+    lower_index = np.minimum((lower_order * n).astype('int64'), n - 1)
+
+    if n % 2:
+        medians = sorted_values[lower_index]
+    else:
+        # n par: a mediana é a média da k-ésima e da (k+1)-ésima estatísticas de ordem;
+        # a seguinte é o mínimo das n-k uniformes restantes acima da k-ésima
+        upper_order = lower_order + (1 - lower_order) * rng.beta(1, n - k, size=replicates)
+        upper_index = np.minimum((upper_order * n).astype('int64'), n - 1)
+        medians = (sorted_values[lower_index] + sorted_values[upper_index]) / 2
+
+    medians.sort()
+    alpha = (1 - confidence) / 2
+    return float(medians[int(alpha * (replicates - 1))]), float(medians[math.ceil((1 - alpha) * (replicates - 1))])
+
+
+class LanguageComparison:
+    """
+    Resultado da comparação entre as linguagens (RQ07): Kruskal-Wallis e Mann-Whitney
+    pareado por métrica, medianas com IC bootstrap e correlações com as estrelas
+    """
+    def __init__(self, languages, sizes, confidence):
+        self.languages = languages
+        self.sizes = sizes
+        self.confidence = confidence
+        self.kruskal = {}  # métrica -> (H, gl, p)
+        self.medians = {}  # métrica -> {linguagem: (mediana, inferior, superior)}
+        self.pairs = {}  # métrica -> lista de dicts (COMPARISON_FIELDNAMES)
+        self.correlations = {}  # métrica -> resultado de spearman()
+
+    def print_report(self, top_pairs=5):
+        alpha = 1 - self.confidence
+        print("\n" + "=" * 60)
+        print(f"RQ07: Comparação estatística entre {len(self.languages)} linguagens "
+              f"({sum(self.sizes.values())} repositórios)")
+        print("=" * 60)
+
+        for metric in self.kruskal:
+            h, df, p_value = self.kruskal[metric]
+            print(f"\n{metric}: Kruskal-Wallis H = {h:.2f} (gl = {df}), p = {p_value:.3g}")
+            print(f"  Medianas (IC de {self.confidence * 100:.0f}% por bootstrap):")
+            ranked = sorted(self.medians[metric].items(), key=lambda item: item[1][0], reverse=True)
+            for language, (median, lower, upper) in ranked:
+                print(f"    {language:<18} {median:>10.2f} [{lower:.2f}, {upper:.2f}] n = {self.sizes[language]}")
+
+            pairs = self.pairs[metric]
+            significant = [pair for pair in pairs if pair['p_holm'] < alpha]
+            print(f"  Pares com diferença significativa (Mann-Whitney, Holm, α = {alpha:.2f}): "
+                  f"{len(significant)} de {len(pairs)}")
+            significant.sort(key=lambda pair: abs(pair['prob_a_greater'] - 0.5), reverse=True)
+            for pair in significant[:top_pairs]:
+                print(f"    {pair['language_a']} x {pair['language_b']}: P(a > b) = {pair['prob_a_greater']:.2f}, "
+                      f"p ajustado = {pair['p_holm']:.3g}")
+
+        print("\nCorrelação de Spearman com as estrelas:")
+        for metric, result in self.correlations.items():
+            print(f"  stars x {metric:<18} ρ = {result['rho']:+.3f} [{result['lower']:+.3f}, {result['upper']:+.3f}], "
+                  f"p = {result['p_value']:.3g}")
+
+    def save_csv(self, filename=DEFAULT_COMPARISON_CSV):
+        """
+        Grava todas as comparações pareadas (uma linha por métrica e par de linguagens)
+        """
+        sink = CsvSink(filename, COMPARISON_FIELDNAMES)
+        for pairs in self.pairs.values():
+            sink.write_page(pairs)
+        sink.close()
+
+
+def compare_languages(columns, min_group=DEFAULT_MIN_GROUP, replicates=DEFAULT_REPLICATES,
+                      confidence=DEFAULT_CONFIDENCE, seed=None):
+    """
+    Compara as linguagens com pelo menos `min_group` repositórios em RepositoryColumns
+    (repositórios sem linguagem ficam de fora), com operações vetorizadas por grupo
+    """
+    if np is None:
+        raise ImportError("A comparação entre linguagens precisa do numpy (pip install numpy)")
+
+    codes = columns.column('primary_language')
+    names = columns.categories('primary_language')
+    counts = np.bincount(codes, minlength=len(names))
+    selected = [code for code in np.argsort(-counts, kind='stable')
+                if counts[code] >= min_group and names[code] != 'Unknown']
+    languages = [names[code] for code in selected]
+    result = LanguageComparison(languages, {names[code]: int(counts[code]) for code in selected}, confidence)
+    if len(selected) < 2:
+        print(f"Menos de duas linguagens com pelo menos {min_group} repositórios; nada a comparar.")
+        return result
+
+    rng = np.random.default_rng(seed)
+    positions = {code: np.flatnonzero(codes == code) for code in selected}
+
+    for metric in LANGUAGE_METRICS:
+        values = columns.column(metric)
+        groups = {names[code]: np.sort(values[positions[code]]).astype('float64') for code in selected}
+
+        result.kruskal[metric] = kruskal_wallis(list(groups.values()))
+        result.medians[metric] = {
+            language: (float(np.median(group)),) + bootstrap_median_ci(group, replicates, confidence, rng)
+            for language, group in groups.items()
+        }
+
+        pairs = []
+        for language_a, language_b in combinations(languages, 2):
+            group_a, group_b = groups[language_a], groups[language_b]
+            u, z, p_value, prob = mann_whitney(group_a, group_b)
+            pairs.append({'metric': metric, 'language_a': language_a, 'language_b': language_b,
+                          'n_a': len(group_a), 'n_b': len(group_b), 'u': u, 'z': round(z, 4),
+                          'p_value': p_value, 'p_holm': 0.0, 'prob_a_greater': round(prob, 4)})
+        for pair, adjusted in zip(pairs, holm([pair['p_value'] for pair in pairs])):
+            pair['p_holm'] = adjusted
+        result.pairs[metric] = pairs
+
+    stars = columns.column('stars').astype('float64')
+    for metric in CORRELATION_METRICS:
+        result.correlations[metric] = spearman(stars, columns.column(metric).astype('float64'), confidence)
+
+    return result
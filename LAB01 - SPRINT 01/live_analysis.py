@@ -0,0 +1,93 @@
+import sys
+import time
+from datetime import datetime
+
+DEFAULT_INTERVAL = 10.0  # segundos entre atualizações da visão ao vivo
+CLEAR_SCREEN = "\033[H\033[J"
+
+
+class LiveAnalysisView:
+    """
+    Sink do pipeline que mostra as RQs enquanto a coleta ainda está rodando. Depois de
+    cada página, se já passaram `interval` segundos desde a última atualização, pede o
+    resumo ao agregador da própria coleta (o RQAggregator ou RepositoryColumns que
+    alimenta as análises finais, então nenhum repositório é contado duas vezes),
+    redesenha a visão no terminal e reescreve o relatório parcial de forma atômica.
+    Tudo acontece na thread do pipeline, entre uma página e outra, sem disputar o
+    agregador com as threads dos shards.
+    """
+    def __init__(self, analyzer, source, expected=None, interval=DEFAULT_INTERVAL,
+                 report_path='github_analysis_report.txt', stream=None):
+        self.analyzer = analyzer
+        self.source = source
+        self.expected = expected
+        self.interval = interval
+        self.report_path = report_path
+        self.stream = stream or sys.stdout
+        # Num terminal a visão é redesenhada no lugar; redirecionada, vira blocos em sequência
+        self.redraw = self.stream.isatty()
+        self.started = time.monotonic()
+        self.last_refresh = self.started
+
+    def write_page(self, records):
+        if time.monotonic() - self.last_refresh >= self.interval:
+            self.refresh()
+
+    def close(self):
+        # Também roda quando a coleta é interrompida (Ctrl+C): o relatório parcial fica
+        # com o último estado; numa coleta completa ele é sobrescrito pelo relatório final
+        if len(self.source):
+            self.save_report("coleta encerrada")
+
+    def progress(self):
+        count = len(self.source)
+        elapsed = time.monotonic() - self.started
+        rate = count / elapsed if elapsed > 0 else 0
+        line = f"{count} repositórios em {elapsed:.0f}s ({rate:.1f}/s)"
+        if self.expected:
+            line += f", {count / self.expected * 100:.1f}% de {self.expected}"
+            if rate > 0 and count < self.expected:
+                line += f", faltam ~{(self.expected - count) / rate:.0f}s"
+        return line
+
+    def refresh(self):
+        self.last_refresh = time.monotonic()
+        if not len(self.source):
+            return
+
+        with self.analyzer.metrics.span('live_refresh'):
+            summary = self.source.summary()
+            text = self.render(summary)
+            self.save_report("coleta em andamento", summary)
+
+        self.stream.write(CLEAR_SCREEN + text if self.redraw else "\n" + text)
+        self.stream.flush()
+
+    def render(self, summary):
+        """
+        Visão compacta: progresso, os números principais de cada RQ e os gráficos ASCII
+        """
+        lines = [
+            "=" * 60,
+            f"ANÁLISE AO VIVO (coleta em andamento) - {datetime.now().strftime('%H:%M:%S')}",
+            "=" * 60,
+            self.progress(),
+            "",
+            f"RQ01 idade mediana: {summary.age_stats['median']:.2f} anos, "
+            f"+5 anos: {summary.mature_repos / summary.total * 100:.1f}%",
+            f"RQ02 mediana de PRs aceitos: {summary.pr_stats['median']:.2f}",
+            f"RQ03 mediana de releases: {summary.release_stats['median']:.2f}, "
+            f"com releases: {summary.repos_with_releases / summary.total * 100:.1f}%",
+            f"RQ04 mediana de dias desde update: {summary.update_stats['median']:.2f}, "
+            f"atualizados em 30 dias: {summary.recently_updated / summary.total * 100:.1f}%",
+        ]
+        if summary.repos_with_issues:
+            lines.append(f"RQ06 mediana de issues fechadas: {summary.issue_ratio_stats['median']:.2f}%, "
+                         f"+80% fechadas: {summary.high_closure_rate / summary.repos_with_issues * 100:.1f}%")
+        lines.extend(self.analyzer.format_simple_charts(summary))
+        return "\n".join(lines) + "\n"
+
+    def save_report(self, status, summary=None):
+        header = (f"RELATÓRIO PARCIAL - {status} ({self.progress()})\n"
+                  f"Atualizado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        self.analyzer.save_summary_report(summary or self.source, self.report_path, header=header, quiet=True)
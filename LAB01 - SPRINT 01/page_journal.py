@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+
+import json_codec
+
+
+class ShardState:
+    """
+    Estado reconstruído de um shard a partir do journal
+    """
+    def __init__(self):
+        self.nodes = []
+        self.end_cursor = None
+        self.done = False
+
+
+class PageJournal:
+    """
+    Journal em disco (JSONL, uma linha por página) com as páginas já coletadas.
+    Cada linha é gravada com flush + fsync, então uma queda ou Ctrl-C perde no máximo
+    a página que estava em andamento.
+    """
+    def __init__(self, path='github_pages_journal.jsonl', fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.file = None
+
+    def open(self, resume=False):
+        """
+        Abre o journal; sem `resume` o arquivo anterior é descartado. No resume, uma
+        última linha cortada por uma queda é removida antes de voltar a anexar, senão
+        a próxima página seria gravada colada nela e perdida.
+        """
+        if resume and os.path.exists(self.path):
+            self._truncate_torn_line()
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _truncate_torn_line(self):
+        with open(self.path, 'rb+') as f:
+            content = f.read()
+            complete = content.rfind(b'\n') + 1
+            if complete < len(content):
+                f.truncate(complete)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def _write(self, entry):
+        line = json_codec.dumps(entry) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            if self.fsync:
+                os.fsync(self.file.fileno())
+
+    def append_plan(self, shards):
+        """
+        Registra os shards da coleta, para o resume não precisar montá-los de novo
+        """
+        self._write({'type': 'plan', 'shards': shards})
+
+    def append_page(self, shard, after_cursor, page_info, nodes):
+        self._write({
+            'type': 'page',
+            'shard': shard,
+            'after': after_cursor,
+            'endCursor': page_info['endCursor'],
+            'hasNextPage': page_info['hasNextPage'],
+            'nodes': nodes
+        })
+
+    def load(self):
+        """
+        Relê o journal e devolve (plano, {shard: ShardState})
+        """
+        plan = None
+        shards = {}
+
+        if not os.path.exists(self.path):
+            return plan, shards
+
+        # Lido em bytes: uma linha cortada no meio de um caractere UTF-8 (as descrições
+        # são gravadas sem escapes) só falha na decodificação daquela linha
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line.decode('utf-8'))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    # Última linha incompleta (queda no meio da escrita): ignora
+                    continue
+
+                if entry['type'] == 'plan':
+                    plan = entry['shards']
+                    continue
+
+                state = shards.setdefault(entry['shard'], ShardState())
+                # Só aceita a página que continua do último cursor (evita duplicar páginas)
+                if entry['after'] != state.end_cursor or state.done:
+                    continue
+                state.nodes.extend(entry['nodes'])
+                state.end_cursor = entry['endCursor']
+                state.done = not entry['hasNextPage']
+
+        return plan, shards
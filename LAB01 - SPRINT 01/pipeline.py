@@ -0,0 +1,91 @@
+import csv
+
+from repository_models import RECORD_FIELDS, RepositoryRecord
+
+# Colunas do CSV, na mesma ordem dos campos dos registros gerados por process_data
+CSV_FIELDNAMES = list(RECORD_FIELDS)
+
+
+class CsvSink:
+    """
+    Escreve os registros no CSV página a página (com flush), então os dados
+    aparecem em disco logo após a primeira página coletada. Aceita RepositoryRecord
+    (colunas de CSV_FIELDNAMES) ou dicts com as chaves de `fieldnames`.
+    """
+    def __init__(self, filename='github_repositories_data.csv', fieldnames=CSV_FIELDNAMES):
+        self.filename = filename
+        self.fieldnames = fieldnames
+        self.file = open(filename, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(fieldnames)
+        self.count = 0
+
+    def row(self, record):
+        if isinstance(record, RepositoryRecord):
+            return record.as_row()
+        return [record.get(field) for field in self.fieldnames]
+
+    def write_page(self, records):
+        self.writer.writerows(self.row(record) for record in records)
+        self.file.flush()
+        self.count += len(records)
+
+    def close(self):
+        self.file.close()
+
+
+# Conversão das colunas numéricas ao reler o CSV (as demais são texto)
+CSV_CONVERTERS = {
+    'stars': int, 'age_days': int, 'merged_prs': int, 'total_releases': int, 'days_since_update': int,
+    'total_issues': int, 'closed_issues': int, 'closed_issues_ratio': float,
+}
+
+
+def read_csv_pages(filename='github_repositories_data.csv', page_size=1000):
+    """
+    Relê o CSV gravado pela coleta como páginas de RepositoryRecord, para as etapas
+    de análise e relatório rodarem separadas da coleta (sem rede e sem token)
+    """
+    with open(filename, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        columns = {field: header.index(field) for field in CSV_FIELDNAMES if field in header}
+        page = []
+        for row in reader:
+            values = {field: CSV_CONVERTERS.get(field, str)(row[index]) for field, index in columns.items()}
+            page.append(RepositoryRecord(
+                values['name'], values['owner'], values['stars'], values['age_days'], values['merged_prs'],
+                values['total_releases'], values['days_since_update'], values['primary_language'],
+                values['total_issues'], values['closed_issues'], values['closed_issues_ratio'],
+                has_url=bool(values.get('url')),
+                description=values.get('description') or None
+            ))
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+
+def run_pipeline(pages, sinks, metrics=None):
+    """
+    Consome o gerador de páginas de registros, entregando cada página a todos os sinks.
+    Nenhuma página fica em memória depois de entregue. Com `metrics`, cada escrita
+    vira um span `sink_write` com o nome do sink. Sinks transacionais (com commit())
+    só são confirmados depois que o gerador termina; se ele falhar ou for interrompido,
+    close() roda sem o commit.
+    """
+    try:
+        for records in pages:
+            for sink in sinks:
+                if metrics is None:
+                    sink.write_page(records)
+                    continue
+                with metrics.span('sink_write', sink=type(sink).__name__):
+                    sink.write_page(records)
+        for sink in sinks:
+            if hasattr(sink, 'commit'):
+                sink.commit()
+    finally:
+        for sink in sinks:
+            sink.close()
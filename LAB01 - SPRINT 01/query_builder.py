@@ -0,0 +1,169 @@
+from functools import lru_cache
+
+# Seleção GraphQL de cada campo de repositório
+FIELD_SELECTIONS = {
+    'name': 'name',
+    'owner': 'owner { login }',
+    'stargazerCount': 'stargazerCount',
+    'createdAt': 'createdAt',
+    'updatedAt': 'updatedAt',
+    'pushedAt': 'pushedAt',
+    'primaryLanguage': 'primaryLanguage { name }',
+    'pullRequests': 'pullRequests(states: MERGED) { totalCount }',
+    'releases': 'releases { totalCount }',
+    'issues': 'issues { totalCount }',
+    'closedIssues': 'closedIssues: issues(states: CLOSED) { totalCount }',
+    'url': 'url',
+    'description': 'description',
+}
+
+# Campos sempre pedidos (identificam o repositório e ordenam a busca)
+BASE_FIELDS = ('name', 'owner', 'stargazerCount')
+
+# Campos de texto livre: não entram em nenhuma RQ, só no CSV
+TEXT_FIELDS = ('url', 'description')
+
+# Campos que cada RQ precisa
+RQ_FIELDS = {
+    'RQ01': ('createdAt',),
+    'RQ02': ('pullRequests',),
+    'RQ03': ('releases',),
+    'RQ04': ('updatedAt', 'pushedAt'),
+    'RQ05': ('primaryLanguage',),
+    'RQ06': ('issues', 'closedIssues'),
+    'RQ07': ('primaryLanguage', 'pullRequests', 'releases', 'updatedAt'),
+}
+
+
+def build_repository_fields(rqs=None, include_text=True, extra=()):
+    """
+    Monta o bloco de campos do repositório só com o que as RQs pedidas usam
+    (todas por padrão), na ordem do catálogo
+    """
+    wanted = set(BASE_FIELDS) | set(extra)
+    for rq in rqs or RQ_FIELDS:
+        wanted.update(RQ_FIELDS[rq])
+    if include_text:
+        wanted.update(TEXT_FIELDS)
+
+    lines = [FIELD_SELECTIONS[field] for field in FIELD_SELECTIONS if field in wanted]
+    return '\n' + '\n'.join(f"                {line}" for line in lines) + '\n'
+
+
+# Todos os campos usados pelas RQs e pelo CSV
+REPOSITORY_FIELDS = build_repository_fields()
+
+# Campos baratos usados pelo modo incremental para detectar o que mudou
+CHANGE_DETECTION_FIELDS = build_repository_fields(rqs=[], include_text=False, extra=('updatedAt', 'pushedAt'))
+
+
+@lru_cache(maxsize=None)
+def build_search_document(fields=REPOSITORY_FIELDS):
+    """
+    Documento estático da busca: cursor, tamanho da página e filtro vêm nas variáveis
+    $after, $first e $q, então o texto é montado uma única vez por conjunto de campos
+    """
+    return f"""
+        query SearchRepositories($q: String!, $first: Int!, $after: String) {{
+          search(query: $q, type: REPOSITORY, first: $first, after: $after) {{
+            pageInfo {{
+              endCursor
+              hasNextPage
+            }}
+            nodes {{
+              ... on Repository {{{fields}              }}
+            }}
+          }}
+        }}
+        """
+
+
+COUNT_DOCUMENT = """
+        query CountRepositories($q: String!) {
+          search(query: $q, type: REPOSITORY, first: 1) {
+            repositoryCount
+            nodes {
+              ... on Repository {
+                stargazerCount
+              }
+            }
+          }
+        }
+        """
+
+
+@lru_cache(maxsize=None)
+def build_repository_batch_document(size, fields=REPOSITORY_FIELDS):
+    """
+    Documento com `size` blocos `repository(owner:, name:)` com alias (r0, r1, ...),
+    parametrizados pelas variáveis $o0/$n0, $o1/$n1, ...
+    """
+    params = ', '.join(f"$o{i}: String!, $n{i}: String!" for i in range(size))
+    blocks = '\n'.join(
+        f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepositoryFields }}" for i in range(size)
+    )
+    return (
+        f"query RepositoryBatch({params}) {{\n{blocks}\n}}\n"
+        f"fragment RepositoryFields on Repository {{{fields}}}\n"
+    )
+
+
+def repository_batch_variables(names):
+    """
+    Variáveis de build_repository_batch_document para uma lista de "owner/name"
+    """
+    variables = {}
+    for i, full_name in enumerate(names):
+        owner, name = full_name.split('/', 1)
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+    return variables
+
+
+# Conexões aninhadas do enriquecimento: os K itens mais recentes de cada repositório
+ENRICHMENT_CONNECTIONS = {
+    'releases': (
+        "releases(first: {first}, after: {after}, orderBy: {{field: CREATED_AT, direction: DESC}}) "
+        "{{ pageInfo {{ hasNextPage endCursor }} nodes {{ createdAt }} }}"
+    ),
+    'mergedPullRequests': (
+        "mergedPullRequests: pullRequests(states: MERGED, first: {first}, after: {after}, "
+        "orderBy: {{field: CREATED_AT, direction: DESC}}) "
+        "{{ pageInfo {{ hasNextPage endCursor }} nodes {{ createdAt mergedAt }} }}"
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def build_enrichment_document(size, connections=tuple(ENRICHMENT_CONNECTIONS)):
+    """
+    Documento com `size` repositórios (r0, r1, ...) e uma página de cada conexão pedida.
+    Variáveis: $oN/$nN (repositório), $first_<conexão> (tamanho da página, compartilhado)
+    e $after_<conexão>_N (cursor de cada repositório; null na primeira página)
+    """
+    params = [f"$o{i}: String!, $n{i}: String!" for i in range(size)]
+    params += [f"$first_{connection}: Int!" for connection in connections]
+    params += [f"$after_{connection}_{i}: String" for connection in connections for i in range(size)]
+
+    blocks = []
+    for i in range(size):
+        selections = ' '.join(
+            ENRICHMENT_CONNECTIONS[connection].format(first=f"$first_{connection}", after=f"$after_{connection}_{i}")
+            for connection in connections
+        )
+        blocks.append(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ nameWithOwner {selections} }}")
+
+    return f"query RepositoryEnrichment({', '.join(params)}) {{\n" + '\n'.join(blocks) + "\n}\n"
+
+
+def enrichment_variables(names, page_sizes, cursors=None):
+    """
+    Variáveis de build_enrichment_document: `page_sizes` por conexão e, nas páginas
+    seguintes, `cursors[(conexão, índice)]` com o endCursor da página anterior
+    """
+    variables = repository_batch_variables(names)
+    for connection, first in page_sizes.items():
+        variables[f"first_{connection}"] = first
+        for i in range(len(names)):
+            variables[f"after_{connection}_{i}"] = (cursors or {}).get((connection, i))
+    return variables
@@ -0,0 +1,236 @@
+import statistics
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from query_builder import build_enrichment_document, enrichment_variables
+
+# A API devolve no máximo 100 itens por página de uma conexão
+MAX_CONNECTION_PAGE = 100
+
+# Custo (pontos de rateLimit) que se busca por requisição; lotes maiores arriscam timeout/limite de nós
+TARGET_QUERY_COST = 20
+
+ENRICHMENT_FIELDNAMES = [
+    'name', 'owner', 'releases_fetched', 'release_interval_median_days', 'releases_per_year',
+    'days_since_last_release', 'merged_prs_fetched', 'merge_latency_median_hours', 'merge_latency_p90_hours'
+]
+
+
+def parse_datetime(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def release_cadence(created_dates, current_date):
+    """
+    Cadência das releases: mediana do intervalo entre releases consecutivas (dias),
+    releases por ano na janela coletada e dias desde a última release
+    """
+    if not created_dates:
+        return {'release_interval_median_days': None, 'releases_per_year': 0, 'days_since_last_release': None}
+
+    dates = sorted(created_dates)
+    intervals = [(later - earlier).total_seconds() / 86400 for earlier, later in zip(dates, dates[1:])]
+    span_years = (current_date - dates[0]).days / 365.25
+
+    return {
+        'release_interval_median_days': round(statistics.median(intervals), 2) if intervals else None,
+        'releases_per_year': round(len(dates) / span_years, 2) if span_years > 0 else len(dates),
+        'days_since_last_release': (current_date - dates[-1]).days
+    }
+
+
+def merge_latency(pull_requests):
+    """
+    Latência de merge (horas entre createdAt e mergedAt): mediana e percentil 90
+    """
+    hours = sorted(
+        (parse_datetime(pr['mergedAt']) - parse_datetime(pr['createdAt'])).total_seconds() / 3600
+        for pr in pull_requests if pr.get('mergedAt')
+    )
+    if not hours:
+        return {'merge_latency_median_hours': None, 'merge_latency_p90_hours': None}
+
+    p90 = hours[min(len(hours) - 1, int(0.9 * len(hours)))]
+    return {
+        'merge_latency_median_hours': round(statistics.median(hours), 2),
+        'merge_latency_p90_hours': round(p90, 2)
+    }
+
+
+class AdaptiveBatchSize:
+    """
+    Tamanho do lote de repositórios por requisição, ajustado pelo custo observado:
+    cresce (no máximo dobrando) enquanto o custo por requisição fica abaixo do alvo
+    e cai pela metade quando uma requisição falha
+    """
+    def __init__(self, initial=10, minimum=1, maximum=50, target_cost=TARGET_QUERY_COST):
+        self.size = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_cost = target_cost
+        self.lock = threading.Lock()
+
+    def observe(self, batch_size, cost):
+        if not cost:
+            return
+        per_repository = cost / batch_size
+        with self.lock:
+            wanted = int(self.target_cost / per_repository)
+            self.size = max(self.minimum, min(self.maximum, wanted, self.size * 2))
+
+    def shrink(self):
+        with self.lock:
+            self.size = max(self.minimum, self.size // 2)
+
+
+class RepositoryEnricher:
+    """
+    Enriquecimento em lote: para cada repositório busca as últimas `releases` releases
+    e os últimos `pull_requests` PRs mergeados (createdAt/mergedAt) com blocos
+    `repository(owner:, name:)` com alias, paginando as conexões aninhadas quando
+    K passa de uma página, e calcula as métricas de cadência e latência
+    """
+    def __init__(self, scheduler, releases=20, pull_requests=50, batch_size=None, current_date=None):
+        self.scheduler = scheduler
+        self.limits = {'releases': releases, 'mergedPullRequests': pull_requests}
+        self.batch_size = batch_size or AdaptiveBatchSize()
+        self.current_date = current_date or datetime.now(timezone.utc)
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def _post(self, names, page_sizes, cursors=None):
+        document = build_enrichment_document(len(names), tuple(page_sizes))
+        data = self.scheduler.execute(document, enrichment_variables(names, page_sizes, cursors))
+        with self.lock:
+            self.requests += 1
+        return data
+
+    def fetch_batch(self, names):
+        """
+        Busca as conexões de um lote; devolve {"owner/name": {conexão: [nós]}} ou None se a requisição falhar
+        """
+        connections = [connection for connection, limit in self.limits.items() if limit > 0]
+        page_sizes = {connection: min(self.limits[connection], MAX_CONNECTION_PAGE) for connection in connections}
+
+        data = self._post(names, page_sizes)
+        if data is None:
+            return None
+        self.batch_size.observe(len(names), (data.get('rateLimit') or {}).get('cost'))
+
+        collected = {}
+        pending = {}
+        for i, full_name in enumerate(names):
+            repo = data.get(f"r{i}")
+            if not repo:
+                continue  # Repositório apagado/renomeado: alias null + erro NOT_FOUND na resposta parcial
+            collected[full_name] = {connection: repo[connection]['nodes'] for connection in connections}
+            for connection in connections:
+                self._queue_next_page(pending, connection, full_name, repo[connection], collected)
+
+        # Páginas seguintes, só para os repositórios/conexões que ainda não chegaram a K itens
+        while pending:
+            follow_ups = {}
+            for connection, entries in pending.items():
+                entry_names = [full_name for full_name, _ in entries]
+                cursors = {(connection, i): cursor for i, (_, cursor) in enumerate(entries)}
+                data = self._post(entry_names, {connection: MAX_CONNECTION_PAGE}, cursors)
+                if data is None:
+                    continue  # Fica com as páginas já coletadas
+                for i, full_name in enumerate(entry_names):
+                    page = (data.get(f"r{i}") or {}).get(connection)
+                    if page:
+                        collected[full_name][connection].extend(page['nodes'])
+                        self._queue_next_page(follow_ups, connection, full_name, page, collected)
+            pending = follow_ups
+
+        return collected
+
+    def _queue_next_page(self, pending, connection, full_name, page, collected):
+        nodes = collected[full_name][connection]
+        if page['pageInfo']['hasNextPage'] and len(nodes) < self.limits[connection]:
+            pending.setdefault(connection, []).append((full_name, page['pageInfo']['endCursor']))
+        else:
+            del nodes[self.limits[connection]:]
+
+    def build_record(self, full_name, connections):
+        owner, name = full_name.split('/', 1)
+        releases = connections.get('releases', [])
+        pull_requests = connections.get('mergedPullRequests', [])
+
+        record = {
+            'name': name,
+            'owner': owner,
+            'releases_fetched': len(releases),
+            'merged_prs_fetched': len(pull_requests)
+        }
+        record.update(release_cadence([parse_datetime(release['createdAt']) for release in releases],
+                                      self.current_date))
+        record.update(merge_latency(pull_requests))
+        return record
+
+    def enrich(self, names, max_workers=1):
+        """
+        Enriquece todos os repositórios ("owner/name"); lotes que falham voltam para a fila
+        e o tamanho do lote cai pela metade
+        """
+        queue = deque(names)
+        queue_lock = threading.Lock()
+
+        def next_batch():
+            with queue_lock:
+                size = min(self.batch_size.size, len(queue))
+                return [queue.popleft() for _ in range(size)]
+
+        def worker(_):
+            records = []
+            while True:
+                batch = next_batch()
+                if not batch:
+                    return records
+                collected = self.fetch_batch(batch)
+                if collected is None:
+                    if len(batch) > 1:
+                        self.batch_size.shrink()
+                        with queue_lock:
+                            queue.extendleft(reversed(batch))
+                    else:
+                        print(f"Não foi possível enriquecer {batch[0]}, seguindo sem ele.")
+                    continue
+                records.extend(self.build_record(full_name, connections)
+                               for full_name, connections in collected.items())
+                self.scheduler.record_repositories(len(collected))
+                print(f"Enriquecidos {len(collected)} repositórios (lote de {len(batch)})...")
+
+        records = []
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            for worker_records in executor.map(worker, range(max(max_workers, 1))):
+                records.extend(worker_records)
+        return records
+
+
+class NameSink:
+    """
+    Sink do pipeline que guarda só "owner/name" de cada registro, para o enriquecimento
+    """
+    def __init__(self):
+        self.names = []
+
+    def write_page(self, records):
+        self.names.extend(f"{record.owner}/{record.name}" for record in records)
+
+    def close(self):
+        pass
+
+
+def summarize_enrichment(records):
+    """
+    Medianas entre repositórios das métricas de cadência e latência
+    """
+    summary = {'repositories': len(records)}
+    for field in ('release_interval_median_days', 'releases_per_year', 'merge_latency_median_hours',
+                  'merge_latency_p90_hours'):
+        values = [record[field] for record in records if record[field] is not None]
+        summary[field] = statistics.median(values) if values else None
+    return summary
@@ -0,0 +1,144 @@
+import sys
+from typing import List, Optional
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Campos de um repositório processado, na ordem das colunas do CSV
+RECORD_FIELDS = (
+    'name', 'owner', 'stars', 'age_days', 'merged_prs', 'total_releases', 'days_since_update',
+    'primary_language', 'total_issues', 'closed_issues', 'closed_issues_ratio', 'url', 'description'
+)
+
+
+class RepositoryRecord:
+    """
+    Repositório processado (uma linha do CSV). Com __slots__ não há um dict por
+    repositório; dono e linguagem são internados (uma única string por valor distinto)
+    e a url não é guardada: é montada sob demanda a partir de owner/name, quando o
+    campo veio na query. O acesso por chave (record['stars']) continua funcionando.
+    """
+    __slots__ = ('name', 'owner', 'stars', 'age_days', 'merged_prs', 'total_releases', 'days_since_update',
+                 'primary_language', 'total_issues', 'closed_issues', 'closed_issues_ratio', 'description',
+                 'has_url')
+
+    def __init__(self, name, owner, stars, age_days, merged_prs, total_releases, days_since_update,
+                 primary_language, total_issues, closed_issues, closed_issues_ratio, has_url=True,
+                 description=None):
+        self.name = name
+        self.owner = sys.intern(owner)
+        self.stars = stars
+        self.age_days = age_days
+        self.merged_prs = merged_prs
+        self.total_releases = total_releases
+        self.days_since_update = days_since_update
+        self.primary_language = sys.intern(primary_language)
+        self.total_issues = total_issues
+        self.closed_issues = closed_issues
+        self.closed_issues_ratio = closed_issues_ratio
+        self.has_url = has_url
+        self.description = description
+
+    @property
+    def url(self):
+        return f"https://github.com/{self.owner}/{self.name}" if self.has_url else None
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __eq__(self, other):
+        if not isinstance(other, RepositoryRecord):
+            return NotImplemented
+        return self.as_row() == other.as_row()
+
+    def __repr__(self):
+        return f"RepositoryRecord({self.owner}/{self.name}, stars={self.stars})"
+
+    def as_row(self):
+        """
+        Valores na ordem de RECORD_FIELDS (linha do CSV)
+        """
+        return (self.name, self.owner, self.stars, self.age_days, self.merged_prs, self.total_releases,
+                self.days_since_update, self.primary_language, self.total_issues, self.closed_issues,
+                self.closed_issues_ratio, self.url, self.description)
+
+    def to_dict(self):
+        return dict(zip(RECORD_FIELDS, self.as_row()))
+
+
+if msgspec is not None:
+    class GraphQLStruct(msgspec.Struct, gc=False):
+        """
+        Base dos modelos tipados: instâncias com slots (sem __dict__ nem rastreio do GC)
+        que aceitam o mesmo acesso por chave dos dicts do GraphQL (repo['owner']['login'],
+        repo.get('url'), 'errors' in data), então o resto do código não muda
+        """
+        def __getitem__(self, key):
+            return getattr(self, key)
+
+        def get(self, key, default=None):
+            return getattr(self, key, default)
+
+        def __contains__(self, key):
+            return getattr(self, key, None) is not None
+
+        def keys(self):
+            return self.__struct_fields__
+
+    class Owner(GraphQLStruct, gc=False):
+        login: str
+
+    class Language(GraphQLStruct, gc=False):
+        name: str
+
+    class TotalCount(GraphQLStruct, gc=False):
+        totalCount: int
+
+    class RepositoryNode(GraphQLStruct, gc=False):
+        """
+        Nó de repositório da busca. Os campos fora da projeção da query ficam None.
+        """
+        name: str
+        owner: Owner
+        stargazerCount: int
+        createdAt: Optional[str] = None
+        updatedAt: Optional[str] = None
+        pushedAt: Optional[str] = None
+        primaryLanguage: Optional[Language] = None
+        pullRequests: Optional[TotalCount] = None
+        releases: Optional[TotalCount] = None
+        issues: Optional[TotalCount] = None
+        closedIssues: Optional[TotalCount] = None
+        url: Optional[str] = None
+        description: Optional[str] = None
+
+    class PageInfo(GraphQLStruct, gc=False):
+        endCursor: Optional[str] = None
+        hasNextPage: bool = False
+
+    class SearchResults(GraphQLStruct, gc=False):
+        pageInfo: PageInfo
+        nodes: List[RepositoryNode]
+
+    class RateLimit(GraphQLStruct, gc=False):
+        cost: int
+        remaining: int
+        resetAt: str
+
+    class SearchData(GraphQLStruct, gc=False):
+        search: SearchResults
+        rateLimit: Optional[RateLimit] = None
+
+    class SearchResponse(GraphQLStruct):
+        """
+        Envelope da resposta do documento SearchRepositories
+        """
+        data: Optional[SearchData] = None
+        errors: Optional[list] = None
+
+    SEARCH_RESPONSE = SearchResponse
+else:
+    # Sem msgspec as páginas continuam sendo dicts
+    SEARCH_RESPONSE = None
@@ -0,0 +1,383 @@
+import random
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+import json_codec
+from graphql_client import TransportError
+from instrumentation import Metrics
+
+RATE_LIMIT_FIELDS = "rateLimit { cost remaining resetAt }"
+# 403 só é refeito quando _is_rate_limited reconhece o limite (permissão negada não adianta repetir)
+RETRY_STATUS = (429, 502, 503, 504)
+
+# Limite secundário do GitHub para GraphQL: no máximo 2000 pontos por minuto
+DEFAULT_POINTS_PER_SECOND = 2000 / 60
+
+# Abaixo deste saldo o scheduler passa a espaçar as requisições até o reset
+LOW_BUDGET_POINTS = 500
+
+
+def add_rate_limit_field(query):
+    """
+    Adiciona o bloco rateLimit { cost remaining resetAt } no nível raiz da query
+    """
+    if 'rateLimit' in query:
+        return query
+
+    # Logo após a abertura da operação (antes de fragments que venham depois dela)
+    start = query.index('{') + 1
+    return query[:start] + f"\n          {RATE_LIMIT_FIELDS}" + query[start:]
+
+
+def parse_reset_at(value):
+    """
+    Converte o resetAt (ISO 8601) em timestamp epoch
+    """
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def parse_retry_after(value):
+    """
+    Segundos de espera do Retry-After, em segundos ("120") ou data HTTP
+    ("Wed, 21 Oct 2015 07:28:00 GMT"); None se o valor não for reconhecido
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe: libera `rate` pontos por segundo com rajadas de até `capacity`
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def set_rate(self, rate):
+        with self.lock:
+            self._refill()
+            self.rate = max(rate, 0.01)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def mask_token(token):
+    """
+    Identificação do token para logs, sem expor o segredo
+    """
+    return f"...{str(token)[-4:]}"
+
+
+class TokenState:
+    """
+    Orçamento de uma credencial: saldo de pontos e reset do limite primário, pausa pedida
+    pela API (Retry-After) e o próprio token bucket, já que o limite secundário também é por token
+    """
+    def __init__(self, token, index, points_per_second, burst):
+        self.token = token
+        self.index = index
+        self.bucket = TokenBucket(points_per_second, burst)
+        self.remaining = None
+        self.reset_at = None
+        self.blocked_until = 0
+        self.last_cost = 1
+        self.in_flight = 0
+        self.points_spent = 0
+        self.requests_made = 0
+
+    def exhausted(self):
+        return self.remaining is not None and self.remaining < self.last_cost and self.reset_at is not None
+
+    def ready_at(self):
+        """
+        Momento (epoch) a partir do qual o token pode voltar a ser usado
+        """
+        ready = self.blocked_until
+        if self.exhausted():
+            ready = max(ready, self.reset_at + 1)
+        return ready
+
+
+class TokenPool:
+    """
+    Distribui as requisições entre vários tokens: cada uma vai para o token disponível
+    com menos requisições em andamento (e, no empate, o maior saldo), então shards
+    paralelos se espalham pelas credenciais. Tokens sem saldo ou pausados ficam fora
+    da rotação até o reset; se todos estiverem assim, espera o primeiro liberar.
+    """
+    def __init__(self, tokens, points_per_second=DEFAULT_POINTS_PER_SECOND, burst=100):
+        if not tokens:
+            raise ValueError("O pool precisa de pelo menos um token")
+        self.states = [TokenState(token, index, points_per_second, burst) for index, token in enumerate(tokens)]
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.states)
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.time()
+                ready = [state for state in self.states if state.ready_at() <= now]
+                if ready:
+                    state = min(ready, key=lambda state: (state.in_flight, -(state.remaining or 0)))
+                    if state.exhausted():
+                        # Já passou do reset: o saldo volta a ser desconhecido até a próxima resposta
+                        state.remaining = None
+                    state.in_flight += 1
+                    return state
+                wait = min(state.ready_at() for state in self.states) - now
+
+            if len(self.states) > 1:
+                print(f"Todos os {len(self.states)} tokens sem orçamento, aguardando {wait:.0f}s...")
+            else:
+                print(f"Orçamento de pontos esgotado, aguardando {wait:.0f}s até o reset...")
+            time.sleep(wait)
+
+    def release(self, state):
+        with self.lock:
+            state.in_flight -= 1
+
+    def has_alternative(self, current):
+        """
+        Se existe outro token utilizável agora (para trocar em vez de esperar)
+        """
+        now = time.time()
+        with self.lock:
+            return any(state is not current and state.ready_at() <= now for state in self.states)
+
+
+class RequestScheduler:
+    """
+    Camada entre o analisador e a API: controla o orçamento de pontos do GraphQL,
+    espaça as requisições com um token bucket e refaz a mesma requisição (mesmo cursor)
+    com backoff exponencial + jitter quando a API responde com limite de taxa ou erro temporário.
+    Com vários `tokens`, cada um tem o seu orçamento e o seu token bucket (TokenPool) e a
+    vazão total cresce com o número de credenciais.
+    """
+    def __init__(self, client, points_per_second=DEFAULT_POINTS_PER_SECOND,
+                 burst=100, max_retries=8, base_delay=1.0, max_delay=120.0, cache=None, metrics=None,
+                 tokens=None):
+        self.client = client
+        self.cache = cache
+        self.metrics = metrics or Metrics()
+        self.max_points_per_second = points_per_second
+        self.pool = TokenPool(tokens or [client.token], points_per_second, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.lock = threading.Lock()
+        self.points_spent = 0
+        self.requests_made = 0
+        self.retries = 0
+        self.repositories_fetched = 0
+
+    def execute(self, query, variables=None, response_type=None):
+        """
+        Executa a query e devolve o campo 'data' (ou None se a falha não for recuperável).
+        Com `response_type` (modelo de repository_models) a resposta é decodificada direto
+        nos modelos tipados quando o msgspec está instalado.
+        """
+        # Respostas em cache não passam pelo token bucket nem gastam pontos
+        if self.cache:
+            cached = self.cache.get(query, variables)
+            if cached is not None:
+                self.metrics.inc('graphql_cache_hits_total')
+                return cached
+            if self.cache.offline:
+                print("Resposta não encontrada no cache (modo offline), nenhuma requisição feita.")
+                return None
+
+        original_query = query
+        query = add_rate_limit_field(query)
+
+        for attempt in range(self.max_retries + 1):
+            state = self.pool.acquire()
+            try:
+                data, retry = self._attempt(state, attempt, query, variables, response_type)
+            finally:
+                self.pool.release(state)
+            if retry:
+                continue
+            if data is not None and self.cache:
+                self.cache.put(original_query, variables, data)
+            return data
+
+        print(f"Número máximo de tentativas ({self.max_retries}) atingido, desistindo da requisição.")
+        return None
+
+    def _attempt(self, state, attempt, query, variables, response_type):
+        """
+        Uma tentativa com o token `state`; devolve (data, refazer)
+        """
+        state.bucket.acquire(state.last_cost)
+
+        try:
+            with self.metrics.span('graphql_request'):
+                response = self.client.post(query, variables, token=state.token)
+        except TransportError as e:
+            self.metrics.inc('graphql_transport_errors_total')
+            self._backoff(attempt, f"Erro de conexão: {e}")
+            return None, True
+
+        with self.lock:
+            self.requests_made += 1
+            state.requests_made += 1
+        self.metrics.inc('graphql_requests_total', status=response.status_code)
+        # O transporte já descomprimiu o corpo (gzip): são os bytes do JSON, não os da rede
+        self.metrics.inc('graphql_response_decompressed_bytes_total', len(response.content))
+
+        if self._is_rate_limited(response):
+            self._backoff(attempt, f"Resposta {response.status_code} da API", response.headers, state)
+            return None, True
+        if response.status_code in RETRY_STATUS:
+            self._backoff(attempt, f"Resposta {response.status_code} da API", response.headers)
+            return None, True
+
+        if response.status_code != 200:
+            print(f"Erro na requisição: {response.status_code}")
+            print(response.text)
+            return None, False
+
+        headers = response.headers
+        with self.metrics.span('graphql_decode'):
+            data = self._decode(response.content, response_type)
+        # Daqui em diante só os objetos decodificados seguem; o corpo bruto é liberado
+        del response
+        if data is None:
+            self.metrics.inc('graphql_decode_errors_total')
+            self._backoff(attempt, "Resposta 200 com corpo JSON inválido")
+            return None, True
+
+        if 'errors' in data:
+            if any(error.get('type') == 'RATE_LIMITED' for error in data['errors']):
+                self._backoff(attempt, "Limite de pontos do GraphQL atingido", headers, state)
+                return None, True
+            # Resposta parcial: a API devolve `data` com null nos aliases que não existem mais
+            # (repositório apagado/renomeado) e um erro NOT_FOUND para cada um
+            if data.get('data') is None or any(error.get('type') != 'NOT_FOUND' for error in data['errors']):
+                print(f"Erro na query: {data['errors']}")
+                return None, False
+
+        self._update_budget(state, data['data'].get('rateLimit'))
+        return data['data'], False
+
+    def _decode(self, content, response_type=None):
+        """
+        Corpo decodificado, ou None se ele não for JSON válido (truncado, página HTML de erro)
+        """
+        try:
+            data = json_codec.decode_typed(content, response_type)
+            if data is None:
+                data = json_codec.loads(content)
+        except json_codec.DecodeError:
+            return None
+        return data
+
+    def record_repositories(self, count):
+        with self.lock:
+            self.repositories_fetched += count
+
+    def _is_rate_limited(self, response):
+        if response.status_code not in (403, 429):
+            return False
+        if response.headers.get('x-ratelimit-remaining') == '0' or 'Retry-After' in response.headers:
+            return True
+        text = response.text.lower()
+        return 'rate limit' in text or 'abuse' in text
+
+    def _update_budget(self, state, rate_limit):
+        if not rate_limit:
+            return
+
+        with self.lock:
+            state.last_cost = max(rate_limit['cost'], 1)
+            self.metrics.inc('graphql_cost_points_total', rate_limit['cost'], token=state.index)
+            self.points_spent += rate_limit['cost']
+            state.points_spent += rate_limit['cost']
+            state.remaining = rate_limit['remaining']
+            state.reset_at = parse_reset_at(rate_limit['resetAt'])
+            seconds_to_reset = max(state.reset_at - time.time(), 1)
+
+        # Vai no limite secundário enquanto sobra orçamento; perto do fim, distribui
+        # os pontos restantes até o reset para não esbarrar no limite primário
+        if state.remaining > LOW_BUDGET_POINTS:
+            state.bucket.set_rate(self.max_points_per_second)
+        else:
+            state.bucket.set_rate(min(self.max_points_per_second, state.remaining / seconds_to_reset))
+
+    def _backoff(self, attempt, reason, headers=None, state=None):
+        """
+        Espera antes de refazer a requisição. Quando o limite é do token (`state`), ele fica
+        pausado pelo mesmo tempo e, havendo outro token livre no pool, a nova tentativa
+        sai imediatamente por ele.
+        """
+        with self.lock:
+            self.retries += 1
+        self.metrics.inc('graphql_retries_total')
+
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = random.uniform(delay / 2, delay)  # jitter
+
+        if headers is not None:
+            retry_after = parse_retry_after(headers['Retry-After']) if 'Retry-After' in headers else None
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            elif headers.get('x-ratelimit-remaining') == '0' and 'x-ratelimit-reset' in headers:
+                delay = max(delay, float(headers['x-ratelimit-reset']) - time.time() + 1)
+
+        if state is not None:
+            state.blocked_until = time.time() + delay
+            if self.pool.has_alternative(state):
+                print(f"{reason}; token {mask_token(state.token)} pausado por {delay:.1f}s, "
+                      f"trocando de token (tentativa {attempt + 1}/{self.max_retries})")
+                return
+
+        print(f"{reason}; nova tentativa em {delay:.1f}s (tentativa {attempt + 1}/{self.max_retries})")
+        time.sleep(delay)
+
+    def report(self):
+        """
+        Resumo do consumo de pontos da coleta
+        """
+        per_repo = self.points_spent / self.repositories_fetched if self.repositories_fetched else 0
+        print(f"\nRequisições: {self.requests_made} (retentativas: {self.retries})")
+        print(f"Pontos gastos: {self.points_spent} ({per_repo:.3f} por repositório)")
+        print(f"Decodificação JSON: {json_codec.BACKEND}")
+        states = self.pool.states
+        if len(states) == 1:
+            if states[0].remaining is not None:
+                print(f"Pontos restantes: {states[0].remaining}")
+        else:
+            for state in states:
+                remaining = state.remaining if state.remaining is not None else '?'
+                print(f"  Token {mask_token(state.token)}: {state.requests_made} requisições, "
+                      f"{state.points_spent} pontos, restantes: {remaining}")
+        if self.cache:
+            self.cache.report()
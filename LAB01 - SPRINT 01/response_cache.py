@@ -0,0 +1,153 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+import json_codec
+
+ACCESS_FLUSH_SIZE = 256  # acessos acumulados antes de gravar os last_access no SQLite
+EXPIRE_INTERVAL = 60.0  # segundos entre varreduras das respostas expiradas
+
+
+def make_cache_key(query, variables=None):
+    """
+    Chave da resposta: hash da query normalizada (espaços colapsados) + variáveis.
+    O cursor entra na chave por estar na query (after: "...") ou nas variáveis.
+    """
+    normalized = ' '.join(query.split())
+    payload = json.dumps({'query': normalized, 'variables': variables or {}}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Cache persistente (SQLite) das respostas do GraphQL, com TTL e despejo LRU quando
+    o tamanho total passa de `max_bytes`. Os corpos ficam comprimidos com zlib.
+    O tamanho total é mantido em memória (somado uma vez na abertura) e os acessos
+    dos acertos são gravados em lote, então nem o get nem o put varrem a tabela.
+    """
+    def __init__(self, path='github_response_cache.sqlite', ttl=24 * 3600, max_bytes=500 * 1024 * 1024,
+                 offline=False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.connection.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses (created_at)')
+        self.connection.commit()
+
+        self.total = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        self.pending_access = {}  # key -> último acesso ainda não gravado
+        self.last_expire = 0.0
+
+    def get(self, query, variables=None):
+        """
+        Devolve o campo 'data' guardado para a query, ou None se não houver (ou tiver expirado)
+        """
+        key = make_cache_key(query, variables)
+        now = time.time()
+
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT body, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+            # No modo offline (cache-only) o TTL é ignorado: qualquer resposta guardada serve
+            if row is None or (not self.offline and self.ttl is not None and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+
+            self.pending_access[key] = now
+            if len(self.pending_access) >= ACCESS_FLUSH_SIZE:
+                self._flush_access()
+                self.connection.commit()
+            self.hits += 1
+
+        return json_codec.loads(zlib.decompress(row[0]))
+
+    def put(self, query, variables, data):
+        key = make_cache_key(query, variables)
+        body = zlib.compress(json_codec.dumps(data).encode('utf-8'))
+        now = time.time()
+
+        with self.lock:
+            previous = self.connection.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self.pending_access.pop(key, None)
+            self.connection.execute(
+                'INSERT OR REPLACE INTO responses (key, body, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)',
+                (key, body, len(body), now, now)
+            )
+            self.total += len(body) - (previous[0] if previous else 0)
+            self._evict()
+            self.connection.commit()
+
+    def _flush_access(self):
+        if self.pending_access:
+            self.connection.executemany('UPDATE responses SET last_access = ? WHERE key = ?',
+                                        [(now, key) for key, now in self.pending_access.items()])
+            self.pending_access.clear()
+
+    def _evict(self):
+        """
+        Remove as respostas expiradas (no máximo a cada EXPIRE_INTERVAL) e, se ainda
+        passar do limite, as menos usadas recentemente
+        """
+        now = time.time()
+        if self.ttl is not None and not self.offline and now - self.last_expire >= EXPIRE_INTERVAL:
+            self.last_expire = now
+            cutoff = now - self.ttl
+            expired = self.connection.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM responses WHERE created_at < ?', (cutoff,)
+            ).fetchone()[0]
+            if expired:
+                self.connection.execute('DELETE FROM responses WHERE created_at < ?', (cutoff,))
+                self.total -= expired
+
+        if self.total <= self.max_bytes:
+            return
+
+        # A ordem LRU precisa dos acessos ainda em memória
+        self._flush_access()
+        excess = self.total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in self.connection.execute('SELECT key, size FROM responses ORDER BY last_access'):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self.connection.executemany('DELETE FROM responses WHERE key = ?', victims)
+        self.total -= freed
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute('DELETE FROM responses')
+            self.connection.commit()
+            self.total = 0
+            self.pending_access.clear()
+
+    def close(self):
+        with self.lock:
+            self._flush_access()
+            self.connection.commit()
+        self.connection.close()
+
+    def report(self):
+        print(f"Cache de respostas: {self.hits} acertos, {self.misses} faltas")
@@ -0,0 +1,269 @@
+import math
+import statistics
+from array import array
+from bisect import bisect_right
+from collections import Counter, defaultdict
+
+# Histograma de idade do gráfico ASCII (o último bin é "15+")
+AGE_BIN_EDGES = [0, 2, 4, 6, 8, 10, 15]
+AGE_BIN_LABELS = ["0-2", "2-4", "4-6", "6-8", "8-10", "10-15", "15+"]
+
+# Métricas comparadas por linguagem na RQ07
+LANGUAGE_METRICS = ('merged_prs', 'total_releases', 'days_since_update')
+
+
+class P2Quantile:
+    """
+    Estimador P² (Jain & Chlamtac, 1985): acompanha um quantil com 5 marcadores,
+    memória constante e uma atualização O(1) por valor
+    """
+    def __init__(self, p=0.5):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        q = self.heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        # Encontra a célula k do novo valor e ajusta os extremos
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect_right(q, x) - 1
+            k = min(k, 3)
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ajusta os marcadores do meio com a fórmula parabólica (ou linear)
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def value(self):
+        if not self.heights:
+            return 0
+        if len(self.heights) < 5:
+            return statistics.median(self.heights)
+        return self.heights[2]
+
+    def count_at_or_below(self):
+        """
+        Número aproximado de valores <= quantil (posição do marcador do meio)
+        """
+        if len(self.heights) < 5:
+            median = self.value()
+            return sum(1 for x in self.heights if x <= median)
+        return self.positions[2]
+
+
+class RunningStats:
+    """
+    Média e variância de Welford, mínimo, máximo e mediana em uma única passada.
+    No modo exato os valores ficam num array tipado (mediana idêntica a
+    statistics.median); senão a mediana vem do estimador P² com memória constante.
+    """
+    def __init__(self, exact=True):
+        self.exact = exact
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.values = array('d') if exact else None
+        self.p2 = None if exact else P2Quantile(0.5)
+        self._sorted = None
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+        if self.exact:
+            self.values.append(x)
+            self._sorted = None
+        else:
+            self.p2.add(x)
+
+    def median(self):
+        if self.exact:
+            return statistics.median(self._sorted_values()) if self.count else 0
+        return self.p2.value()
+
+    def count_above(self, threshold):
+        """
+        Quantos valores são maiores que `threshold` (exato no modo exato;
+        no modo P² só é suportado para a própria mediana)
+        """
+        if self.exact:
+            return self.count - bisect_right(self._sorted_values(), threshold)
+        return self.count - self.p2.count_at_or_below()
+
+    def _sorted_values(self):
+        if self._sorted is None:
+            self._sorted = sorted(self.values)
+        return self._sorted
+
+    def to_dict(self):
+        """
+        Mesmo formato de GitHubRepositoryAnalyzer.calculate_stats
+        """
+        if not self.count:
+            return {'mean': 0, 'median': 0, 'std': 0, 'min': 0, 'max': 0}
+
+        return {
+            'mean': self.mean,
+            'median': self.median(),
+            'std': math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0,
+            'min': self.min,
+            'max': self.max
+        }
+
+
+class RQSummary:
+    """
+    Resultado único das análises: lido pelo console (analyze_rq*), pelos gráficos ASCII e pelo relatório.
+    Os dicionários de estatísticas seguem o formato de calculate_stats.
+    """
+    def __init__(self, total, age_stats, mature_repos, pr_stats, prs_above_median, release_stats,
+                 repos_with_releases, update_stats, recently_updated, language_counts, repos_with_issues,
+                 issue_ratio_stats, high_closure_rate, age_histogram, language_groups):
+        self.total = total
+        self.age_stats = age_stats
+        self.mature_repos = mature_repos
+        self.pr_stats = pr_stats
+        self.prs_above_median = prs_above_median
+        self.release_stats = release_stats
+        self.repos_with_releases = repos_with_releases
+        self.update_stats = update_stats
+        self.recently_updated = recently_updated
+        self.language_counts = language_counts
+        self.repos_with_issues = repos_with_issues
+        self.issue_ratio_stats = issue_ratio_stats
+        self.high_closure_rate = high_closure_rate
+        self.age_histogram = age_histogram
+        self.language_groups = language_groups
+
+    def __len__(self):
+        return self.total
+
+
+class RQAggregator:
+    """
+    Sink do pipeline que calcula todas as métricas das RQs numa única passada pelos registros.
+    summary() devolve o RQSummary com os resultados.
+    """
+    def __init__(self, exact=True):
+        self.exact = exact
+        self.count = 0
+
+        self.age_years = RunningStats(exact)
+        self.merged_prs = RunningStats(exact)
+        self.total_releases = RunningStats(exact)
+        self.days_since_update = RunningStats(exact)
+        self.closed_issues_ratio = RunningStats(exact)
+
+        self.mature_repos = 0
+        self.repos_with_releases = 0
+        self.recently_updated = 0
+        self.high_closure_rate = 0
+        self.age_bins = [0] * len(AGE_BIN_LABELS)
+
+        self.language_counts = Counter()
+        self.language_groups = defaultdict(lambda: {metric: RunningStats(exact) for metric in LANGUAGE_METRICS})
+
+    def add(self, record):
+        self.count += 1
+
+        # RQ01
+        age_years = record.age_days / 365.25
+        self.age_years.add(age_years)
+        if record.age_days > 365.25 * 5:
+            self.mature_repos += 1
+        bin_index = bisect_right(AGE_BIN_EDGES, age_years) - 1
+        if bin_index >= 0:
+            self.age_bins[bin_index] += 1
+
+        # RQ02-RQ04
+        self.merged_prs.add(record.merged_prs)
+        self.total_releases.add(record.total_releases)
+        if record.total_releases > 0:
+            self.repos_with_releases += 1
+        self.days_since_update.add(record.days_since_update)
+        if record.days_since_update <= 30:
+            self.recently_updated += 1
+
+        # RQ05
+        language = record.primary_language
+        self.language_counts[language] += 1
+
+        # RQ06 (só repositórios com issues)
+        if record.total_issues > 0:
+            self.closed_issues_ratio.add(record.closed_issues_ratio)
+            if record.closed_issues_ratio > 80:
+                self.high_closure_rate += 1
+
+        # RQ07
+        groups = self.language_groups[language]
+        for metric in LANGUAGE_METRICS:
+            groups[metric].add(getattr(record, metric))
+
+    def write_page(self, records):
+        for record in records:
+            self.add(record)
+
+    def close(self):
+        pass
+
+    def __len__(self):
+        return self.count
+
+    def summary(self):
+        pr_stats = self.merged_prs.to_dict()
+        return RQSummary(
+            total=self.count,
+            age_stats=self.age_years.to_dict(),
+            mature_repos=self.mature_repos,
+            pr_stats=pr_stats,
+            prs_above_median=self.merged_prs.count_above(pr_stats['median']),
+            release_stats=self.total_releases.to_dict(),
+            repos_with_releases=self.repos_with_releases,
+            update_stats=self.days_since_update.to_dict(),
+            recently_updated=self.recently_updated,
+            language_counts=Counter(self.language_counts),
+            repos_with_issues=self.closed_issues_ratio.count,
+            issue_ratio_stats=self.closed_issues_ratio.to_dict() if self.closed_issues_ratio.count else {},
+            high_closure_rate=self.high_closure_rate,
+            age_histogram=list(zip(AGE_BIN_LABELS, self.age_bins)),
+            language_groups={
+                lang: {metric: stats.to_dict() for metric, stats in groups.items()}
+                for lang, groups in self.language_groups.items()
+            }
+        )
@@ -0,0 +1,279 @@
+import argparse
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_SNAPSHOT_DB = 'github_snapshots.sqlite'
+
+# Colunas guardadas de cada repositório em cada coleta (as do CSV, menos url/description)
+SNAPSHOT_COLUMNS = [
+    'stars', 'age_days', 'merged_prs', 'total_releases', 'days_since_update',
+    'primary_language', 'total_issues', 'closed_issues', 'closed_issues_ratio'
+]
+
+# Métricas numéricas aceitas nas consultas de tendência (nomes de coluna nunca vêm do usuário direto para o SQL)
+TREND_METRICS = [column for column in SNAPSHOT_COLUMNS if column != 'primary_language']
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS snapshots (
+        collection_time TEXT NOT NULL,
+        owner TEXT NOT NULL,
+        name TEXT NOT NULL,
+        stars INTEGER NOT NULL,
+        age_days INTEGER NOT NULL,
+        merged_prs INTEGER NOT NULL,
+        total_releases INTEGER NOT NULL,
+        days_since_update INTEGER NOT NULL,
+        primary_language TEXT NOT NULL,
+        total_issues INTEGER NOT NULL,
+        closed_issues INTEGER NOT NULL,
+        closed_issues_ratio REAL NOT NULL,
+        PRIMARY KEY (collection_time, owner, name)
+    );
+    CREATE INDEX IF NOT EXISTS idx_snapshots_repository ON snapshots (owner, name, collection_time);
+    CREATE INDEX IF NOT EXISTS idx_snapshots_language ON snapshots (primary_language, collection_time);
+    CREATE INDEX IF NOT EXISTS idx_snapshots_stars ON snapshots (collection_time, stars);
+    -- Redundante com o prefixo da chave primária e com idx_snapshots_stars (bancos de versões anteriores)
+    DROP INDEX IF EXISTS idx_snapshots_time;
+"""
+
+
+def collection_timestamp(current_date=None):
+    """
+    Data da coleta em ISO 8601 (UTC, segundos), ordenável como texto
+    """
+    current_date = current_date or datetime.now(timezone.utc)
+    return current_date.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def check_metric(metric):
+    if metric not in TREND_METRICS:
+        raise ValueError(f"Métrica desconhecida: {metric} (use uma de {', '.join(TREND_METRICS)})")
+    return metric
+
+
+class SnapshotSink:
+    """
+    Sink do pipeline que grava cada página de registros como linhas de uma coleta
+    """
+    def __init__(self, store, collection_time):
+        self.store = store
+        self.collection_time = collection_time
+        self.count = 0
+        self.committed = False
+
+    def write_page(self, records):
+        rows = [
+            (self.collection_time, record.owner, record.name, *(getattr(record, column) for column in SNAPSHOT_COLUMNS))
+            for record in records
+        ]
+        self.store.connection.executemany(
+            f"INSERT OR REPLACE INTO snapshots (collection_time, owner, name, {', '.join(SNAPSHOT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * (len(SNAPSHOT_COLUMNS) + 3))})",
+            rows
+        )
+        self.count += len(rows)
+
+    def commit(self):
+        # Uma transação por coleta: ou a coleta inteira entra no histórico, ou nada.
+        # run_pipeline só chama commit() depois de consumir todas as páginas.
+        self.store.connection.commit()
+        self.committed = True
+
+    def close(self):
+        # Coleta interrompida ou com erro: descarta as linhas já inseridas
+        if not self.committed:
+            self.store.connection.rollback()
+
+
+class SnapshotStore:
+    """
+    Histórico das coletas em SQLite: tabela `snapshots` com uma linha por
+    (collection_time, owner, name) e índices por repositório, linguagem e estrelas (a data
+    já é o prefixo da chave), para as RQs e as tendências rodarem em SQL sobre qualquer
+    intervalo de coletas
+    """
+    def __init__(self, path=DEFAULT_SNAPSHOT_DB):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def writer(self, collection_time=None):
+        return SnapshotSink(self, collection_time or collection_timestamp())
+
+    def collections(self, start=None, end=None):
+        """
+        Coletas guardadas (com o número de repositórios de cada uma), opcionalmente num intervalo
+        """
+        where, params = self._time_range(start, end)
+        return self.connection.execute(
+            f"SELECT collection_time, COUNT(*) FROM snapshots {where} GROUP BY collection_time ORDER BY collection_time",
+            params
+        ).fetchall()
+
+    def latest_collection(self):
+        row = self.connection.execute('SELECT MAX(collection_time) FROM snapshots').fetchone()
+        return row[0]
+
+    def _time_range(self, start=None, end=None, prefix='WHERE'):
+        clauses = []
+        params = []
+        if start:
+            clauses.append('collection_time >= ?')
+            params.append(start)
+        if end:
+            try:
+                # Só a data (YYYY-MM-DD): o dia inteiro entra, até antes da meia-noite seguinte
+                next_day = datetime.strptime(end, '%Y-%m-%d') + timedelta(days=1)
+                clauses.append('collection_time < ?')
+                params.append(next_day.strftime('%Y-%m-%d'))
+            except ValueError:
+                clauses.append('collection_time <= ?')
+                params.append(end)
+        return (f"{prefix} {' AND '.join(clauses)}" if clauses else ''), params
+
+    def median(self, metric, collection_time, condition='1'):
+        """
+        Mediana de uma métrica numa coleta (SQLite não tem MEDIAN: ORDER BY + OFFSET no meio)
+        """
+        check_metric(metric)
+        count = self.connection.execute(
+            f"SELECT COUNT(*) FROM snapshots WHERE collection_time = ? AND {condition}", (collection_time,)
+        ).fetchone()[0]
+        if not count:
+            return 0
+
+        rows = self.connection.execute(
+            f"SELECT {metric} FROM snapshots WHERE collection_time = ? AND {condition} "
+            f"ORDER BY {metric} LIMIT ? OFFSET ?",
+            (collection_time, 2 - count % 2, (count - 1) // 2)
+        ).fetchall()
+        return sum(row[0] for row in rows) / len(rows)
+
+    def rq_report(self, collection_time=None):
+        """
+        Indicadores das RQ01-RQ07 de uma coleta (a mais recente por padrão), calculados em SQL
+        """
+        collection_time = collection_time or self.latest_collection()
+        if collection_time is None:
+            return None
+
+        query = self.connection.execute
+        total = query('SELECT COUNT(*) FROM snapshots WHERE collection_time = ?', (collection_time,)).fetchone()[0]
+
+        return {
+            'collection_time': collection_time,
+            'total': total,
+            'RQ01_median_age_years': self.median('age_days', collection_time) / 365.25,
+            'RQ02_median_merged_prs': self.median('merged_prs', collection_time),
+            'RQ03_median_releases': self.median('total_releases', collection_time),
+            'RQ04_median_days_since_update': self.median('days_since_update', collection_time),
+            'RQ05_languages': query(
+                "SELECT primary_language, COUNT(*) AS total FROM snapshots WHERE collection_time = ? "
+                "GROUP BY primary_language ORDER BY total DESC", (collection_time,)
+            ).fetchall(),
+            'RQ06_median_closed_ratio': self.median('closed_issues_ratio', collection_time, 'total_issues > 0'),
+            'RQ07_by_language': query(
+                "SELECT primary_language, COUNT(*), AVG(merged_prs), AVG(total_releases), AVG(days_since_update) "
+                "FROM snapshots WHERE collection_time = ? GROUP BY primary_language ORDER BY COUNT(*) DESC",
+                (collection_time,)
+            ).fetchall(),
+        }
+
+    def metric_trend(self, metric, start=None, end=None, language=None):
+        """
+        Média e soma de uma métrica em cada coleta do intervalo, opcionalmente de uma linguagem
+        """
+        check_metric(metric)
+        where, params = self._time_range(start, end)
+        if language:
+            where = f"{where} AND primary_language = ?" if where else "WHERE primary_language = ?"
+            params.append(language)
+        return self.connection.execute(
+            f"SELECT collection_time, COUNT(*), AVG({metric}), SUM({metric}) FROM snapshots {where} "
+            f"GROUP BY collection_time ORDER BY collection_time",
+            params
+        ).fetchall()
+
+    def repository_history(self, owner, name, metrics=('stars', 'closed_issues_ratio')):
+        """
+        Evolução de um repositório ao longo das coletas (usa o índice por owner/name)
+        """
+        columns = ', '.join(check_metric(metric) for metric in metrics)
+        return self.connection.execute(
+            f"SELECT collection_time, {columns} FROM snapshots WHERE owner = ? AND name = ? ORDER BY collection_time",
+            (owner, name)
+        ).fetchall()
+
+    def top_changes(self, metric, start, end, limit=10):
+        """
+        Repositórios com a maior variação de uma métrica entre duas coletas
+        """
+        check_metric(metric)
+        return self.connection.execute(
+            f"SELECT b.owner, b.name, a.{metric}, b.{metric}, b.{metric} - a.{metric} AS change "
+            f"FROM snapshots a JOIN snapshots b ON a.owner = b.owner AND a.name = b.name "
+            f"WHERE a.collection_time = ? AND b.collection_time = ? ORDER BY change DESC LIMIT ?",
+            (start, end, limit)
+        ).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultas sobre o histórico de coletas")
+    parser.add_argument('--db', default=DEFAULT_SNAPSHOT_DB, help="banco SQLite com as coletas")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help="lista as coletas guardadas")
+
+    rq_parser = subparsers.add_parser('rq', help="indicadores das RQs de uma coleta")
+    rq_parser.add_argument('--at', help="data da coleta (padrão: a mais recente)")
+
+    trend_parser = subparsers.add_parser('trend', help="evolução de uma métrica entre coletas")
+    trend_parser.add_argument('--metric', default='stars', choices=TREND_METRICS)
+    trend_parser.add_argument('--since', help="primeira coleta do intervalo")
+    trend_parser.add_argument('--until', help="última coleta do intervalo (só a data inclui o dia inteiro)")
+    trend_parser.add_argument('--language', help="só repositórios desta linguagem")
+    trend_parser.add_argument('--repo', help="owner/name: evolução de um único repositório")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.db)
+    try:
+        if args.command == 'list':
+            for collection_time, total in store.collections():
+                print(f"{collection_time}: {total} repositórios")
+
+        elif args.command == 'rq':
+            report = store.rq_report(args.at)
+            if report is None:
+                print("Nenhuma coleta no histórico.")
+                return
+            print(f"Coleta {report['collection_time']} ({report['total']} repositórios)")
+            print(f"RQ01 - Idade mediana: {report['RQ01_median_age_years']:.1f} anos")
+            print(f"RQ02 - Mediana de PRs aceitas: {report['RQ02_median_merged_prs']:.1f}")
+            print(f"RQ03 - Mediana de releases: {report['RQ03_median_releases']:.1f}")
+            print(f"RQ04 - Mediana de dias desde a última atualização: {report['RQ04_median_days_since_update']:.1f}")
+            print("RQ05 - Linguagens: " + ', '.join(f"{lang} ({count})" for lang, count in report['RQ05_languages'][:10]))
+            print(f"RQ06 - Mediana do percentual de issues fechadas: {report['RQ06_median_closed_ratio']:.1f}%")
+            print("RQ07 - Médias por linguagem (PRs, releases, dias desde update):")
+            for lang, count, prs, releases, days in report['RQ07_by_language'][:5]:
+                print(f"  {lang} ({count}): {prs:.1f}, {releases:.1f}, {days:.1f}")
+
+        elif args.repo:
+            owner, name = args.repo.split('/', 1)
+            for collection_time, value in store.repository_history(owner, name, [args.metric]):
+                print(f"{collection_time}: {value}")
+
+        else:
+            for collection_time, count, average, total in store.metric_trend(args.metric, args.since, args.until,
+                                                                             args.language):
+                print(f"{collection_time}: média {average:.2f}, soma {total} ({count} repositórios)")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+import base64
+import math
+import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from statistics import NormalDist, stdev
+
+from lab01s01_github import DEFAULT_MIN_STARS, PAGE_SIZE, SEARCH_RESULT_LIMIT
+from pipeline import CSV_FIELDNAMES, CsvSink
+from query_builder import REPOSITORY_FIELDS
+from repository_models import SEARCH_RESPONSE
+
+DEFAULT_SAMPLE_SIZE = 1000
+DEFAULT_CLUSTER_SIZE = 10  # repositórios por requisição (um "cluster" é uma página da busca)
+DEFAULT_REPLICATES = 500
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_SAMPLE_CSV = 'github_repositories_sample.csv'
+
+# Estratos de data de criação: blocos de 3 anos a partir de 2008 (ano de abertura do GitHub)
+FIRST_CREATION_DATE = date(2008, 1, 1)
+DATE_BUCKET_YEARS = 3
+
+SAMPLE_FIELDNAMES = CSV_FIELDNAMES + ['stratum', 'weight']
+
+
+def encode_cursor(position):
+    """
+    Cursor da busca que começa logo após o item `position` (0 = início). A API de busca
+    do GitHub usa cursores base64 de "cursor:N", o que permite pular direto para um
+    deslocamento sem paginar até ele.
+    """
+    return base64.b64encode(f"cursor:{position}".encode()).decode()
+
+
+class Stratum:
+    """
+    Estrato da amostra: uma faixa de estrelas x uma faixa de datas de criação
+    """
+    def __init__(self, min_stars, max_stars, first_day, last_day, population):
+        self.min_stars = min_stars
+        self.max_stars = max_stars
+        self.first_day = first_day
+        self.last_day = last_day
+        self.population = population
+
+    @property
+    def label(self):
+        return f"stars:{self.min_stars}..{self.max_stars} created:{self.first_day}..{self.last_day}"
+
+    @property
+    def query(self):
+        return f"{self.label} sort:stars-desc"
+
+    @property
+    def reachable(self):
+        # A busca só pagina os primeiros 1000 resultados
+        return min(self.population, SEARCH_RESULT_LIMIT)
+
+    def clusters(self, cluster_size):
+        return math.ceil(self.reachable / cluster_size)
+
+
+class SampleEstimate:
+    """
+    Estimativa ponderada de uma estatística com o intervalo de confiança bootstrap
+    """
+    def __init__(self, name, value, lower, upper, std_error):
+        self.name = name
+        self.value = value
+        self.lower = lower
+        self.upper = upper
+        self.std_error = std_error
+
+    def to_dict(self):
+        return {'name': self.name, 'value': self.value, 'lower': self.lower, 'upper': self.upper,
+                'std_error': self.std_error}
+
+
+def date_buckets(today):
+    """
+    Faixas de criação (primeiro dia, último dia) de DATE_BUCKET_YEARS anos até hoje
+    """
+    buckets = []
+    first_day = FIRST_CREATION_DATE
+    while first_day <= today:
+        next_first = first_day.replace(year=first_day.year + DATE_BUCKET_YEARS)
+        buckets.append((first_day, min(next_first - timedelta(days=1), today)))
+        first_day = next_first
+    return buckets
+
+
+def plan_strata(analyzer, min_stars, max_workers=4, today=None):
+    """
+    Conta os repositórios de cada estrato (faixas geométricas de estrelas x blocos de
+    datas de criação). Estratos com mais de 1000 resultados são divididos pela data e,
+    num único dia, pelas estrelas, para que toda a população seja alcançável pela busca.
+    Retorna (estratos não vazios, requisições de contagem feitas).
+    """
+    today = today or datetime.now(timezone.utc).date()
+    requests = 1
+    _, max_stars = analyzer.count_repositories(f"stars:>={min_stars} sort:stars-desc")
+    if max_stars < min_stars:
+        return [], requests
+
+    pending = []
+    lo = min_stars
+    while lo <= max_stars:
+        hi = min(lo * 2 - 1, max_stars)
+        pending.extend((lo, hi, first_day, last_day) for first_day, last_day in date_buckets(today))
+        lo = hi + 1
+
+    strata = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending:
+            queries = [Stratum(*bounds, population=0).query for bounds in pending]
+            counts = list(executor.map(analyzer.count_repositories, queries))
+            requests += len(queries)
+
+            next_pending = []
+            for (lo, hi, first_day, last_day), (count, _) in zip(pending, counts):
+                if count > SEARCH_RESULT_LIMIT and first_day < last_day:
+                    middle = first_day + (last_day - first_day) // 2
+                    next_pending.append((lo, hi, first_day, middle))
+                    next_pending.append((lo, hi, middle + timedelta(days=1), last_day))
+                elif count > SEARCH_RESULT_LIMIT and lo < hi:
+                    mid = (lo + hi) // 2
+                    next_pending.append((lo, mid, first_day, last_day))
+                    next_pending.append((mid + 1, hi, first_day, last_day))
+                elif count > 0:
+                    if count > SEARCH_RESULT_LIMIT:
+                        print(f"Aviso: estrato stars:{lo}..{hi} created:{first_day} tem {count} repositórios, "
+                              f"apenas {SEARCH_RESULT_LIMIT} entram na amostragem")
+                    strata.append(Stratum(lo, hi, first_day, last_day, count))
+            pending = next_pending
+
+    strata.sort(key=lambda stratum: (stratum.min_stars, stratum.first_day))
+    return strata, requests
+
+
+def allocate_clusters(strata, sample_size, cluster_size):
+    """
+    Alocação proporcional ao tamanho do estrato, com pelo menos 2 clusters por estrato
+    (o mínimo para estimar a variância). Estratos pequenos demais são recenseados inteiros.
+    """
+    population = sum(stratum.reachable for stratum in strata)
+    target = math.ceil(sample_size / cluster_size)
+    allocation = []
+    for stratum in strata:
+        available = stratum.clusters(cluster_size)
+        share = round(target * stratum.reachable / population) if population else 0
+        allocation.append(min(available, max(2, share)))
+    return allocation
+
+
+def draw_clusters(strata, allocation, cluster_size, rng):
+    """
+    Sorteia, sem reposição, os deslocamentos dos clusters de cada estrato
+    """
+    draws = []
+    for index, (stratum, clusters) in enumerate(zip(strata, allocation)):
+        for cluster in sorted(rng.sample(range(stratum.clusters(cluster_size)), clusters)):
+            draws.append((index, cluster * cluster_size))
+    return draws
+
+
+def fetch_cluster(analyzer, stratum, offset, cluster_size, fields=REPOSITORY_FIELDS):
+    """
+    Uma única página da busca do estrato, começando no deslocamento `offset`
+    """
+    variables = analyzer.create_search_variables(encode_cursor(offset) if offset else None, stratum.query,
+                                                 first=cluster_size)
+    data = analyzer._post_query(analyzer.create_graphql_query(fields), variables, SEARCH_RESPONSE)
+    if data is None:
+        return []
+    nodes = data['search']['nodes']
+    analyzer.scheduler.record_repositories(len(nodes))
+    return nodes
+
+
+class WeightedMedian:
+    """
+    Mediana ponderada de `values` (só os índices de `subset`, se dado). O intervalo de
+    confiança é o de Woodruff: o bootstrap estima o erro padrão da proporção de pesos
+    até a mediana, que volta para a escala dos valores pela função de quantil. O
+    percentil das medianas replicadas sai estreito demais com dados em clusters e discretos.
+    """
+    def __init__(self, values, subset=None):
+        self.values = values
+        self.order = sorted(subset if subset is not None else range(len(values)), key=values.__getitem__)
+
+    def quantile(self, weights, q=0.5):
+        total = sum(weights[index] for index in self.order)
+        if total <= 0:
+            return 0
+        threshold = q * total
+        cumulative = 0
+        for index in self.order:
+            cumulative += weights[index]
+            if cumulative >= threshold:
+                return self.values[index]
+        return self.values[self.order[-1]]
+
+    def share_at_or_below(self, value, weights):
+        total = sum(weights[index] for index in self.order)
+        below = sum(weights[index] for index in self.order if self.values[index] <= value)
+        return below / total if total > 0 else 0
+
+    def __call__(self, weights):
+        return self.quantile(weights)
+
+
+def weighted_mean(values, weights):
+    total = sum(weights)
+    return sum(value * weight for value, weight in zip(values, weights)) / total if total > 0 else 0
+
+
+def build_statistics(records):
+    """
+    Estatísticas das RQs como funções dos pesos: cada uma recebe os pesos (um por
+    registro) e devolve a estimativa ponderada. Assim a mesma função serve para a
+    amostra e para cada réplica do bootstrap. As medianas são WeightedMedian.
+    """
+    def share(predicate):
+        indicator = [1 if predicate(record) else 0 for record in records]
+        return lambda weights: 100 * weighted_mean(indicator, weights)
+
+    age_years = [record.age_days / 365.25 for record in records]
+    merged_prs = [record.merged_prs for record in records]
+    releases = [record.total_releases for record in records]
+    since_update = [record.days_since_update for record in records]
+    ratios = [record.closed_issues_ratio for record in records]
+    with_issues = [index for index, record in enumerate(records) if record.total_issues > 0]
+    issue_weights = [1 if record.total_issues > 0 else 0 for record in records]
+    high_closure = [1 if record.closed_issues_ratio > 80 else 0 for record in records]
+
+    statistics = {
+        'RQ01 idade média (anos)': lambda weights: weighted_mean(age_years, weights),
+        'RQ01 idade mediana (anos)': WeightedMedian(age_years),
+        'RQ01 % com mais de 5 anos': share(lambda record: record.age_days > 365.25 * 5),
+        'RQ02 mediana de PRs aceitos': WeightedMedian(merged_prs),
+        'RQ03 mediana de releases': WeightedMedian(releases),
+        'RQ03 % com pelo menos 1 release': share(lambda record: record.total_releases > 0),
+        'RQ04 mediana de dias desde a atualização': WeightedMedian(since_update),
+        'RQ04 % atualizados nos últimos 30 dias': share(lambda record: record.days_since_update <= 30),
+    }
+    if with_issues:
+        statistics['RQ06 mediana de issues fechadas (%)'] = WeightedMedian(ratios, with_issues)
+        statistics['RQ06 % com mais de 80% fechadas'] = \
+            lambda weights: 100 * weighted_mean(high_closure, [w * flag for w, flag in zip(weights, issue_weights)])
+
+    # RQ05: participação das linguagens mais frequentes na amostra
+    languages = defaultdict(int)
+    for record in records:
+        languages[record.primary_language] += 1
+    for language in sorted(languages, key=languages.get, reverse=True)[:10]:
+        statistics[f"RQ05 % em {language}"] = share(lambda record, language=language: record.primary_language == language)
+
+    return statistics
+
+
+class StratifiedSample:
+    """
+    Amostra estratificada por conglomerados: em cada estrato são sorteados clusters
+    (páginas de `cluster_size` resultados em deslocamentos aleatórios) e cada repositório
+    recebe o peso N_h / n_h do seu estrato. Os intervalos de confiança vêm do bootstrap
+    de Rao-Wu: em cada réplica, cada estrato reamostra m_h - 1 dos seus m_h clusters com
+    reposição; estratos recenseados inteiros não contribuem para a variância.
+    """
+    def __init__(self, strata, clusters, cluster_size):
+        self.strata = strata
+        self.clusters = clusters  # (índice do estrato, registros do cluster)
+        self.cluster_size = cluster_size
+        self.records = [record for _, records in clusters for record in records]
+        self.cluster_of = [position for position, (_, records) in enumerate(clusters) for _ in records]
+        self.weights = self.stratum_weights([1] * len(clusters))
+
+    def census(self, stratum_index):
+        stratum = self.strata[stratum_index]
+        drawn = sum(1 for index, _ in self.clusters if index == stratum_index)
+        return drawn >= stratum.clusters(self.cluster_size)
+
+    def stratum_weights(self, multiplicity):
+        """
+        Peso de cada registro: a população do estrato dividida entre os registros
+        sorteados (contando cada cluster `multiplicity` vezes)
+        """
+        sampled = defaultdict(int)
+        for (index, records), times in zip(self.clusters, multiplicity):
+            sampled[index] += len(records) * times
+
+        cluster_weights = [self.strata[index].reachable * times / sampled[index] if sampled[index] else 0
+                           for (index, _), times in zip(self.clusters, multiplicity)]
+        return [cluster_weights[position] for position in self.cluster_of]
+
+    def replicate_weights(self, rng):
+        """
+        Pesos de uma réplica do bootstrap de Rao-Wu
+        """
+        by_stratum = defaultdict(list)
+        for position, (index, _) in enumerate(self.clusters):
+            by_stratum[index].append(position)
+
+        multiplicity = [1] * len(self.clusters)
+        for index, positions in by_stratum.items():
+            if len(positions) < 2 or self.census(index):
+                continue
+            for position in positions:
+                multiplicity[position] = 0
+            for position in rng.choices(positions, k=len(positions) - 1):
+                multiplicity[position] += 1
+        return self.stratum_weights(multiplicity)
+
+    def estimate(self, replicates=DEFAULT_REPLICATES, confidence=DEFAULT_CONFIDENCE, seed=None):
+        """
+        Estimativas ponderadas das RQs com intervalos de confiança bootstrap: percentis
+        das réplicas para médias e proporções, Woodruff para as medianas
+        """
+        statistics = build_statistics(self.records)
+        points = {name: statistic(self.weights) for name, statistic in statistics.items()}
+
+        # Das medianas, o bootstrap replica a proporção de pesos até a estimativa
+        rng = random.Random(seed)
+        replicate_values = defaultdict(list)
+        for _ in range(replicates):
+            weights = self.replicate_weights(rng)
+            for name, statistic in statistics.items():
+                if isinstance(statistic, WeightedMedian):
+                    replicate_values[name].append(statistic.share_at_or_below(points[name], weights))
+                else:
+                    replicate_values[name].append(statistic(weights))
+
+        alpha = (1 - confidence) / 2
+        z = NormalDist().inv_cdf(1 - alpha)
+        estimates = []
+        for name, statistic in statistics.items():
+            values = sorted(replicate_values[name])
+            std_error = stdev(values) if len(values) > 1 else 0
+            if isinstance(statistic, WeightedMedian):
+                lower = statistic.quantile(self.weights, max(0.0, 0.5 - z * std_error))
+                upper = statistic.quantile(self.weights, min(1.0, 0.5 + z * std_error))
+                # Erro padrão na escala dos valores, aproximado pela largura do intervalo
+                std_error = (upper - lower) / (2 * z)
+            elif values:
+                lower = values[int(alpha * (len(values) - 1))]
+                upper = values[int(math.ceil((1 - alpha) * (len(values) - 1)))]
+            else:
+                lower = upper = math.nan
+            estimates.append(SampleEstimate(name, points[name], lower, upper, std_error))
+        return estimates
+
+    def save_csv(self, filename=DEFAULT_SAMPLE_CSV):
+        """
+        Grava a amostra com o estrato e o peso de cada repositório
+        """
+        sink = CsvSink(filename, SAMPLE_FIELDNAMES)
+        rows = []
+        for record, weight, position in zip(self.records, self.weights, self.cluster_of):
+            row = record.to_dict()
+            row['stratum'] = self.strata[self.clusters[position][0]].label
+            row['weight'] = round(weight, 4)
+            rows.append(row)
+        sink.write_page(rows)
+        sink.close()
+
+
+def collect_sample(analyzer, sample_size=DEFAULT_SAMPLE_SIZE, cluster_size=DEFAULT_CLUSTER_SIZE, min_stars=DEFAULT_MIN_STARS,
+                   max_workers=4, seed=None):
+    """
+    Planeja os estratos, sorteia os clusters e busca só as páginas sorteadas.
+    Retorna (StratifiedSample, requisições de contagem, requisições da amostra).
+    """
+    rng = random.Random(seed)
+    print(f"Contando repositórios por estrato de estrelas x data de criação (a partir de {min_stars})...")
+    strata, count_requests = plan_strata(analyzer, min_stars, max_workers)
+    if not strata:
+        return None, count_requests, 0
+
+    allocation = allocate_clusters(strata, sample_size, cluster_size)
+    draws = draw_clusters(strata, allocation, cluster_size, rng)
+    print(f"{len(strata)} estratos, {sum(stratum.population for stratum in strata)} repositórios; "
+          f"sorteando {len(draws)} clusters de {cluster_size}...")
+
+    current_date = datetime.now(timezone.utc)
+
+    def fetch(draw):
+        index, offset = draw
+        nodes = fetch_cluster(analyzer, strata[index], offset, cluster_size)
+        return index, analyzer.process_data(nodes, current_date)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        clusters = [cluster for cluster in executor.map(fetch, draws) if cluster[1]]
+
+    return StratifiedSample(strata, clusters, cluster_size), count_requests, len(draws)
+
+
+def print_estimates(estimates, confidence):
+    print("\n" + "=" * 70)
+    print(f"ESTIMATIVAS PONDERADAS (IC de {confidence * 100:.0f}% por bootstrap)")
+    print("=" * 70)
+    for estimate in estimates:
+        print(f"{estimate.name}: {estimate.value:.2f} [{estimate.lower:.2f}, {estimate.upper:.2f}] "
+              f"(erro padrão {estimate.std_error:.2f})")
+
+
+def run_sample(analyzer, sample_size=DEFAULT_SAMPLE_SIZE, cluster_size=DEFAULT_CLUSTER_SIZE, min_stars=DEFAULT_MIN_STARS,
+               max_workers=4, replicates=DEFAULT_REPLICATES, confidence=DEFAULT_CONFIDENCE, seed=None,
+               csv_filename=DEFAULT_SAMPLE_CSV):
+    """
+    Modo amostragem: estima as estatísticas das RQs sobre todos os repositórios com
+    pelo menos `min_stars` estrelas a partir de uma amostra estratificada, com uma
+    fração das requisições da coleta completa. Retorna a lista de SampleEstimate.
+    """
+    with analyzer.metrics.span('sampling'):
+        sample, count_requests, sample_requests = collect_sample(analyzer, sample_size, cluster_size, min_stars,
+                                                                 max_workers, seed)
+    if sample is None or not sample.records:
+        print("Erro: Nenhum repositório foi amostrado.")
+        return []
+
+    sample.save_csv(csv_filename)
+    print(f"Amostra salva em: {csv_filename} ({len(sample.records)} repositórios)")
+
+    with analyzer.metrics.span('bootstrap'):
+        estimates = sample.estimate(replicates, confidence, seed)
+    print_estimates(estimates, confidence)
+
+    population = sum(stratum.population for stratum in sample.strata)
+    full_requests = math.ceil(population / PAGE_SIZE)
+    used = count_requests + sample_requests
+    print(f"\nCusto: {used} requisições ({count_requests} contagens + {sample_requests} páginas) contra "
+          f"~{full_requests} para coletar os {population} repositórios ({used / full_requests * 100:.1f}%)")
+    return estimates
@@ -0,0 +1,189 @@
+from datetime import datetime, timezone
+
+from repository_models import RepositoryRecord
+
+# numpy só é importado no primeiro lote grande o bastante (ver load_numpy): coletas pequenas
+# nunca chegam a usá-lo e não pagam o custo do import na inicialização
+np = None
+_numpy_checked = False
+
+MICROSECONDS_PER_DAY = 86400 * 10**6
+
+# Abaixo disso o custo fixo das chamadas NumPy supera o ganho (as páginas da busca têm 20 nós)
+MIN_VECTORIZED_ROWS = 256
+# Tamanho dos lotes de páginas da coleta (batch_pages): ~1/3 mais rápido por nó que o laço
+BATCH_ROWS = 1000
+
+# Formato dos timestamps do GitHub: "2015-03-01T10:00:00Z"
+TIMESTAMP_LENGTH = 20
+SEPARATOR_POSITIONS = [4, 7, 10, 13, 16, 19]
+SEPARATORS = [ord(char) for char in '--T::Z']
+
+
+def load_numpy():
+    """
+    Importa o numpy na primeira chamada; devolve None se ele não estiver instalado
+    """
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+
+def to_microseconds(current_date):
+    """
+    Data de referência (aware) como microssegundos UTC desde a época, no mesmo eixo dos timestamps da página
+    """
+    naive_utc = current_date.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(naive_utc, 'us').astype('int64')
+
+
+def parse_timestamps(values):
+    """
+    Converte de uma vez uma coluna de timestamps do GitHub ("YYYY-MM-DDTHH:MM:SSZ") em
+    microssegundos UTC (int64): os textos viram uma matriz de bytes n x 20 e os campos
+    saem de operações por coluna. Devolve None se algum valor tiver outro formato/fuso,
+    para o chamador cair no caminho linha a linha.
+    """
+    blob = ''.join(values).encode('ascii', 'replace')
+    if len(blob) != TIMESTAMP_LENGTH * len(values):
+        return None
+    chars = np.frombuffer(blob, dtype='uint8').reshape(-1, TIMESTAMP_LENGTH)
+    if not (chars[:, SEPARATOR_POSITIONS] == SEPARATORS).all():
+        return None
+
+    # int32 basta para os campos; o resultado final em microssegundos vai para int64
+    digits = chars.astype('int32') - ord('0')
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 5] * 10 + digits[:, 6]
+    day = digits[:, 8] * 10 + digits[:, 9]
+    seconds = (digits[:, 11] * 10 + digits[:, 12]) * 3600 + (digits[:, 14] * 10 + digits[:, 15]) * 60 \
+        + digits[:, 17] * 10 + digits[:, 18]
+
+    days = days_from_civil(year, month, day).astype('int64')
+    return (days * 86400 + seconds) * 10**6
+
+
+def days_from_civil(year, month, day):
+    """
+    Dias desde 1970-01-01 no calendário gregoriano (algoritmo de Howard Hinnant), vetorizado
+    """
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def elapsed_days(current_us, timestamps_us):
+    """
+    Dias inteiros decorridos, igual a timedelta.days (divisão com arredondamento para baixo)
+    """
+    return (current_us - timestamps_us) // MICROSECONDS_PER_DAY
+
+
+def batch_pages(pages, min_rows=BATCH_ROWS):
+    """
+    Junta páginas consecutivas de nós até `min_rows` nós, para que o processamento por
+    colunas valha a pena mesmo com as páginas de 20 nós da busca
+    """
+    batch = []
+    for page in pages:
+        batch.extend(page)
+        if len(batch) >= min_rows:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def derive_rows(repositories, current_date):
+    """
+    Campos derivados nó a nó: a referência dos valores do caminho por colunas
+    """
+    age_days, days_since_update, ratios = [], [], []
+    for repo in repositories:
+        # RQ01: Idade do repositório
+        created_date = datetime.fromisoformat(repo['createdAt'].replace('Z', '+00:00'))
+        age_days.append((current_date - created_date).days)
+
+        # RQ04: Tempo até última atualização
+        updated_date = datetime.fromisoformat(repo['updatedAt'].replace('Z', '+00:00'))
+        days_since_update.append((current_date - updated_date).days)
+
+        # RQ06: Percentual de issues fechadas
+        total_issues = repo['issues']['totalCount']
+        closed_issues = repo['closedIssues']['totalCount']
+        ratios.append((closed_issues / total_issues * 100) if total_issues > 0 else 0)
+    return age_days, days_since_update, ratios
+
+
+def derive_vectorized(repositories, current_date, total_issues, closed_issues):
+    """
+    Os mesmos campos por operações de coluna: os timestamps do lote são convertidos de uma
+    vez e a idade, os dias desde a atualização e o percentual de issues fechadas saem de
+    aritmética sobre arrays. Devolve None se algum timestamp não puder seguir por esse caminho.
+    """
+    created = parse_timestamps([repo['createdAt'] for repo in repositories])
+    updated = parse_timestamps([repo['updatedAt'] for repo in repositories])
+    if created is None or updated is None:
+        return None
+
+    current_us = to_microseconds(current_date)
+    totals = np.array(total_issues, dtype='int64')
+    has_issues = totals > 0
+    ratios = np.zeros(len(totals))
+    ratios[has_issues] = np.array(closed_issues, dtype='int64')[has_issues] / totals[has_issues] * 100
+    # Sem issues o laço linha a linha grava o inteiro 0 (e o CSV mostra "0", não "0.0")
+    ratios = [ratio if has else 0 for ratio, has in zip(ratios.tolist(), has_issues.tolist())]
+    return elapsed_days(current_us, created).tolist(), elapsed_days(current_us, updated).tolist(), ratios
+
+
+def derive_columns(repositories, current_date):
+    """
+    Única implementação dos campos derivados (idade, dias desde a atualização e percentual
+    de issues fechadas), usada por process_page e pelo RepositoryColumns. Devolve um dict
+    de listas com esses campos e as contagens de issues; com numpy e pelo menos
+    MIN_VECTORIZED_ROWS nós o cálculo é por colunas, com exatamente os mesmos valores.
+    """
+    total_issues = [repo['issues']['totalCount'] for repo in repositories]
+    closed_issues = [repo['closedIssues']['totalCount'] for repo in repositories]
+
+    derived = None
+    if len(repositories) >= MIN_VECTORIZED_ROWS and load_numpy() is not None:
+        derived = derive_vectorized(repositories, current_date, total_issues, closed_issues)
+    if derived is None:
+        derived = derive_rows(repositories, current_date)
+
+    age_days, days_since_update, ratios = derived
+    return {'age_days': age_days, 'days_since_update': days_since_update, 'total_issues': total_issues,
+            'closed_issues': closed_issues, 'closed_issues_ratio': ratios}
+
+
+def process_page(repositories, current_date):
+    """
+    Registros (RepositoryRecord) de uma página ou lote de nós do GraphQL
+    """
+    columns = derive_columns(repositories, current_date)
+    return [
+        RepositoryRecord(
+            repo['name'], repo['owner']['login'], repo['stargazerCount'], age,
+            # RQ02/RQ03: Pull requests aceitas e total de releases
+            repo['pullRequests']['totalCount'], repo['releases']['totalCount'], since_update,
+            # RQ05: Linguagem primária
+            repo['primaryLanguage']['name'] if repo['primaryLanguage'] else 'Unknown',
+            total_issues, closed_issues, ratio,
+            # Campos de texto podem ficar de fora da projeção da query
+            has_url=repo.get('url') is not None,
+            description=repo.get('description')
+        )
+        for repo, age, since_update, total_issues, closed_issues, ratio in zip(
+            repositories, columns['age_days'], columns['days_since_update'], columns['total_issues'],
+            columns['closed_issues'], columns['closed_issues_ratio'])
+    ]